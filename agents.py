@@ -19,7 +19,7 @@ except Exception:
 try:
     from rover_tools.batch_tools import batch_scrape_news, batch_get_stock_data, batch_detect_accumulation
     from rover_tools.portfolio_tool import read_portfolio
-    from rover_tools.news_scraper_tool import scrape_general_market_news
+    from rover_tools.news_scraper_tool import scrape_general_market_news, search_news_archive
     from rover_tools.search_tool import search_market_news
     from rover_tools.global_market_tool import get_global_cues
     from rover_tools.corporate_actions_tool import get_corporate_actions
@@ -53,6 +53,7 @@ except ImportError as e:
 from config import MAX_ITERATIONS, GOOGLE_API_KEY, PRIMARY_LLM_MODEL, FALLBACK_LLM_MODEL
 from utils.logger import get_logger
 from utils.metrics import track_error
+from utils.llm_cache import install_llm_cache
 import os
 
 logger = get_logger(__name__)
@@ -82,11 +83,13 @@ def _create_llm(model_name: str, temp: float = 0.3):
     clean_model_name = model_name if model_name.startswith("gemini/") else f"gemini/{model_name}"
 
     try:
-        return LLM(
+        llm = LLM(
             model=clean_model_name,
             temperature=temp,
             api_key=GOOGLE_API_KEY
         )
+        # Identical prompts (same model, temperature, tool outputs) on the same market day hit disk
+        return install_llm_cache(llm)
     except Exception as e:
         logger.error(f"Failed to initialize Gemini LLM ({clean_model_name}): {e}")
         track_error("llm_initialization")
@@ -162,6 +165,7 @@ def create_news_scraper_agent():
             get_corporate_actions,
             scrape_general_market_news,
             batch_scrape_news,
+            search_news_archive,
             announce_regime_tool,
             log_pivot_tool,
             check_accounting_fraud,
@@ -191,7 +195,7 @@ def create_sentiment_analyzer_agent():
             "their emotion (Fear/Greed). You flag 'Hype' vs 'Panic'. Your output feeds "
             "into the Shadow Analyst to detect contrarian traps."
         ),
-        tools=[analyze_retail_sentiment_tool],  # Uses LLM reasoning and retail sentiment tool
+        tools=[analyze_retail_sentiment_tool, search_news_archive],  # LLM reasoning, retail sentiment and past coverage
         verbose=True,
         max_iter=3, # Ultra strict limit for rate limiting
         allow_delegation=False,
@@ -323,6 +327,15 @@ class AgentFactory:
             'sre_support': create_sre_support_agent()
         }
 
+    @staticmethod
+    def create_stock_agents():
+        """Fresh per-stock analysts, so concurrent per-stock crews never share agent state."""
+        return {
+            'sentiment_analyzer': create_sentiment_analyzer_agent(),
+            'market_context': create_market_context_agent(),
+            'shadow_analyst': create_shadow_analyst_agent(),
+        }
+
 def create_traditional_timing_agent():
     """Agent H: Traditional Timing Analyst"""
     llm = get_gemini_llm()
@@ -84,6 +84,40 @@ SENTIMENT_NEGATIVE_THRESHOLD = -0.3
 # Parallel Execution Settings (Market-Rover 2.0)
 MAX_PARALLEL_STOCKS = int(os.getenv("MAX_PARALLEL_STOCKS", "5"))
 RATE_LIMIT_DELAY = float(os.getenv("RATE_LIMIT_DELAY", "1.0"))
+# Calls per second per data provider during the parallel per-stock phases
+# ('llm' paces the start of each per-stock agent crew)
+PROVIDER_RATE_LIMITS = {
+    name.strip(): float(rate)
+    for name, rate in (
+        pair.split("=") for pair in os.getenv("PROVIDER_RATE_LIMITS", "yfinance=4,news=2,nse=1,llm=0.5").split(",") if "=" in pair
+    )
+}
+
+# Process-wide pool shared by the batch agent tools (rover_tools/batch_tools.py)
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "10"))
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "50"))
+
+# LLM response cache (content-addressed; entries expire at the next market open)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "true").lower() == "true"
+if os.getenv("K_SERVICE"):
+    LLM_CACHE_PATH = Path("/tmp/llm_cache.sqlite")
+else:
+    LLM_CACHE_PATH = PROJECT_ROOT / os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite")
+
+# Agent prediction ledger (append-only; replaces data/memory.json)
+if os.getenv("K_SERVICE"):
+    PREDICTION_LEDGER_PATH = Path("/tmp/predictions.sqlite")
+else:
+    PREDICTION_LEDGER_PATH = PROJECT_ROOT / os.getenv("PREDICTION_LEDGER_PATH", "data/predictions.sqlite")
+
+# Job registry (Streamlit session): LRU bound on tracked jobs, expiry, and result spill-to-disk
+JOB_REGISTRY_SIZE = int(os.getenv("JOB_REGISTRY_SIZE", "20"))
+JOB_TTL_HOURS = float(os.getenv("JOB_TTL_HOURS", "24"))
+JOB_SPILL_BYTES = int(os.getenv("JOB_SPILL_BYTES", str(64 * 1024)))
+if os.getenv("K_SERVICE"):
+    JOB_SPILL_DIR = Path("/tmp/job_results")
+else:
+    JOB_SPILL_DIR = PROJECT_ROOT / os.getenv("JOB_SPILL_DIR", "data/job_results")
 
 # Web UI Settings (Market-Rover 2.0)
 if os.getenv("K_SERVICE"):
@@ -103,6 +137,27 @@ except Exception:
 
 # News Sources
 MONEYCONTROL_BASE_URL = "https://www.moneycontrol.com"
+# News HTTP client: pooled keep-alive connections shared by all news fetches
+NEWS_HTTP_LIMIT = int(os.getenv("NEWS_HTTP_LIMIT", "20"))
+NEWS_HTTP_PER_HOST = int(os.getenv("NEWS_HTTP_PER_HOST", "4"))
+NEWS_HTTP_TIMEOUT = float(os.getenv("NEWS_HTTP_TIMEOUT", "10"))
+NEWS_PARSE_WORKERS = int(os.getenv("NEWS_PARSE_WORKERS", "4"))
+# Local article store (raw HTML + validators + extraction, keyed by canonical URL)
+if os.getenv("K_SERVICE"):
+    NEWS_STORE_PATH = Path("/tmp/news_store.sqlite")
+else:
+    NEWS_STORE_PATH = PROJECT_ROOT / os.getenv("NEWS_STORE_PATH", "data/news_store.sqlite")
+# Parsed articles younger than this are served from the store without revalidating
+NEWS_ARTICLE_MAX_AGE_HOURS = float(os.getenv("NEWS_ARTICLE_MAX_AGE_HOURS", "24"))
+# Store retention: pages not fetched or revalidated for this long are pruned, and the
+# store keeps at most this many pages (least recently checked go first)
+NEWS_STORE_MAX_AGE_DAYS = float(os.getenv("NEWS_STORE_MAX_AGE_DAYS", "30"))
+NEWS_STORE_MAX_ARTICLES = int(os.getenv("NEWS_STORE_MAX_ARTICLES", "5000"))
+
+# Shared index snapshot (global cues + Nifty/sector indices), refreshed in one batch download
+MARKET_SNAPSHOT_TTL = float(os.getenv("MARKET_SNAPSHOT_TTL", "60"))
+MARKET_SNAPSHOT_OFF_HOURS_TTL = float(os.getenv("MARKET_SNAPSHOT_OFF_HOURS_TTL", "900"))
+MARKET_SNAPSHOT_RETRY = float(os.getenv("MARKET_SNAPSHOT_RETRY", "15"))
 
 ONE_LAKH = 100_000
 ONE_CRORE = 10_000_000
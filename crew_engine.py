@@ -12,7 +12,7 @@ except Exception:
     class _DummyCrew:
         def __init__(self, *args, **kwargs):
             pass
-        def kickoff(self):
+        def kickoff(self, inputs=None):
             return None
 
     class _DummyProcess:
@@ -24,12 +24,84 @@ except Exception:
 from agents import AgentFactory
 from tasks import TaskFactory
 from config import MAX_ITERATIONS, MAX_PARALLEL_STOCKS, RATE_LIMIT_DELAY
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List, Tuple
 
 # Structured logging and metrics
 from utils.logger import logger
 from utils.metrics import track_error_detail, track_workflow_start, track_workflow_end
 from utils.retry import retry_operation
+from utils.parallel_processor import ParallelStockProcessor
+from utils.llm_accounting import install_usage_listener
+
+NO_PREFETCH_NOTE = "Not pre-fetched for this run; use your tools for each stock."
+
+# Share of the progress bar covered by the per-stock research prefetch and the per-stock
+# agent crews (the portfolio-level synthesis tasks fill the rest)
+RESEARCH_PROGRESS_SHARE = 30.0
+STOCK_ANALYSIS_PROGRESS_SHARE = 40.0
+
+# Scheduler provider that paces the per-stock agent crews (see config.PROVIDER_RATE_LIMITS)
+LLM_PROVIDER = 'llm'
+# Requests per minute for the portfolio crew; concurrent per-stock crews split it between them
+CREW_MAX_RPM = 20
+# VIX close above which the per-stock crews are told REGIME: DEFENSIVE (same rule as the strategy task)
+DEFENSIVE_VIX = 22.0
+
+
+def _call_tool(tool_obj, *args):
+    """Invokes a CrewAI @tool's underlying function directly (no agent round-trip)."""
+    return getattr(tool_obj, "func", tool_obj)(*args)
+
+
+def default_research_steps() -> Dict[str, Tuple[str, Callable]]:
+    """Per-stock research phase: step name -> (provider, function of the stock dict)."""
+    from rover_tools.news_scraper_tool import scrape_stock_news
+    from rover_tools.stock_data_tool import get_stock_data
+    from rover_tools.shadow_tools import detect_silent_accumulation_tool
+    return {
+        'news': ('news', lambda stock: _call_tool(scrape_stock_news, stock['Symbol'])),
+        'technicals': ('yfinance', lambda stock: _call_tool(get_stock_data, stock['Symbol'])),
+        'shadow': ('yfinance', lambda stock: _call_tool(detect_silent_accumulation_tool, stock['Symbol'])),
+    }
+
+
+def market_regime() -> str:
+    """
+    Regime for the per-stock crews, which run before the strategy task declares one:
+    DEFENSIVE when the latest VIX close in the shared market snapshot is above DEFENSIVE_VIX.
+    """
+    from utils.market_snapshot import market_snapshot
+    try:
+        vix = market_snapshot.closes('^VIX')
+    except Exception as e:
+        logger.warning(f"VIX unavailable for the regime check: {e}")
+        vix = None
+    if vix is None or vix.empty:
+        return "UNKNOWN (VIX unavailable; do not assume DEFENSIVE)"
+    level = float(vix.iloc[-1])
+    if level > DEFENSIVE_VIX:
+        return f"DEFENSIVE (VIX {level:.1f} > {DEFENSIVE_VIX:g})"
+    return f"NORMAL (VIX {level:.1f} <= {DEFENSIVE_VIX:g})"
+
+
+def stock_research_sections(outcome: Dict) -> Dict[str, str]:
+    """Renders run_pipeline output as one prompt section per stock, keyed by symbol."""
+    sections = {}
+    for entry in outcome['results']:
+        symbol = entry['stock'].get('Symbol', 'Unknown')
+        lines = [f"### {symbol}"]
+        lines += [f"[{step}]\n{output}" for step, output in entry['result'].items()]
+        lines += [f"[{step}] unavailable: {err}" for step, err in entry['errors'].items()]
+        sections[symbol] = "\n".join(lines)
+    for entry in outcome['errors']:
+        symbol = entry['stock'].get('Symbol', 'Unknown')
+        sections[symbol] = f"### {symbol}\nResearch unavailable; use your tools."
+    return sections
+
+
+def format_stock_research(outcome: Dict) -> str:
+    """Renders run_pipeline output as one section per stock for the task prompts."""
+    return "\n\n".join(stock_research_sections(outcome).values()) or NO_PREFETCH_NOTE
 
 
 class MarketRoverCrew:
@@ -42,8 +114,14 @@ class MarketRoverCrew:
         
         Args:
             max_parallel_stocks: Maximum number of stocks to process in parallel (default: from config)
-            progress_callback: Optional callback function for progress updates (percentage, stock_name, status)
+            progress_callback: Optional callback function for progress updates (percentage, label, status).
+                Called from worker threads with status 'completed'/'failed' per researched stock and
+                'analyzed'/'analysis_failed' per stock crew (label = symbol),
+                'task_completed' per crew task (label = agent role) and 'step' per agent step.
         """
+        # Per-call token/latency accounting (aggregated by utils.metrics.get_api_usage)
+        install_usage_listener()
+
         # Create all agents
         self.agents = AgentFactory.create_all_agents()
         
@@ -53,21 +131,123 @@ class MarketRoverCrew:
         # Set parallel execution parameters
         self.max_parallel_stocks = max_parallel_stocks or MAX_PARALLEL_STOCKS
         self.progress_callback = progress_callback
+        self.processor = ParallelStockProcessor(self.max_parallel_stocks, RATE_LIMIT_DELAY)
+        self._research: Optional[str] = None
+        self._synthesis_crew = None
+        self._task_count = len(self.tasks)
+        self._progress_base = 0.0
+        self._progress = 0.0
+        self._tasks_done = 0
         
         # Create the crew
         self.crew = Crew(
             agents=list(self.agents.values()),
             tasks=self.tasks,
-            process=Process.sequential,  # Tasks still execute in order, but stock processing is parallel
+            process=Process.sequential,  # Full workflow for runs without portfolio rows
             verbose=True,
-            max_rpm=20,  # Rate limiting for API calls
+            max_rpm=CREW_MAX_RPM,  # Rate limiting for API calls
             manager_llm=None,  # Disable manager LLM to avoid OpenAI requirement
+            task_callback=self._on_task_complete,
+            step_callback=self._on_agent_step,
         )
+
+    def _report(self, percentage: float, label: str, status: str):
+        if not self.progress_callback:
+            return
+        self._progress = max(self._progress, percentage)
+        try:
+            self.progress_callback(self._progress, label, status)
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+    def _on_stock_done(self, percentage: float, symbol: str, status: str):
+        self._report(percentage * RESEARCH_PROGRESS_SHARE / 100, symbol, status)
+
+    def _on_stock_analyzed(self, percentage: float, symbol: str, status: str):
+        share = STOCK_ANALYSIS_PROGRESS_SHARE * percentage / 100
+        status = 'analyzed' if status == 'completed' else 'analysis_failed'
+        self._report(RESEARCH_PROGRESS_SHARE + share, symbol, status)
+
+    def _on_task_complete(self, output):
+        """Crew task_callback: one of the portfolio-level tasks finished."""
+        self._tasks_done += 1
+        share = (100.0 - self._progress_base) * self._tasks_done / max(1, self._task_count)
+        agent = getattr(output, 'agent', None) or 'Crew'
+        self._report(self._progress_base + share, str(agent), 'task_completed')
+
+    def _on_agent_step(self, step):
+        """Crew step_callback: an agent took a reasoning/tool step (no progress change)."""
+        agent = getattr(getattr(step, 'agent', None), 'role', None)
+        label = agent or getattr(step, 'tool', None) or 'Crew'
+        self._report(self._progress, str(label), 'step')
     
+    def gather_stock_research(self, stocks: List[Dict]) -> str:
+        """
+        Runs the independent per-stock work across the processor's bounded pool:
+        first the raw research (news, technicals, shadow) rate-limited per data
+        provider, then one sentiment/technical/shadow agent crew per stock paced
+        by the 'llm' provider and given the VIX regime (market_regime) read once
+        up front. Returns the per-stock analyses for the synthesis.
+        """
+        outcome = self.processor.run_pipeline(stocks, default_research_steps(), self._on_stock_done)
+        logger.info(
+            f"📚 Per-stock research: {outcome['summary']['successful']}/{outcome['summary']['total']} stocks"
+        )
+        research = stock_research_sections(outcome)
+        regime = market_regime()
+        logger.info(f"🧭 Regime for per-stock analysis: {regime}")
+
+        steps = {'analysis': (LLM_PROVIDER, lambda stock: self.analyze_stock(stock, research, regime))}
+        outcome = self.processor.run_pipeline(stocks, steps, self._on_stock_analyzed)
+        logger.info(
+            f"🧠 Per-stock analysis: {outcome['summary']['successful']}/{outcome['summary']['total']} stocks"
+        )
+        return format_stock_research(outcome)
+
+    def analyze_stock(self, stock: Dict, research: Dict[str, str], regime: str) -> str:
+        """Runs the sentiment, technical and shadow tasks for one stock as its own small crew."""
+        symbol = stock['Symbol']
+        agents = AgentFactory.create_stock_agents()
+        crew = Crew(
+            agents=list(agents.values()),
+            tasks=TaskFactory.create_stock_tasks(agents, symbol),
+            process=Process.sequential,
+            verbose=False,
+            max_rpm=max(1, CREW_MAX_RPM // self.max_parallel_stocks),
+            manager_llm=None,
+            step_callback=self._on_agent_step,
+        )
+        result = crew.kickoff(inputs={
+            'stock_research': research.get(symbol, NO_PREFETCH_NOTE),
+            'market_regime': regime,
+        })
+        return str(result)
+
+    def _build_synthesis_crew(self):
+        """Portfolio-level crew run after the per-stock crews (built once, reused across retries)."""
+        tasks = TaskFactory.create_synthesis_tasks(self.agents)
+        crew = Crew(
+            agents=list(self.agents.values()),
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            max_rpm=CREW_MAX_RPM,
+            manager_llm=None,
+            task_callback=self._on_task_complete,
+            step_callback=self._on_agent_step,
+        )
+        return crew, len(tasks)
+
     @retry_operation(max_retries=3, delay=5.0, exceptions=(ValueError, Exception))
-    def run(self):
+    def run(self, stocks: Optional[List[Dict]] = None):
         """
         Execute the Market-Rover 2.0 workflow with parallel stock processing.
+
+        Args:
+            stocks: Portfolio rows (with 'Symbol'). When given, each stock is
+                researched and analysed by its own crew in parallel, and only the
+                portfolio-level synthesis runs sequentially; otherwise the full
+                crew runs in order and the agents call their tools themselves.
         
         Returns:
             Final report from the crew
@@ -79,8 +259,22 @@ class MarketRoverCrew:
         session_id = track_workflow_start("Market Analysis")
         
         try:
-            # Kick off the crew (parallel processing handled within tasks)
-            result = self.crew.kickoff()
+            # Fetched once per crew so retries do not repeat the per-stock phases
+            if self._research is None:
+                self._research = self.gather_stock_research(stocks) if stocks else NO_PREFETCH_NOTE
+
+            crew = self.crew
+            self._task_count = len(self.tasks)
+            self._progress_base = 0.0
+            if stocks:
+                # Only the portfolio-level synthesis runs through a sequential crew
+                if self._synthesis_crew is None:
+                    self._synthesis_crew = self._build_synthesis_crew()
+                crew, self._task_count = self._synthesis_crew
+                self._progress_base = RESEARCH_PROGRESS_SHARE + STOCK_ANALYSIS_PROGRESS_SHARE
+            self._tasks_done = 0
+
+            result = crew.kickoff(inputs={'stock_research': self._research})
 
             logger.info("%s", "\n" + "=" * 60)
             logger.info("✅ Analysis Complete!")
@@ -4,16 +4,22 @@ import yfinance as yf
 from src.state import AgentState
 from src.utils.logger import get_logger
 from src.utils.throttle import throttled
+from src.utils.node_cache import memoize_by_market_date
 
 logger = get_logger(__name__)
 
-@throttled
+@throttled(host="yfinance")
+async def fetch_ticker_info(ticker: str) -> dict:
+    """Raw yfinance info (in a thread). Errors propagate so the throttle can back off and retry."""
+    stock = yf.Ticker(ticker)
+    return await asyncio.to_thread(lambda: stock.info)
+
+
+@memoize_by_market_date("dividend", cacheable=lambda r: r.get("yield") != "Data Unavailable")
 async def get_ticker_dividend(ticker: str):
-    """Fetches dividend data for a single ticker in a thread."""
+    """Fetches dividend data for a single ticker."""
     try:
-        # Wrap synchronous yfinance call in to_thread
-        stock = yf.Ticker(ticker)
-        info = await asyncio.to_thread(lambda: stock.info)
+        info = await fetch_ticker_info(ticker)
 
         dividend_yield = info.get('dividendYield', 0)
         # dividendYield is usually 0.05 for 5%
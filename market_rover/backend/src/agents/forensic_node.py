@@ -3,9 +3,29 @@ import yfinance as yf
 from src.state import AgentState
 from rover_tools.analytics.forensic_engine import ForensicAnalyzer
 from src.utils.logger import get_logger
+from src.utils.node_cache import memoize_by_market_date
 
 logger = get_logger(__name__)
 
+@memoize_by_market_date("forensic", cacheable=lambda r: r.get("status") != "Error")
+async def scan_ticker_forensics(ticker: str) -> dict:
+    """Runs the Forensic Engine for a single ticker."""
+    try:
+        # Use the official Forensic Engine from legacy analytics
+        analyzer = ForensicAnalyzer(ticker)
+        report = analyzer.generate_forensic_report()
+
+        # overall_status 'CRITICAL', 'CAUTION', or 'HEALTHY'
+        return {
+            "ticker": ticker,
+            "status": report.get('overall_status', 'HEALTHY'),
+            "red_flags": report.get('red_flags', 0),
+            "summary": report.get('summary', "No major accounting red flags.")
+        }
+    except Exception as e:
+        logger.error(f"Forensic scan failed for {ticker}: {e}")
+        return {"ticker": ticker, "status": "Error", "summary": "Forensic data unavailable."}
+
 async def forensic_node(state: AgentState) -> dict:
     """
     Node: Forensic Guardrail (Parallel)
@@ -19,27 +39,11 @@ async def forensic_node(state: AgentState) -> dict:
     critical_tickers = []
 
     for ticker in tickers:
-        try:
-            # Use the official Forensic Engine from legacy analytics
-            analyzer = ForensicAnalyzer(ticker)
-            report = analyzer.generate_forensic_report()
-
-            # overall_status 'CRITICAL', 'CAUTION', or 'HEALTHY'
-            status = report.get('overall_status', 'HEALTHY')
-
-            if status == "CRITICAL":
-                red_flags_detected = True
-                critical_tickers.append(ticker)
-
-            forensic_reports.append({
-                "ticker": ticker,
-                "status": status,
-                "red_flags": report.get('red_flags', 0),
-                "summary": report.get('summary', "No major accounting red flags.")
-            })
-        except Exception as e:
-            logger.error(f"Forensic scan failed for {ticker}: {e}")
-            forensic_reports.append({"ticker": ticker, "status": "Error", "summary": "Forensic data unavailable."})
+        entry = await scan_ticker_forensics(ticker)
+        if entry["status"] == "CRITICAL":
+            red_flags_detected = True
+            critical_tickers.append(ticker)
+        forensic_reports.append(entry)
 
     celebrations = []
     feedback_prompts = []
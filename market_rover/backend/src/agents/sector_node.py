@@ -15,7 +15,7 @@ async def sector_node(state: AgentState) -> dict:
     logger.info("Executing Sector Rotator Node (Async)...")
     tickers = state.get("tickers", [])
 
-    # 1. Analyze Sector Flows using existing tool (wrapped in thread)
+    # 1. Analyze Sector Flows (served from the shared sector snapshot, wrapped in thread)
     sector_flow_res = await asyncio.to_thread(analyze_sector_flow_tool.run)
 
     # 2. Map Tickers to Sectors
@@ -2,46 +2,54 @@ import os
 import asyncio
 import yfinance as yf
 from src.state import AgentState
+from src.utils.headline_scorer import classify, headline_scorer
 from src.utils.logger import get_logger
+from src.utils import news_archive
+from src.utils.news_archive import recent_headlines
 from src.utils.throttle import throttled
 
 logger = get_logger(__name__)
 
-@throttled
-async def get_ticker_sentiment(ticker: str):
-    """Fetches and analyzes sentiment for a single ticker in a thread."""
-    try:
-        # Wrap synchronous yfinance call in to_thread
-        stock = yf.Ticker(ticker)
-        news = await asyncio.to_thread(lambda: stock.news)
-
-        # Simple keyword-based sentiment on recent headlines
-        headlines = [n.get('title', '') for n in news[:5]]
-        bullish_keywords = ['gain', 'buy', 'growth', 'positive', 'surge', 'high', 'profit', 'expansion']
-        bearish_keywords = ['fall', 'loss', 'sell', 'warning', 'decline', 'low', 'debt', 'cut']
+@throttled(host="yfinance")
+async def fetch_live_headlines(ticker: str) -> tuple:
+    """Recent yfinance headlines for a ticker (fetched in a thread) and the total news count."""
+    stock = yf.Ticker(ticker)
+    news = await asyncio.to_thread(lambda: stock.news)
+    return [n.get('title', '') for n in news[:5]], len(news)
 
-        score = 0
-        for h in headlines:
-            for w in bullish_keywords:
-                if w in h.lower(): score += 1
-            for w in bearish_keywords:
-                if w in h.lower(): score -= 1
 
-        final_sentiment = "neutral"
-        if score > 0:
-            final_sentiment = "positive"
-        elif score < 0:
-            final_sentiment = "negative"
-
-        return {
-            "ticker": ticker,
-            "sentiment": final_sentiment,
-            "news_count": len(news),
-            "summary": headlines[0] if headlines else "No recent news."
-        }
+async def get_ticker_headlines(ticker: str) -> dict:
+    """Recent headlines for a single ticker, preferring the local news archive when enabled."""
+    try:
+        # Stories the scrapers already collected cost a local query, not a network round-trip
+        headlines = await asyncio.to_thread(recent_headlines, ticker) if news_archive.NEWS_ARCHIVE_ENABLED else []
+        if headlines:
+            return {"ticker": ticker, "headlines": headlines, "news_count": len(headlines), "news_source": "archive"}
+        headlines, news_count = await fetch_live_headlines(ticker)
+        return {"ticker": ticker, "headlines": headlines, "news_count": news_count, "news_source": "yfinance"}
     except Exception as e:
         logger.error(f"Sentiment error for {ticker}: {e}")
-        return {"ticker": ticker, "sentiment": "Data Unavailable"}
+        return {"ticker": ticker, "headlines": None}
+
+
+def score_sentiment(fetched: list) -> list:
+    """Scores every ticker's headlines in one batch pass of the weighted keyword matcher."""
+    scores = headline_scorer.score_by_ticker({f["ticker"]: f["headlines"] for f in fetched if f["headlines"] is not None})
+    results = []
+    for f in fetched:
+        if f["headlines"] is None:
+            results.append({"ticker": f["ticker"], "sentiment": "Data Unavailable"})
+            continue
+        agg = scores[f["ticker"]]
+        results.append({
+            "ticker": f["ticker"],
+            "sentiment": classify(agg["score"]),
+            "score": agg["score"],
+            "news_count": f["news_count"],
+            "news_source": f["news_source"],
+            "summary": f["headlines"][0] if f["headlines"] else "No recent news."
+        })
+    return results
 
 async def sentiment_node(state: AgentState) -> dict:
     """
@@ -54,8 +62,9 @@ async def sentiment_node(state: AgentState) -> dict:
     if not tickers:
         return {"sentiment_data": [], "current_node": "sentiment"}
 
-    # Run all ticker sentiment checks in parallel
-    results = await asyncio.gather(*[get_ticker_sentiment(t) for t in tickers])
+    # Fetch all tickers' headlines in parallel, then score them together
+    fetched = await asyncio.gather(*[get_ticker_headlines(t) for t in tickers])
+    results = score_sentiment(fetched)
 
     bullish_count = sum(1 for r in results if r.get("sentiment") == "positive")
     celebrations = []
@@ -1,19 +1,43 @@
 import os
 import asyncio
+import yfinance as yf
 from src.state import AgentState
-from rover_tools.advanced_skills import calculate_mtc_score_tool, detect_technical_patterns_tool
+from rover_tools.advanced_skills import mtc_score_report, technical_patterns_report
 from src.utils.logger import get_logger
 from src.utils.throttle import throttled
+from src.utils.node_cache import memoize_by_market_date
 
 logger = get_logger(__name__)
 
-@throttled
+# The technical tools report failures (including transient yfinance errors) as text
+_FAILURE_MARKERS = ("Failed to", "No technical data", "Insufficient Data")
+
+
+def _tool_failed(result) -> bool:
+    return not isinstance(result, str) or any(marker in result for marker in _FAILURE_MARKERS)
+
+
+@throttled(host="yfinance")
+async def fetch_price_history(ticker: str, period: str, interval: str):
+    """Raw yfinance history (in a thread). Raises on rate limits / timeouts so the throttle backs off."""
+    stock = yf.Ticker(ticker)
+    return await asyncio.to_thread(lambda: stock.history(period=period, interval=interval, raise_errors=True))
+
+
+@memoize_by_market_date("technicals", cacheable=lambda r: r.get("concordance") != "Data Unavailable")
 async def analyze_ticker_technicals(ticker: str):
-    """Analyzes technicals for a single ticker in a thread."""
+    """Analyzes technicals for a single ticker from one daily and one hourly download."""
     try:
-        # Wrap synchronous tool calls in to_thread using .run()
-        mtc_res = await asyncio.to_thread(calculate_mtc_score_tool.run, ticker=ticker)
-        patterns = await asyncio.to_thread(detect_technical_patterns_tool.run, ticker=ticker)
+        daily, hourly = await asyncio.gather(
+            fetch_price_history(ticker, "1mo", "1d"),
+            fetch_price_history(ticker, "5d", "1h"),
+        )
+        mtc_res = await asyncio.to_thread(mtc_score_report, ticker, daily, hourly)
+        patterns = await asyncio.to_thread(technical_patterns_report, ticker, daily)
+        if _tool_failed(mtc_res) or _tool_failed(patterns):
+            # Reported as unavailable so the market-day cache does not keep the failure
+            logger.warning(f"Technical data unavailable for {ticker}: {mtc_res} / {patterns}")
+            return {"ticker": ticker, "concordance": "Data Unavailable"}
 
         concordance_status = "None"
         if "STRONG BUY CONCORDANCE" in mtc_res or "85/100" in mtc_res:
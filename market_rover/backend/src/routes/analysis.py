@@ -1,147 +1,171 @@
-from fastapi import APIRouter, Query
+import os
+import asyncio
+from fastapi import APIRouter, Query, Request, Response
 from fastapi.responses import JSONResponse
-import yfinance as yf
-import pandas as pd
-from rover_tools.analytics import AnalyzersUnified as MarketAnalyzer
+from src.utils.analytics_jobs import (
+    DEFAULT_TARGET_DATE, normalize_ticker, seasonality_job, forecast_job, backtest_job, robust_heatmap_job,
+    seasonality_batch_job, forecast_batch_job, backtest_batch_job,
+    seasonality_columns, scalar_columns, FORECAST_BATCH_FIELDS, BACKTEST_BATCH_FIELDS,
+)
+from src.utils.analytics_store import analytics_store, make_variant
+from src.utils.http_cache import make_etag, etag_matches, not_modified, tag_response
+from src.utils.offload import run_blocking, OffloadTimeout
 from src.utils.logger import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
-analyzer = MarketAnalyzer()
 
-@router.get("/seasonality/{ticker}")
-async def get_seasonality(ticker: str, exclude_outliers: bool = False):
+# Watchlist-sized batches; one shared panel download per request
+BATCH_MAX_TICKERS = int(os.getenv("BATCH_MAX_TICKERS", "50"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", "120"))
+
+
+async def _run_job(request: Request, response: Response, job, label: str, ticker_clean: str, *args,
+                   kind: str, variant: str):
     """
-    Returns robust seasonality statistics (Avg Return, Win Rate per month).
-    Matches legacy Streamlit 'Market Analysis' tab logic.
+    Answers 304 when the client already holds the payload for the latest bar.
+    Otherwise serves the nightly-materialized payload when present, or runs the
+    analytics job off the event loop and writes the result through to the store.
     """
-    ticker_clean = ticker.strip().upper()
-    if not ticker_clean.endswith(".NS") and not ticker_clean.endswith(".BO"):
-        ticker_clean += ".NS"
+    etag = make_etag(kind, ticker_clean, variant)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    tag_response(response, etag)
+
+    # SQLite reads/writes run in a thread so the event loop never blocks on disk
+    cached = await asyncio.to_thread(analytics_store.get, kind, ticker_clean, variant)
+    if cached is not None:
+        return cached
 
     try:
-        # Fetch max history for seasonality
-        raw = yf.download(ticker_clean, period="max", auto_adjust=True, progress=False)
-        if raw.empty:
+        result = await run_blocking(job, ticker_clean, *args)
+        if result is None:
             return JSONResponse(status_code=404, content={"error": f"No data for {ticker_clean}"})
-
-        stats = analyzer.calculate_seasonality(raw, exclude_outliers=exclude_outliers)
-
-        # Convert to JSON-friendly format
-        result = []
-        for month_idx, row in stats.iterrows():
-            result.append({
-                "month": int(month_idx),
-                "month_name": row["Month_Name"],
-                "avg_return": round(float(row["Avg_Return"]), 2),
-                "win_rate": round(float(row["Win_Rate"]), 2),
-                "count": int(row["Count"])
-            })
-
-        return {
-            "ticker": ticker_clean,
-            "exclude_outliers": exclude_outliers,
-            "data": result
-        }
+        await asyncio.to_thread(analytics_store.put, kind, ticker_clean, result, variant)
+        return result
+    except OffloadTimeout as e:
+        logger.error(f"{label} timed out for {ticker_clean}: {e}")
+        return JSONResponse(status_code=504, content={"error": str(e)})
     except Exception as e:
-        logger.error(f"Seasonality failed for {ticker_clean}: {e}")
+        logger.error(f"{label} failed for {ticker_clean}: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+
+@router.get("/seasonality/{ticker}")
+async def get_seasonality(request: Request, response: Response, ticker: str, exclude_outliers: bool = False):
+    """
+    Returns robust seasonality statistics (Avg Return, Win Rate per month).
+    Matches legacy Streamlit 'Market Analysis' tab logic.
+    """
+    return await _run_job(request, response, seasonality_job, "Seasonality", normalize_ticker(ticker), exclude_outliers,
+                          kind="seasonality", variant=make_variant(exclude_outliers=exclude_outliers))
+
 @router.get("/forecast/{ticker}")
-async def get_robust_forecast(ticker: str, exclude_outliers: bool = False, target_date: str = "2026-12-31"):
+async def get_robust_forecast(request: Request, response: Response, ticker: str, exclude_outliers: bool = False, target_date: str = DEFAULT_TARGET_DATE):
     """
     Returns robust multi-scenario price forecasts (Conservative, Baseline, Aggressive).
     Matches legacy Streamlit 'Forecast' and 'Market Analysis' logic.
     """
-    ticker_clean = ticker.strip().upper()
-    if not ticker_clean.endswith(".NS") and not ticker_clean.endswith(".BO"):
-        ticker_clean += ".NS"
-
-    try:
-        raw = yf.download(ticker_clean, period="max", auto_adjust=True, progress=False)
-        if raw.empty:
-            return JSONResponse(status_code=404, content={"error": f"No data for {ticker_clean}"})
-
-        # Run Backtest to pick winner
-        backtest_res = analyzer.backtest_strategies(raw, exclude_outliers=exclude_outliers)
-        winner = backtest_res["winner"]
-
-        # Run Forecast for the winning strategy
-        if winner == "sd":
-            res = analyzer.calculate_sd_strategy_forecast(raw, target_date=target_date, exclude_outliers=exclude_outliers)
-        else:
-            res = analyzer.calculate_median_strategy_forecast(raw, target_date=target_date, exclude_outliers=exclude_outliers)
-
-        return {
-            "ticker": ticker_clean,
-            "strategy": winner,
-            "confidence": backtest_res["confidence"],
-            "target_date": target_date,
-            "current_price": round(float(raw["Close"].iloc[-1]), 2),
-            "forecast_price": round(float(res["forecast_price"]), 2),
-            "annualized_growth": round(float(res["annualized_growth"]), 2),
-            "projection_path": [{"date": p["date"].isoformat(), "price": round(float(p["price"]), 2)} for p in res["projection_path"]]
-        }
-    except Exception as e:
-        logger.error(f"Forecast failed for {ticker_clean}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+    return await _run_job(request, response, forecast_job, "Forecast", normalize_ticker(ticker), exclude_outliers, target_date,
+                          kind="forecast", variant=make_variant(exclude_outliers=exclude_outliers, target_date=target_date))
 
 @router.get("/backtest/{ticker}")
-async def get_strategy_backtest(ticker: str, exclude_outliers: bool = False):
+async def get_strategy_backtest(request: Request, response: Response, ticker: str, exclude_outliers: bool = False):
     """
     Backtests Median vs SD strategies to determine predictive accuracy.
     """
-    ticker_clean = ticker.strip().upper()
-    if not ticker_clean.endswith(".NS") and not ticker_clean.endswith(".BO"):
-        ticker_clean += ".NS"
-
-    try:
-        raw = yf.download(ticker_clean, period="max", auto_adjust=True, progress=False)
-        if raw.empty:
-            return JSONResponse(status_code=404, content={"error": f"No data for {ticker_clean}"})
-
-        res = analyzer.backtest_strategies(raw, exclude_outliers=exclude_outliers)
-        return {
-            "ticker": ticker_clean,
-            "winner": res["winner"],
-            "median_avg_error": round(float(res["median_avg_error"]), 2),
-            "sd_avg_error": round(float(res["sd_avg_error"]), 2),
-            "confidence": res["confidence"],
-            "years_tested": res["years_tested"]
-        }
-    except Exception as e:
-        logger.error(f"Backtest failed for {ticker_clean}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+    return await _run_job(request, response, backtest_job, "Backtest", normalize_ticker(ticker), exclude_outliers,
+                          kind="backtest", variant=make_variant(exclude_outliers=exclude_outliers))
 
 @router.get("/heatmap/{ticker}")
-async def get_robust_heatmap(ticker: str, exclude_outliers: bool = False):
+async def get_robust_heatmap(request: Request, response: Response, ticker: str, exclude_outliers: bool = False):
     """
     Returns Year x Month returns matrix using the robust engine.
     Matches legacy Streamlit 'Market Analysis' tab logic.
     """
-    ticker_clean = ticker.strip().upper()
-    if not ticker_clean.endswith(".NS") and not ticker_clean.endswith(".BO"):
-        ticker_clean += ".NS"
+    return await _run_job(request, response, robust_heatmap_job, "Heatmap", normalize_ticker(ticker), exclude_outliers,
+                          kind="robust_heatmap", variant=make_variant(exclude_outliers=exclude_outliers))
 
-    try:
-        raw = yf.download(ticker_clean, period="5y", auto_adjust=True, progress=False)
-        if raw.empty:
-            return JSONResponse(status_code=404, content={"error": f"No data for {ticker_clean}"})
 
-        matrix = analyzer.calculate_monthly_returns_matrix(raw, exclude_outliers=exclude_outliers)
+# ── Batch (watchlist) variants ────────────────────────────────────────────────
 
-        # Convert matrix to dict
-        data = {}
-        for year, row in matrix.iterrows():
-            data[str(year)] = {m: (round(float(v), 2) if pd.notna(v) else None) for m, v in row.items()}
+def _parse_tickers(tickers: str) -> list:
+    """'tcs, INFY.NS,tcs' → ['TCS.NS', 'INFY.NS'] (normalized, de-duplicated, order kept)."""
+    return list(dict.fromkeys(normalize_ticker(t) for t in tickers.split(",") if t.strip()))
 
-        return {
-            "ticker": ticker_clean,
-            "exclude_outliers": exclude_outliers,
-            "years": sorted([int(y) for y in data.keys()], reverse=True),
-            "months": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
-            "data": data
-        }
-    except Exception as e:
-        logger.error(f"Heatmap failed for {ticker_clean}: {e}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
+
+async def _run_batch(request: Request, response: Response, job, label: str, tickers: str, *args,
+                     kind: str, variant: str, to_columns):
+    """
+    Batch counterpart of `_run_job`: store hits are served per ticker, every miss is
+    computed in a single offloaded job over one shared price panel, and the merged
+    result is returned as columnar arrays aligned with `tickers`.
+    """
+    tickers_clean = _parse_tickers(tickers)
+    if not tickers_clean:
+        return JSONResponse(status_code=400, content={"error": "No tickers supplied"})
+    if len(tickers_clean) > BATCH_MAX_TICKERS:
+        return JSONResponse(status_code=400, content={"error": f"At most {BATCH_MAX_TICKERS} tickers per batch"})
+
+    etag = make_etag(f"batch:{kind}", ",".join(tickers_clean), variant)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    payloads = await asyncio.to_thread(analytics_store.get_many, kind, tickers_clean, variant)
+    misses = [t for t in tickers_clean if t not in payloads]
+
+    if misses:
+        try:
+            computed = await run_blocking(job, misses, *args, timeout=BATCH_TIMEOUT)
+        except OffloadTimeout as e:
+            logger.error(f"{label} batch timed out for {len(misses)} tickers: {e}")
+            return JSONResponse(status_code=504, content={"error": str(e)})
+        except Exception as e:
+            logger.error(f"{label} batch failed: {e}")
+            return JSONResponse(status_code=500, content={"error": str(e)})
+        await asyncio.to_thread(analytics_store.put_many, [(kind, t, variant, p) for t, p in computed.items()])
+        payloads.update(computed)
+
+    found = [t for t in tickers_clean if t in payloads]
+    tag_response(response, etag)
+    return {
+        "tickers": found,
+        "missing": [t for t in tickers_clean if t not in payloads],
+        **to_columns(found, payloads),
+    }
+
+
+@router.get("/batch/seasonality")
+async def get_seasonality_batch(request: Request, response: Response,
+                                tickers: str = Query(..., description="Comma-separated tickers"),
+                                exclude_outliers: bool = False):
+    """
+    Seasonality for a watchlist in one call: ticker x month matrices of
+    avg_return, win_rate and count, aligned with `tickers` and `months`.
+    """
+    return await _run_batch(request, response, seasonality_batch_job, "Seasonality", tickers, exclude_outliers,
+                            kind="seasonality", variant=make_variant(exclude_outliers=exclude_outliers),
+                            to_columns=seasonality_columns)
+
+@router.get("/batch/forecast")
+async def get_forecast_batch(request: Request, response: Response,
+                             tickers: str = Query(..., description="Comma-separated tickers"),
+                             exclude_outliers: bool = False, target_date: str = DEFAULT_TARGET_DATE):
+    """
+    Winning-strategy forecasts for a watchlist, one array per field.
+    Projection paths are omitted; use /forecast/{ticker} for a single chart.
+    """
+    return await _run_batch(request, response, forecast_batch_job, "Forecast", tickers, exclude_outliers, target_date,
+                            kind="forecast", variant=make_variant(exclude_outliers=exclude_outliers, target_date=target_date),
+                            to_columns=lambda t, p: scalar_columns(t, p, FORECAST_BATCH_FIELDS))
+
+@router.get("/batch/backtest")
+async def get_backtest_batch(request: Request, response: Response,
+                             tickers: str = Query(..., description="Comma-separated tickers"),
+                             exclude_outliers: bool = False):
+    """
+    Median vs SD backtest results for a watchlist, one array per field.
+    """
+    return await _run_batch(request, response, backtest_batch_job, "Backtest", tickers, exclude_outliers,
+                            kind="backtest", variant=make_variant(exclude_outliers=exclude_outliers),
+                            to_columns=lambda t, p: scalar_columns(t, p, BACKTEST_BATCH_FIELDS))
@@ -5,19 +5,52 @@ GET  /api/analyze/status/{taskId} → returns result or pending status.
 """
 import os
 import asyncio
+import threading
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List
-from src.market_rover_graph import create_market_rover_graph
 from src.utils.logger import get_logger
 from src.utils.db_manager import db
 
 router = APIRouter()
 logger = get_logger(__name__)
 
-# Graph is compiled once at import time
-_graph = create_market_rover_graph()
+# Compiled graph singleton. Building it imports LangGraph, CrewAI and every node's
+# tool stack, so it happens on first use (or on startup warm-up), not at import.
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """Returns the compiled Market-Rover graph, building it once per process."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                from src.market_rover_graph import create_market_rover_graph
+                _graph = create_market_rover_graph()
+                logger.info("Market-Rover graph compiled.")
+    return _graph
+
+
+async def warm_graph():
+    """Compiles the graph in a worker thread so startup and the event loop stay responsive."""
+    try:
+        await asyncio.to_thread(get_graph)
+    except Exception as e:
+        logger.error(f"Graph warm-up failed: {e}")
+
+
+_warmup_task = None
+
+
+def start_graph_warmup():
+    """Schedules `warm_graph` on the running loop without blocking startup (GRAPH_WARMUP=false disables)."""
+    global _warmup_task
+    if os.getenv("GRAPH_WARMUP", "true").lower() != "true" or _graph is not None or _warmup_task is not None:
+        return
+    _warmup_task = asyncio.get_running_loop().create_task(warm_graph())
 
 # In-memory task store (should be Redis for horizontal scaling, but using global dict for now)
 active_tasks = {}
@@ -49,7 +82,8 @@ async def analyze_portfolio(request: AnalysisRequest):
                 "errors":               []
             }
             config = {"configurable": {"thread_id": handle}}
-            final_state = await _graph.ainvoke(initial_state, config)
+            graph = await asyncio.to_thread(get_graph)
+            final_state = await graph.ainvoke(initial_state, config)
 
             # Store in DB if needed (e.g. for shadow discovery)
             try:
@@ -2,9 +2,14 @@
 Calendar route — Traditional / Muhurtham windows endpoint.
 GET /api/calendar/muhurtham/{year}   → auspicious trading windows for the year
 GET /api/calendar/seasonal           → seasonal performance patterns (static data)
+GET /api/calendar/strategic/{ticker} → per-ticker best buy/sell days (nightly-materialized)
 """
+import asyncio
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
+from src.utils.analytics_jobs import normalize_ticker, calendar_job
+from src.utils.analytics_store import analytics_store, make_variant
+from src.utils.offload import run_blocking, OffloadTimeout
 from src.utils.logger import get_logger
 from datetime import datetime
 
@@ -54,6 +59,33 @@ async def get_seasonal_patterns():
     return {"patterns": SEASONAL_PATTERNS}
 
 
+@router.get("/strategic/{ticker}")
+async def get_strategic_calendar(ticker: str, exclude_outliers: bool = False):
+    """
+    Returns the Strategic buy/sell calendar for a ticker. Served from the
+    nightly analytics store; computed off the event loop on a miss.
+    """
+    ticker_clean = normalize_ticker(ticker)
+    variant = make_variant(exclude_outliers=exclude_outliers)
+
+    cached = await asyncio.to_thread(analytics_store.get, "calendar", ticker_clean, variant)
+    if cached is not None:
+        return cached
+
+    try:
+        result = await run_blocking(calendar_job, ticker_clean, exclude_outliers)
+        if result is None:
+            return JSONResponse(status_code=404, content={"error": f"No data for {ticker_clean}"})
+        await asyncio.to_thread(analytics_store.put, "calendar", ticker_clean, result, variant)
+        return result
+    except OffloadTimeout as e:
+        logger.error(f"Strategic calendar timed out for {ticker_clean}: {e}")
+        return JSONResponse(status_code=504, content={"error": str(e)})
+    except Exception as e:
+        logger.error(f"Strategic calendar failed for {ticker_clean}: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
 @router.get("")
 async def get_unified_calendar():
     """
@@ -1,10 +1,14 @@
 """
 Forecast routes — historical analysis stance tracker.
-GET /api/forecasts/{user_handle}
+GET /api/forecasts/{user_handle}?limit=50&cursor=...
 """
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query, Response
 from fastapi.responses import JSONResponse
 from src.utils.db_manager import db
+from src.utils.pagination import (
+    PAGE_DEFAULT, PAGE_MAX, NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, split_page
+)
 from src.utils.logger import get_logger
 
 router = APIRouter()
@@ -12,15 +16,25 @@ logger = get_logger(__name__)
 
 
 @router.get("/{user_handle}")
-async def get_forecasts(user_handle: str):
+async def get_forecasts(user_handle: str, response: Response,
+                        limit: int = Query(PAGE_DEFAULT, ge=1, le=PAGE_MAX), cursor: Optional[str] = None):
     """
-    Returns all historical analysis stances for the user as a forecast tracker.
+    Returns the user's historical analysis stances (newest first) as a forecast tracker.
     Sourced from agent_memory_ltm table (written by the reporting_node).
+    When more history exists, the next page's cursor is sent in the X-Next-Cursor header.
     """
+    try:
+        before = decode_cursor(cursor, parts=2)
+    except InvalidCursor as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
     try:
         await db.connect()
-        history = await db.get_forecast_history(user_handle)
-        result = [dict(r) for r in history]
+        history = await db.get_forecast_history(user_handle, limit=limit + 1, before=before)
+        page, next_cursor = split_page(history, limit, key_fields=("ticker",))
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        result = [dict(r) for r in page]
         for item in result:
             if item.get("analysis_date"):
                 item["analysis_date"] = item["analysis_date"].isoformat()
@@ -2,94 +2,150 @@
 Shadow route — dedicated institutional signals endpoint.
 GET /api/shadow/{user_handle}        → user's historical shadow signals
 GET /api/shadow/market               → live cross-ticker shadow scan summary
+
+Both are keyset-paginated (newest first): pass `limit` and the `cursor`
+returned by the previous page.
 """
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query, Response
 from fastapi.responses import JSONResponse
 from src.utils.db_manager import db
+from src.utils.pagination import (
+    PAGE_DEFAULT, PAGE_MAX, NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, split_page
+)
 from src.utils.logger import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# The live market feed has always shown the 20 most recent signals
+MARKET_PAGE_DEFAULT = 20
+
+# Rows without an analysis_date are left out of every page: DESC order puts NULLs
+# first, and a NULL key can neither be encoded in a cursor nor compared by the seek
+
+# Served by idx_ltm_shadow_recent (partial index on these stances)
+_MARKET_FIRST = """
+    SELECT ticker, stance, logic_summary, analysis_date, user_id
+    FROM public.agent_memory_ltm
+    WHERE stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
+      AND analysis_date IS NOT NULL
+    ORDER BY analysis_date DESC, user_id DESC, ticker DESC
+    LIMIT $1
+"""
+_MARKET_NEXT = """
+    SELECT ticker, stance, logic_summary, analysis_date, user_id
+    FROM public.agent_memory_ltm
+    WHERE stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
+      AND analysis_date IS NOT NULL
+      AND (analysis_date, user_id, ticker) < ($2, $3, $4)
+    ORDER BY analysis_date DESC, user_id DESC, ticker DESC
+    LIMIT $1
+"""
+
+# Served by idx_ltm_user_recent
+_USER_FIRST = """
+    SELECT ticker, stance, logic_summary, analysis_date
+    FROM public.agent_memory_ltm
+    WHERE user_id = $1
+      AND stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
+      AND analysis_date IS NOT NULL
+    ORDER BY analysis_date DESC, ticker DESC
+    LIMIT $2
+"""
+_USER_NEXT = """
+    SELECT ticker, stance, logic_summary, analysis_date
+    FROM public.agent_memory_ltm
+    WHERE user_id = $1
+      AND stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
+      AND analysis_date IS NOT NULL
+      AND (analysis_date, ticker) < ($3, $4)
+    ORDER BY analysis_date DESC, ticker DESC
+    LIMIT $2
+"""
+
+
+def _serialize(rows) -> list:
+    result = []
+    for r in rows:
+        item = dict(r)
+        if item.get("analysis_date"):
+            item["analysis_date"] = item["analysis_date"].isoformat()
+        result.append(item)
+    return result
+
+
+async def _fetch_market_page(limit: int, cursor: Optional[str]):
+    before = decode_cursor(cursor, parts=3)
+    async with db._conn() as conn:
+        if before is None:
+            rows = await conn.fetch(_MARKET_FIRST, limit + 1)
+        else:
+            rows = await conn.fetch(_MARKET_NEXT, limit + 1, *before)
+    return split_page(rows, limit, key_fields=("user_id", "ticker"))
+
+
+async def _fetch_user_page(user_handle: str, limit: int, cursor: Optional[str]):
+    before = decode_cursor(cursor, parts=2)
+    async with db._conn() as conn:
+        if before is None:
+            rows = await conn.fetch(_USER_FIRST, user_handle, limit + 1)
+        else:
+            rows = await conn.fetch(_USER_NEXT, user_handle, limit + 1, *before)
+    return split_page(rows, limit, key_fields=("ticker",))
+
 
 @router.get("/market")
-async def get_market_shadow():
+async def get_market_shadow(response: Response,
+                            limit: int = Query(MARKET_PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+                            cursor: Optional[str] = None):
     """
     Returns the latest cross-user shadow signals: ACCUMULATION and DISTRIBUTION
     tickers ranked by recency. Drives the Shadow Discovery tab live feed.
+    The next page's cursor, if any, is sent in the X-Next-Cursor header.
     """
     try:
         await db.connect()
-        query = """
-            SELECT ticker, stance, logic_summary, analysis_date, user_id
-            FROM public.agent_memory_ltm
-            WHERE stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
-            ORDER BY analysis_date DESC
-            LIMIT 20
-        """
-        async with db.pool.acquire() as conn:
-            rows = await conn.fetch(query)
-
-        result = []
-        for r in rows:
-            item = dict(r)
-            if item.get("analysis_date"):
-                item["analysis_date"] = item["analysis_date"].isoformat()
-            result.append(item)
-
-        return result
+        rows, next_cursor = await _fetch_market_page(limit, cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return _serialize(rows)
+    except InvalidCursor as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
     except Exception as e:
         logger.error(f"get_market_shadow failed: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @router.get("")
-async def get_user_shadow_query(user_handle: str = None):
+async def get_user_shadow_query(user_handle: str = None,
+                                limit: int = Query(PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+                                cursor: Optional[str] = None):
     """
-    Returns all shadow/forensic signals generated for the given user (query parameter),
-    filtered to ACCUMULATION and DISTRIBUTION stances only.
+    Returns shadow/forensic signals generated for the given user (query parameter),
+    filtered to ACCUMULATION and DISTRIBUTION stances only, one page at a time.
     If no user_handle is provided, defaults to all market shadow signals.
     """
     try:
         await db.connect()
         if user_handle:
-            query = """
-                SELECT ticker, stance, logic_summary, analysis_date
-                FROM public.agent_memory_ltm
-                WHERE user_id = $1
-                  AND stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
-                ORDER BY analysis_date DESC
-            """
-            async with db.pool.acquire() as conn:
-                rows = await conn.fetch(query, user_handle)
+            rows, next_cursor = await _fetch_user_page(user_handle, limit, cursor)
         else:
-            query = """
-                SELECT ticker, stance, logic_summary, analysis_date, user_id
-                FROM public.agent_memory_ltm
-                WHERE stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING')
-                ORDER BY analysis_date DESC
-                LIMIT 20
-            """
-            async with db.pool.acquire() as conn:
-                rows = await conn.fetch(query)
-
-        result = []
-        for r in rows:
-            item = dict(r)
-            if item.get("analysis_date"):
-                item["analysis_date"] = item["analysis_date"].isoformat()
-            result.append(item)
-
-        return {"shadow_signals": result}
+            rows, next_cursor = await _fetch_market_page(limit, cursor)
+        return {"shadow_signals": _serialize(rows), "next_cursor": next_cursor}
+    except InvalidCursor as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
     except Exception as e:
         logger.error(f"get_user_shadow_query failed: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @router.get("/{user_handle}")
-async def get_user_shadow(user_handle: str):
+async def get_user_shadow(user_handle: str,
+                          limit: int = Query(PAGE_DEFAULT, ge=1, le=PAGE_MAX),
+                          cursor: Optional[str] = None):
     """
-    Returns all shadow/forensic signals generated for the given user (path parameter).
+    Returns shadow/forensic signals generated for the given user (path parameter).
     """
-    res = await get_user_shadow_query(user_handle=user_handle)
+    res = await get_user_shadow_query(user_handle=user_handle, limit=limit, cursor=cursor)
     return res
@@ -21,9 +21,11 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from src.routes import router as api_router
 from src.utils.db_manager import db
+from src.utils.background_workers import start_background_workers, stop_background_workers
 from src.utils.logger import get_logger
 import asyncio
 
@@ -50,11 +52,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Compress JSON bodies over 1 KB (chart/heatmap payloads shrink ~5-10x)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Include the modular routes package
 app.include_router(api_router, prefix="/api")
 
+@app.on_event("startup")
+async def start_background_refreshers():
+    start_background_workers()
+
+@app.on_event("shutdown")
+async def stop_background_refreshers():
+    await stop_background_workers()
+
 @app.get("/")
 async def root():
     return {
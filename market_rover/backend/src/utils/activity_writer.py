@@ -0,0 +1,190 @@
+"""
+Write-behind buffer for telemetry and agent-memory rows.
+
+`log_activity` / `store_memory` used to run one INSERT on the asyncpg pool
+inside the request. While the buffer is running they only enqueue; a
+background task flushes every ACTIVITY_FLUSH_SECONDS or ACTIVITY_FLUSH_SIZE
+rows, using COPY for the append-only activity log and a single executemany
+upsert for agent memory. The queue is bounded: when it is full, activity rows
+are dropped (counted in stats) and memory rows fall back to a direct write.
+
+A failed flush keeps its rows pending (capped at ACTIVITY_QUEUE_MAX, oldest
+dropped first) and is retried on a timer with exponential backoff up to
+ACTIVITY_RETRY_MAX_SECONDS, whether or not new rows arrive.
+"""
+import os
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ACTIVITY_FLUSH_SIZE = int(os.getenv("ACTIVITY_FLUSH_SIZE", "200"))
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "2.0"))
+ACTIVITY_QUEUE_MAX = int(os.getenv("ACTIVITY_QUEUE_MAX", "10000"))
+ACTIVITY_RETRY_MAX_SECONDS = float(os.getenv("ACTIVITY_RETRY_MAX_SECONDS", "60"))
+
+ACTIVITY_COLUMNS = ["user_id", "action_type", "platform", "timestamp"]
+
+MEMORY_UPSERT = """
+    INSERT INTO public.agent_memory_ltm (user_id, ticker, stance, logic_summary, analysis_date)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (user_id, ticker) DO UPDATE
+    SET stance = $3, logic_summary = $4, analysis_date = $5
+"""
+
+
+def _utcnow() -> datetime:
+    # Columns are naive TIMESTAMPs filled with the (UTC) server clock by default
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class WriteBehindBuffer:
+    """Bounded in-process queue drained into Postgres by one background task."""
+
+    def __init__(self, db, flush_size: int = ACTIVITY_FLUSH_SIZE,
+                 flush_seconds: float = ACTIVITY_FLUSH_SECONDS, max_queue: int = ACTIVITY_QUEUE_MAX,
+                 retry_max_seconds: float = ACTIVITY_RETRY_MAX_SECONDS):
+        self.db = db
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_queue = max_queue
+        self.retry_max_seconds = retry_max_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: deque = deque()  # Taken off the queue, not yet committed
+        self._retry_delay = 0.0  # > 0 while backing off after a failed flush
+        self._flushing = False
+        self._closing = False
+        self.flushed = 0
+        self.dropped = 0
+        self.evicted = 0  # Pending rows discarded to respect max_queue while the DB is down
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Starts the flusher on the running event loop (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._closing = False
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="activity-writer")
+
+    async def stop(self):
+        """Stops the flusher and writes everything still queued (server shutdown)."""
+        if not self.running:
+            return
+        self._closing = True
+        if not self._flushing:
+            # Idle or waiting for rows: safe to interrupt
+            self._task.cancel()
+        # An in-flight flush is never cancelled (a COPY that already committed
+        # would be written again); the loop exits once it completes
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for item in self._drain():
+            self._add(item)
+        await self._flush()
+
+    # ── Producers (never await the database) ────────────────────────────────
+
+    def submit_activity(self, user_id: str, action: str, platform: str = "WEB") -> bool:
+        return self._put(("activity", (user_id, action, platform, _utcnow())))
+
+    def submit_memory(self, user_id: str, ticker: str, stance: str, logic: str) -> bool:
+        return self._put(("memory", (user_id, ticker, stance, logic, _utcnow())))
+
+    def _put(self, item) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Activity buffer full ({self.max_queue}); {self.dropped} rows dropped so far.")
+            return False
+
+    # ── Flusher ──────────────────────────────────────────────────────────────
+
+    def _drain(self) -> list:
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _add(self, item):
+        if len(self._pending) >= self.max_queue:
+            self._pending.popleft()
+            self.evicted += 1
+            if self.evicted % 1000 == 1:
+                logger.warning(f"Activity backlog full ({self.max_queue}); {self.evicted} oldest rows evicted so far.")
+        self._pending.append(item)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self._closing:
+            if not self._pending:
+                self._add(await self._queue.get())
+            # While backing off, keep collecting rows but do not flush early on size
+            backing_off = self._retry_delay > 0
+            deadline = loop.time() + (self._retry_delay if backing_off else self.flush_seconds)
+            while backing_off or len(self._pending) < self.flush_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._add(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush()
+
+    async def _flush(self):
+        """Writes every pending row in one transaction; rows stay pending if it fails."""
+        batch = list(self._pending)
+        if not batch:
+            return
+
+        activity = [row for kind, row in batch if kind == "activity"]
+        # Last write wins per (user, ticker), as with sequential upserts
+        memory = list({(row[0], row[1]): row for kind, row in batch if kind == "memory"}.values())
+
+        self._flushing = True
+        try:
+            await self.db.connect()
+            async with self.db._conn() as conn:
+                async with conn.transaction():
+                    if activity:
+                        await conn.copy_records_to_table(
+                            "user_activity_log", schema_name="public",
+                            columns=ACTIVITY_COLUMNS, records=activity,
+                        )
+                    if memory:
+                        await conn.executemany(MEMORY_UPSERT, memory)
+            self._pending.clear()
+            self._retry_delay = 0.0
+            self.flushed += len(activity) + len(memory)
+        except Exception as e:
+            self.failures += 1
+            self._retry_delay = min(max(self._retry_delay * 2, self.flush_seconds), self.retry_max_seconds)
+            logger.error(f"Activity flush failed ({len(batch)} rows kept; retrying in {self._retry_delay:.1f}s): {e}")
+        finally:
+            self._flushing = False
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+            "failures": self.failures,
+            "retry_in": self._retry_delay,
+        }
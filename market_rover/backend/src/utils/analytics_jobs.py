@@ -0,0 +1,466 @@
+"""
+Blocking market analytics jobs behind the /analysis, /heatmap and /snapshot routes.
+
+Every function here is a plain module-level callable returning JSON-ready
+dicts (or None when the ticker has no data), so it can be shipped to the
+offload process pool. This module must stay light: importing it must not pull
+in the routes package, LangGraph or CrewAI.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+DEFAULT_TARGET_DATE = "2026-12-31"
+
+_analyzer = None
+
+
+def _yf():
+    """yfinance, imported on first use: it adds ~0.7 s to API cold start."""
+    import yfinance
+    return yfinance
+
+
+def __getattr__(name):
+    # Keeps `analytics_jobs.yf` / `.MarketAnalyzer` available (and patchable) without
+    # eager imports; rover_tools.analytics pulls in yfinance as well
+    if name == "yf":
+        return _yf()
+    if name == "MarketAnalyzer":
+        from rover_tools.analytics import AnalyzersUnified
+        return AnalyzersUnified
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_analyzer():
+    """Per-process analytics engine (built lazily inside each pool worker)."""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = sys.modules[__name__].MarketAnalyzer()
+    return _analyzer
+
+
+def normalize_ticker(ticker: str) -> str:
+    """Upper-cases and appends .NS unless an exchange suffix is present."""
+    ticker_clean = ticker.strip().upper()
+    if not ticker_clean.endswith(".NS") and not ticker_clean.endswith(".BO"):
+        ticker_clean += ".NS"
+    return ticker_clean
+
+
+def _jsonable(value):
+    """Coerces numpy / datetime scalars into JSON-native values."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 2) if pd.notna(value) else None
+    return value
+
+
+def _column(values, decimals: int = 2) -> list:
+    """Rounds a numeric column (or 2-D block) and maps NaN to None in one vectorized pass."""
+    arr = np.round(np.asarray(values, dtype=float), decimals)
+    out = arr.astype(object)
+    out[np.isnan(arr)] = None
+    return out.tolist()
+
+
+def _download(ticker_clean: str, period: str, **kwargs) -> pd.DataFrame:
+    return _yf().download(ticker_clean, period=period, auto_adjust=True, progress=False, **kwargs)
+
+
+# ── /api/analysis/* ──────────────────────────────────────────────────────────
+
+def seasonality_job(ticker_clean: str, exclude_outliers: bool = False, raw: pd.DataFrame = None):
+    raw = _download(ticker_clean, "max") if raw is None else raw
+    if raw.empty:
+        return None
+
+    stats = get_analyzer().calculate_seasonality(raw, exclude_outliers=exclude_outliers)
+
+    # Convert to JSON-friendly format
+    result = []
+    for month_idx, row in stats.iterrows():
+        result.append({
+            "month": int(month_idx),
+            "month_name": row["Month_Name"],
+            "avg_return": round(float(row["Avg_Return"]), 2),
+            "win_rate": round(float(row["Win_Rate"]), 2),
+            "count": int(row["Count"])
+        })
+
+    return {
+        "ticker": ticker_clean,
+        "exclude_outliers": exclude_outliers,
+        "data": result
+    }
+
+
+def forecast_job(ticker_clean: str, exclude_outliers: bool = False, target_date: str = DEFAULT_TARGET_DATE,
+                 raw: pd.DataFrame = None):
+    raw = _download(ticker_clean, "max") if raw is None else raw
+    if raw.empty:
+        return None
+
+    analyzer = get_analyzer()
+    # Run Backtest to pick winner
+    backtest_res = analyzer.backtest_strategies(raw, exclude_outliers=exclude_outliers)
+    winner = backtest_res["winner"]
+
+    # Run Forecast for the winning strategy
+    if winner == "sd":
+        res = analyzer.calculate_sd_strategy_forecast(raw, target_date=target_date, exclude_outliers=exclude_outliers)
+    else:
+        res = analyzer.calculate_median_strategy_forecast(raw, target_date=target_date, exclude_outliers=exclude_outliers)
+
+    return {
+        "ticker": ticker_clean,
+        "strategy": winner,
+        "confidence": backtest_res["confidence"],
+        "target_date": target_date,
+        "current_price": round(float(raw["Close"].iloc[-1]), 2),
+        "forecast_price": round(float(res["forecast_price"]), 2),
+        "annualized_growth": round(float(res["annualized_growth"]), 2),
+        "projection_path": [{"date": p["date"].isoformat(), "price": round(float(p["price"]), 2)} for p in res["projection_path"]]
+    }
+
+
+def backtest_job(ticker_clean: str, exclude_outliers: bool = False, raw: pd.DataFrame = None):
+    raw = _download(ticker_clean, "max") if raw is None else raw
+    if raw.empty:
+        return None
+
+    res = get_analyzer().backtest_strategies(raw, exclude_outliers=exclude_outliers)
+    return {
+        "ticker": ticker_clean,
+        "winner": res["winner"],
+        "median_avg_error": round(float(res["median_avg_error"]), 2),
+        "sd_avg_error": round(float(res["sd_avg_error"]), 2),
+        "confidence": res["confidence"],
+        "years_tested": res["years_tested"]
+    }
+
+
+def robust_heatmap_job(ticker_clean: str, exclude_outliers: bool = False, raw: pd.DataFrame = None):
+    raw = _download(ticker_clean, "5y") if raw is None else raw
+    if raw.empty:
+        return None
+
+    matrix = get_analyzer().calculate_monthly_returns_matrix(raw, exclude_outliers=exclude_outliers)
+
+    # Convert matrix to dict
+    data = {}
+    for year, row in matrix.iterrows():
+        data[str(year)] = {m: (round(float(v), 2) if pd.notna(v) else None) for m, v in row.items()}
+
+    return {
+        "ticker": ticker_clean,
+        "exclude_outliers": exclude_outliers,
+        "years": sorted([int(y) for y in data.keys()], reverse=True),
+        "months": MONTH_LABELS,
+        "data": data
+    }
+
+
+def calendar_job(ticker_clean: str, exclude_outliers: bool = False, raw: pd.DataFrame = None):
+    """Strategic buy/sell calendar (best entry/exit day per month) for the ticker."""
+    from rover_tools.analytics.seasonality_calendar import SeasonalityCalendar
+
+    raw = _download(ticker_clean, "max") if raw is None else raw
+    if raw.empty:
+        return None
+
+    history = raw[["Close"]].copy()
+    if isinstance(history.columns, pd.MultiIndex):
+        history.columns = history.columns.get_level_values(0)
+    df = SeasonalityCalendar(history, exclude_outliers=exclude_outliers).generate_analysis()
+
+    months = [{k: _jsonable(v) for k, v in rec.items()} for rec in df.to_dict(orient="records")]
+
+    return {
+        "ticker": ticker_clean,
+        "exclude_outliers": exclude_outliers,
+        "months": months
+    }
+
+
+# ── /api/analysis/batch/* ────────────────────────────────────────────────────
+
+# Scalar fields each batch endpoint returns as one array per field
+FORECAST_BATCH_FIELDS = ("strategy", "confidence", "target_date", "current_price",
+                         "forecast_price", "annualized_growth")
+BACKTEST_BATCH_FIELDS = ("winner", "median_avg_error", "sd_avg_error", "confidence", "years_tested")
+
+
+def download_panel(tickers: list, period: str = "max") -> dict:
+    """One yf.download for many tickers; returns ticker → OHLCV frame (tickers without data omitted)."""
+    raw = _yf().download(tickers, period=period, auto_adjust=True, progress=False, group_by="ticker")
+    if raw.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            frame = raw[ticker]
+        elif len(tickers) == 1:
+            frame = raw
+        else:
+            continue
+        frame = frame.dropna(how="all")
+        if not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+def seasonality_batch_job(tickers: list, exclude_outliers: bool = False, frames: dict = None) -> dict:
+    """
+    Seasonality for many tickers in one vectorized pass over a shared close panel.
+    Mirrors AnalyticsCore.calculate_seasonality (incl. per-month IQR outlier removal)
+    and returns ticker → payload in the single-ticker /seasonality shape.
+    """
+    frames = download_panel(tickers) if frames is None else frames
+    if not frames:
+        return {}
+
+    close = pd.DataFrame({t: df["Close"].squeeze() for t, df in frames.items()})
+    if close.index.tz is not None:
+        close.index = close.index.tz_localize(None)
+    returns = close.resample("ME").last().pct_change(fill_method=None)
+    months = returns.index.month
+    observed = returns.groupby(months).count()
+
+    if exclude_outliers:
+        grouped = returns.groupby(months)
+        q1, q3 = grouped.transform("quantile", 0.25), grouped.transform("quantile", 0.75)
+        iqr = q3 - q1
+        keep = (grouped.transform("count") < 4) | ((returns >= q1 - 1.5 * iqr) & (returns <= q3 + 1.5 * iqr))
+        returns = returns.where(keep)
+
+    grouped = returns.groupby(months)
+    count = grouped.count()
+    avg = (grouped.mean() * 100).fillna(0)
+    win = ((returns > 0).groupby(months).sum() / count.replace(0, np.nan) * 100).fillna(0)
+
+    payloads = {}
+    for ticker in close.columns:
+        payloads[ticker] = {
+            "ticker": ticker,
+            "exclude_outliers": exclude_outliers,
+            "data": [
+                {
+                    "month": int(m),
+                    "month_name": MONTH_LABELS[m - 1],
+                    "avg_return": round(float(avg.at[m, ticker]), 2),
+                    "win_rate": round(float(win.at[m, ticker]), 2),
+                    "count": int(count.at[m, ticker]),
+                }
+                for m in observed.index if observed.at[m, ticker] > 0
+            ],
+        }
+    return payloads
+
+
+def _per_ticker_batch(job, tickers: list, *args) -> dict:
+    """Runs a per-ticker job over slices of one shared panel download; failures are logged and omitted."""
+    payloads = {}
+    for ticker, frame in download_panel(tickers).items():
+        try:
+            result = job(ticker, *args, raw=frame)
+        except Exception as e:
+            logger.warning(f"Batch {job.__name__} failed for {ticker}: {e}")
+            continue
+        if result is not None:
+            payloads[ticker] = result
+    return payloads
+
+
+def forecast_batch_job(tickers: list, exclude_outliers: bool = False,
+                       target_date: str = DEFAULT_TARGET_DATE) -> dict:
+    return _per_ticker_batch(forecast_job, tickers, exclude_outliers, target_date)
+
+
+def backtest_batch_job(tickers: list, exclude_outliers: bool = False) -> dict:
+    return _per_ticker_batch(backtest_job, tickers, exclude_outliers)
+
+
+def seasonality_columns(tickers: list, payloads: dict) -> dict:
+    """Ticker x month matrices (null where a month has no history) from /seasonality payloads."""
+    columns = {"avg_return": [], "win_rate": [], "count": []}
+    for ticker in tickers:
+        by_month = {row["month"]: row for row in payloads[ticker]["data"]}
+        for field, values in columns.items():
+            values.append([by_month[m][field] if m in by_month else None for m in range(1, 13)])
+    return {"months": MONTH_LABELS, **columns}
+
+
+def scalar_columns(tickers: list, payloads: dict, fields: tuple) -> dict:
+    """One array per field, aligned with `tickers`."""
+    return {field: [payloads[t].get(field) for t in tickers] for field in fields}
+
+
+# ── /api/heatmap ─────────────────────────────────────────────────────────────
+
+def heatmap_job(ticker_clean: str):
+    raw = _download(ticker_clean, "3y", interval="1mo")
+    if raw.empty:
+        return None
+
+    # Monthly close prices → % change, vectorized
+    close = raw["Close"].squeeze()
+    monthly_returns = (close.pct_change() * 100).round(2)
+    # Index can be Timestamp or (Timestamp, ...) for MultiIndex
+    dates = pd.DatetimeIndex(monthly_returns.index.get_level_values(0))
+
+    cells = pd.DataFrame({"year": dates.year, "month": dates.month, "ret": monthly_returns.to_numpy()})
+    matrix = (
+        cells.drop_duplicates(["year", "month"], keep="last")
+             .pivot(index="year", columns="month", values="ret")
+             .reindex(columns=range(1, 13))
+             .sort_index()
+    )
+
+    values = monthly_returns.to_numpy(dtype=float)
+    best = {"month": "", "return": None}
+    worst = {"month": "", "return": None}
+    if not np.isnan(values).all():
+        # nanargmax/nanargmin return the first occurrence, matching the old strict comparisons
+        hi, lo = dates[np.nanargmax(values)], dates[np.nanargmin(values)]
+        best = {"month": f"{MONTH_LABELS[hi.month - 1]} {hi.year}", "return": float(np.nanmax(values))}
+        worst = {"month": f"{MONTH_LABELS[lo.month - 1]} {lo.year}", "return": float(np.nanmin(values))}
+
+    return {
+        "ticker":  ticker_clean,
+        "years":   [int(y) for y in matrix.index],
+        "months":  MONTH_LABELS,
+        "data":    _column(matrix),
+        "best":    best,
+        "worst":   worst,
+    }
+
+
+# ── /api/snapshot ────────────────────────────────────────────────────────────
+
+# Response key → history column; each becomes one array in the columnar chart
+CHART_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "dma_50": "50_DMA",
+    "dma_200": "200_DMA",
+    "macd": "MACD",
+    "macd_signal": "MACD_Signal",
+    "rsi": "RSI",
+}
+
+def snapshot_job(ticker: str):
+    """Real-time metrics plus a 1-year chart with 50/200 DMA, MACD and RSI."""
+    stock = _yf().Ticker(ticker)
+
+    # 1. Fetch Fast Info / Info for real-time metrics
+    try:
+        info = stock.fast_info
+        current_price = info.get("lastPrice") or info.get("previousClose")
+        prev_close = info.get("previousClose")
+        open_price = info.get("open")
+        day_high = info.get("dayHigh")
+        day_low = info.get("dayLow")
+        fifty_two_high = info.get("yearHigh")
+        fifty_two_low = info.get("yearLow")
+    except Exception as e:
+        logger.warning(f"fast_info failed for {ticker}, falling back to info: {e}")
+        info = stock.info
+        current_price = info.get("currentPrice") or info.get("previousClose")
+        prev_close = info.get("previousClose")
+        open_price = info.get("open")
+        day_high = info.get("dayHigh")
+        day_low = info.get("dayLow")
+        fifty_two_high = info.get("fiftyTwoWeekHigh")
+        fifty_two_low = info.get("fiftyTwoWeekLow")
+
+    # Fallbacks if fast_info/info is incomplete
+    if not current_price: current_price = 0
+    if not prev_close: prev_close = current_price
+
+    # 2. Estimate Circuit Limits (Standard +/- 20% for NSE if not explicitly available)
+    upper_circuit = prev_close * 1.20 if prev_close else 0
+    lower_circuit = prev_close * 0.80 if prev_close else 0
+
+    # 3. Fetch Historical Data (2 years to calculate 200 DMA accurately)
+    hist = stock.history(period="2y")
+
+    dma_50 = 0
+    dma_200 = 0
+    chart = {key: [] for key in ("date", *CHART_COLUMNS)}
+
+    if not hist.empty:
+        # Calculate Moving Averages
+        hist['50_DMA'] = hist['Close'].rolling(window=50).mean()
+        hist['200_DMA'] = hist['Close'].rolling(window=200).mean()
+
+        # Get latest DMAs
+        dma_50 = hist['50_DMA'].iloc[-1] if len(hist) >= 50 and pd.notna(hist['50_DMA'].iloc[-1]) else 0
+        dma_200 = hist['200_DMA'].iloc[-1] if len(hist) >= 200 and pd.notna(hist['200_DMA'].iloc[-1]) else 0
+
+        # Calculate MACD
+        exp1 = hist['Close'].ewm(span=12, adjust=False).mean()
+        exp2 = hist['Close'].ewm(span=26, adjust=False).mean()
+        hist['MACD'] = exp1 - exp2
+        hist['MACD_Signal'] = hist['MACD'].ewm(span=9, adjust=False).mean()
+
+        # Calculate RSI (14-day)
+        delta = hist['Close'].diff()
+        gain = (delta.where(delta > 0, 0)).fillna(0)
+        loss = (-delta.where(delta < 0, 0)).fillna(0)
+        avg_gain = gain.ewm(alpha=1/14, adjust=False).mean()
+        avg_loss = loss.ewm(alpha=1/14, adjust=False).mean()
+        rs = avg_gain / avg_loss
+        hist['RSI'] = 100 - (100 / (1 + rs))
+
+        # Truncate to the last 1 year (approx 252 trading days) for the chart
+        hist_1y = hist.tail(252)
+        chart = {"date": hist_1y.index.strftime('%Y-%m-%d').tolist()}
+        chart.update({key: _column(hist_1y[col]) for key, col in CHART_COLUMNS.items()})
+
+    # 4. Calculate Distance Percentages
+    dma_50_dist = ((current_price - dma_50) / dma_50 * 100) if dma_50 else 0
+    dma_200_dist = ((current_price - dma_200) / dma_200 * 100) if dma_200 else 0
+
+    # 5. Calculate Thermometer Positions (0 to 100)
+    range_52w_pos = 0
+    if fifty_two_high and fifty_two_low and (fifty_two_high > fifty_two_low):
+         range_52w_pos = ((current_price - fifty_two_low) / (fifty_two_high - fifty_two_low)) * 100
+
+    circuit_pos = 0
+    if upper_circuit and lower_circuit and (upper_circuit > lower_circuit):
+         circuit_pos = ((current_price - lower_circuit) / (upper_circuit - lower_circuit)) * 100
+
+    metrics = {
+        "current_price": round(current_price, 2) if current_price else None,
+        "prev_close": round(prev_close, 2) if prev_close else None,
+        "open": round(open_price, 2) if open_price else None,
+        "day_high": round(day_high, 2) if day_high else None,
+        "day_low": round(day_low, 2) if day_low else None,
+        "52w_high": round(fifty_two_high, 2) if fifty_two_high else None,
+        "52w_low": round(fifty_two_low, 2) if fifty_two_low else None,
+        "dma_50": round(dma_50, 2) if dma_50 else None,
+        "dma_200": round(dma_200, 2) if dma_200 else None,
+        "upper_circuit": round(upper_circuit, 2),
+        "lower_circuit": round(lower_circuit, 2),
+        "dma_50_dist_pct": round(dma_50_dist, 2),
+        "dma_200_dist_pct": round(dma_200_dist, 2),
+        "range_52w_pos": max(0, min(100, round(range_52w_pos, 2))),
+        "circuit_pos": max(0, min(100, round(circuit_pos, 2)))
+    }
+
+    return {"ticker": ticker, "metrics": metrics, "chart": chart}
@@ -0,0 +1,152 @@
+"""
+Materialized analytics store.
+
+A local SQLite table of precomputed JSON payloads keyed by
+(kind, ticker, variant). The nightly materializer fills it after market close
+for the whole ticker universe; the analysis, heatmap and calendar routes read
+it first so a hit is a single primary-key lookup instead of a period="max"
+download plus pandas work. Payloads from an older market date are ignored.
+"""
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from src.utils.logger import get_logger
+from src.utils.node_cache import last_market_date
+
+logger = get_logger(__name__)
+
+# Cloud Run's /app is read-only, so fall back to /tmp there (mirrors config.REPORT_DIR)
+_DEFAULT_DIR = Path("/tmp") if os.getenv("K_SERVICE") else Path(__file__).resolve().parents[2] / "data"
+ANALYTICS_STORE_PATH = os.getenv("ANALYTICS_STORE_PATH", str(_DEFAULT_DIR / "analytics_store.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS materialized (
+    kind        TEXT NOT NULL,
+    ticker      TEXT NOT NULL,
+    variant     TEXT NOT NULL DEFAULT '',
+    market_date TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    PRIMARY KEY (kind, ticker, variant)
+);
+CREATE INDEX IF NOT EXISTS idx_materialized_market_date ON materialized (market_date);
+"""
+
+
+def make_variant(**params) -> str:
+    """Stable variant key from query parameters, e.g. 'exclude_outliers=1'."""
+    parts = []
+    for key in sorted(params):
+        value = params[key]
+        if isinstance(value, bool):
+            value = int(value)
+        parts.append(f"{key}={value}")
+    return ";".join(parts)
+
+
+class AnalyticsStore:
+    """Thin SQLite wrapper; one short-lived connection per call (thread-safe)."""
+
+    def __init__(self, path: str = ANALYTICS_STORE_PATH):
+        self.path = path
+        self._initialized_for = None
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if self._initialized_for != self.path:
+            with self._init_lock:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized_for = self.path
+        return conn
+
+    def get(self, kind: str, ticker: str, variant: str = "") -> Optional[Any]:
+        """Returns the stored payload if it was computed for the current market date."""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload, market_date FROM materialized WHERE kind = ? AND ticker = ? AND variant = ?",
+                    (kind, ticker, variant),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Analytics store read failed ({kind}/{ticker}): {e}")
+            return None
+
+        if not row or row[1] < last_market_date().isoformat():
+            return None
+        return json.loads(row[0])
+
+    def get_many(self, kind: str, tickers: Iterable[str], variant: str = "") -> Dict[str, Any]:
+        """Current-market-date payloads for every ticker that has one, over a single connection."""
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT ticker, payload, market_date FROM materialized WHERE kind = ? AND variant = ? "
+                    f"AND ticker IN ({','.join('?' * len(tickers))})",
+                    (kind, variant, *tickers),
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Analytics store batch read failed ({kind}): {e}")
+            return {}
+
+        current = last_market_date().isoformat()
+        return {ticker: json.loads(payload) for ticker, payload, market_date in rows if market_date >= current}
+
+    def put(self, kind: str, ticker: str, payload: Any, variant: str = ""):
+        self.put_many([(kind, ticker, variant, payload)])
+
+    def put_many(self, rows: Iterable[Tuple[str, str, str, Any]]):
+        """Upserts (kind, ticker, variant, payload) rows in a single transaction."""
+        market_date = last_market_date().isoformat()
+        computed_at = datetime.now().isoformat(timespec="seconds")
+        records = [(k, t, v, market_date, computed_at, json.dumps(p)) for k, t, v, p in rows]
+        if not records:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO materialized (kind, ticker, variant, market_date, computed_at, payload)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (kind, ticker, variant) DO UPDATE SET
+                            market_date = excluded.market_date,
+                            computed_at = excluded.computed_at,
+                            payload     = excluded.payload
+                        """,
+                        records,
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Analytics store write failed: {e}")
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT kind, COUNT(*), MAX(market_date) FROM materialized GROUP BY kind"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {kind: {"rows": count, "market_date": md} for kind, count, md in rows}
+
+
+# Global singleton
+analytics_store = AnalyticsStore()
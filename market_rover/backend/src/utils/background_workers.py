@@ -0,0 +1,60 @@
+"""
+Startup / shutdown of the long-lived background workers.
+
+Both the core API (src/server.py) and the unified root gateway (server.py)
+run the same workers, so their startup and shutdown hooks delegate here:
+graph warm-up, activity/memory write-behind, the scheduled market snapshot
+and the opt-in retention and nightly materialization jobs.
+"""
+import os
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _nightly_enabled() -> bool:
+    return os.getenv("NIGHTLY_MATERIALIZE", "false").lower() == "true"
+
+
+def start_background_workers():
+    """Starts the graph warm-up, write-behind, the market snapshot and the opt-in daily jobs."""
+    # Compile the LangGraph in the background; the first /analyze call waits only if it has not finished
+    from src.routes.analyze import start_graph_warmup
+    start_graph_warmup()
+
+    # Telemetry and agent-memory writes leave the request path
+    from src.utils.db_manager import db
+    db.start_write_behind()
+
+    # Index closes for global cues, market context and sector flow, refreshed on a schedule
+    try:
+        from utils.market_snapshot import market_snapshot
+        market_snapshot.start()
+    except Exception as e:
+        logger.error(f"Failed to start market snapshot refresher: {e}")
+
+    # Opt-in: daily partition upkeep and roll-up of expired activity rows
+    if os.getenv("DB_RETENTION", "false").lower() == "true":
+        db.retention.start()
+
+    # Opt-in: precompute analytics for the whole universe after each close
+    if _nightly_enabled():
+        from src.utils.nightly_materializer import nightly_scheduler
+        nightly_scheduler.start()
+
+
+async def stop_background_workers():
+    """Stops the workers started by start_background_workers and the offload executor."""
+    from src.utils.db_manager import db
+    from src.utils.offload import shutdown_executor
+    await db.retention.stop()
+    await db.stop_write_behind()
+    try:
+        from utils.market_snapshot import market_snapshot
+        market_snapshot.stop()
+    except Exception as e:
+        logger.error(f"Failed to stop market snapshot refresher: {e}")
+    if _nightly_enabled():
+        from src.utils.nightly_materializer import nightly_scheduler
+        nightly_scheduler.stop()
+    shutdown_executor()
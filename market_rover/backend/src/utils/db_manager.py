@@ -1,9 +1,15 @@
 import os
 import asyncio
 import asyncpg
+from contextlib import asynccontextmanager
 from urllib.parse import quote_plus
 from datetime import datetime
+from typing import Optional, Tuple
 from src.utils.logger import get_logger
+from src.utils.throttle import get_limiter
+from src.utils.activity_writer import WriteBehindBuffer
+from src.utils.pagination import PAGE_DEFAULT, PAGE_MAX
+from src.utils.retention import RetentionScheduler, provision as provision_retention
 
 logger = get_logger(__name__)
 
@@ -16,6 +22,18 @@ class DBManager:
     def __init__(self):
         self.pool = None
         self._lock = asyncio.Lock()
+        # Telemetry/memory writes are buffered while this runs (see start_write_behind)
+        self.writer = WriteBehindBuffer(self)
+        # Daily partition upkeep and roll-ups; started by the server when DB_RETENTION=true
+        self.retention = RetentionScheduler(self)
+
+    def start_write_behind(self):
+        """Routes log_activity/store_memory through the batching buffer (server startup)."""
+        self.writer.start()
+
+    async def stop_write_behind(self):
+        """Flushes and stops the buffer (server shutdown)."""
+        await self.writer.stop()
 
     async def connect(self):
         async with self._lock:
@@ -54,6 +72,13 @@ class DBManager:
                     logger.error(f"PostgreSQL Connection Error: {e}")
                     raise
 
+    @asynccontextmanager
+    async def _conn(self):
+        """Acquires a pooled connection behind the adaptive Postgres limiter."""
+        async with get_limiter("postgres"):
+            async with self.pool.acquire() as conn:
+                yield conn
+
     async def _provision_tables(self):
         """Ensures all required tables exist in the public schema."""
         async with self.pool.acquire() as conn:
@@ -73,13 +98,12 @@ class DBManager:
                     PRIMARY KEY (user_id, ticker)
                 );
 
-                CREATE TABLE IF NOT EXISTS public.user_activity_log (
-                    id SERIAL PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    action_type TEXT NOT NULL,
-                    platform TEXT DEFAULT 'WEB',
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
+                -- Keyset pagination: newest-first range scans per user and across shadow stances
+                CREATE INDEX IF NOT EXISTS idx_ltm_user_recent
+                    ON public.agent_memory_ltm (user_id, analysis_date DESC, ticker DESC);
+                CREATE INDEX IF NOT EXISTS idx_ltm_shadow_recent
+                    ON public.agent_memory_ltm (analysis_date DESC, user_id DESC, ticker DESC)
+                    WHERE stance IN ('ACCUMULATION', 'DISTRIBUTION', 'WARNING');
 
                 CREATE TABLE IF NOT EXISTS public.social_shares (
                     id SERIAL PRIMARY KEY,
@@ -90,25 +114,32 @@ class DBManager:
                     share_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
             """)
+            # Monthly-partitioned user_activity_log plus the retention roll-up tables
+            await provision_retention(conn)
 
     async def log_activity(self, user_handle: str, action: str, platform: str = "WEB"):
-        """Logs user login/interaction events."""
+        """Logs user login/interaction events (enqueued when the write-behind buffer runs)."""
+        if self.writer.running:
+            self.writer.submit_activity(user_handle, action, platform)  # Dropped if the buffer is full
+            return
         query = """
             INSERT INTO public.user_activity_log (user_id, action_type, platform)
             VALUES ($1, $2, $3)
         """
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             await conn.execute(query, user_handle, action, platform)
 
     async def store_memory(self, user_handle: str, ticker: str, stance: str, logic: str):
         """Stores final analysis conclusion as Long-Term Memory (LTM)."""
+        if self.writer.running and self.writer.submit_memory(user_handle, ticker, stance, logic):
+            return
         query = """
             INSERT INTO public.agent_memory_ltm (user_id, ticker, stance, logic_summary)
             VALUES ($1, $2, $3, $4)
             ON CONFLICT (user_id, ticker) DO UPDATE
             SET stance = $3, logic_summary = $4, analysis_date = CURRENT_TIMESTAMP
         """
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             await conn.execute(query, user_handle, ticker, stance, logic)
 
     async def get_memory(self, user_handle: str, ticker: str):
@@ -119,7 +150,7 @@ class DBManager:
             WHERE user_id = $1 AND ticker = $2
             ORDER BY analysis_date DESC LIMIT 1
         """
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             return await conn.fetchrow(query, user_handle, ticker)
 
     async def record_share(self, user_handle: str, platform: str, content_type: str, reach: int = 1):
@@ -128,7 +159,7 @@ class DBManager:
             INSERT INTO public.social_shares (user_id, platform, content_type, recipient_count)
             VALUES ($1, $2, $3, $4)
         """
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             await conn.execute(query, user_handle, platform, content_type, reach)
 
     async def set_user_persona(self, user_handle: str, persona: str):
@@ -138,25 +169,40 @@ class DBManager:
             VALUES ($1, $2, CURRENT_TIMESTAMP)
             ON CONFLICT (user_id) DO UPDATE SET persona = $2, last_updated = CURRENT_TIMESTAMP
         """
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             await conn.execute(query, user_handle, persona)
 
     async def get_user_persona(self, user_handle: str):
         """Retrieves the investor persona."""
         query = "SELECT persona FROM public.user_profiles WHERE user_id = $1"
-        async with self.pool.acquire() as conn:
+        async with self._conn() as conn:
             return await conn.fetchval(query, user_handle)
 
-    async def get_forecast_history(self, user_handle: str):
-        """Retrieves all historical analysis stances as a forecast tracker."""
-        query = """
-            SELECT ticker, stance, logic_summary, analysis_date
-            FROM public.agent_memory_ltm
-            WHERE user_id = $1
-            ORDER BY analysis_date DESC
+    async def get_forecast_history(self, user_handle: str, limit: int = PAGE_DEFAULT,
+                                   before: Optional[Tuple[datetime, str]] = None):
         """
-        async with self.pool.acquire() as conn:
-            return await conn.fetch(query, user_handle)
+        Retrieves historical analysis stances as a forecast tracker, newest first.
+        Keyset-paginated: pass the (analysis_date, ticker) of the last row seen as `before`.
+        Rows without an analysis_date cannot be placed in the seek order and are skipped.
+        """
+        limit = min(limit, PAGE_MAX + 1)  # +1 lets callers detect a further page
+        # Separate first/next-page statements so each prepared plan is a pure index range scan
+        async with self._conn() as conn:
+            if before is None:
+                return await conn.fetch("""
+                    SELECT ticker, stance, logic_summary, analysis_date
+                    FROM public.agent_memory_ltm
+                    WHERE user_id = $1 AND analysis_date IS NOT NULL
+                    ORDER BY analysis_date DESC, ticker DESC
+                    LIMIT $2
+                """, user_handle, limit)
+            return await conn.fetch("""
+                SELECT ticker, stance, logic_summary, analysis_date
+                FROM public.agent_memory_ltm
+                WHERE user_id = $1 AND analysis_date IS NOT NULL AND (analysis_date, ticker) < ($2, $3)
+                ORDER BY analysis_date DESC, ticker DESC
+                LIMIT $4
+            """, user_handle, before[0], before[1], limit)
 
 # Global singleton
 db = DBManager()
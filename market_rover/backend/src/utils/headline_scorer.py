@@ -0,0 +1,86 @@
+"""
+Weighted keyword scoring for news headlines.
+
+The whole lexicon is compiled into one case-insensitive regex alternation, and
+a batch of headlines is scored with a single scan over their newline-joined
+text; match offsets are mapped back to headlines with a binary search. Terms
+are matched at the start of a word and extend over its suffix ("gain" also
+matches "gains"/"gained"), and each term counts at most once per headline.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping
+
+# Term -> weight. Positive terms lift a headline's score, negative ones lower it.
+DEFAULT_LEXICON: Dict[str, float] = {
+    # Bullish
+    "gain": 1.0, "buy": 1.0, "growth": 1.0, "positive": 1.0, "surge": 1.0, "high": 1.0,
+    "profit": 1.0, "expansion": 1.0, "upgrade": 1.5, "record high": 2.0, "beats estimates": 1.5,
+    "rally": 1.0, "order win": 1.5,
+    # Bearish
+    "fall": -1.0, "loss": -1.0, "sell": -1.0, "warning": -1.0, "decline": -1.0, "low": -1.0,
+    "debt": -1.0, "cut": -1.0, "downgrade": -1.5, "misses estimates": -1.5, "default": -2.0,
+    "fraud": -2.0, "probe": -1.5, "plunge": -1.5,
+}
+
+
+class HeadlineScorer:
+    """Scores headlines against a weighted lexicon in one regex pass per batch."""
+
+    def __init__(self, lexicon: Mapping[str, float] = DEFAULT_LEXICON):
+        self.weights = {term.lower(): float(weight) for term, weight in lexicon.items()}
+        # Longest first so multi-word phrases win over their leading word
+        alternation = "|".join(re.escape(term) for term in sorted(self.weights, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b({alternation})\w*", re.IGNORECASE)
+
+    def score(self, headlines: List[str]) -> List[float]:
+        """Per-headline scores, in input order."""
+        if not headlines:
+            return []
+        # Headlines are single-line; flatten any stray newlines so offsets stay aligned
+        lines = [h.replace("\n", " ") if h else "" for h in headlines]
+        starts, offset = [], 0
+        for line in lines:
+            starts.append(offset)
+            offset += len(line) + 1
+
+        seen = [set() for _ in lines]
+        scores = [0.0] * len(lines)
+        for match in self._pattern.finditer("\n".join(lines)):
+            idx = bisect_right(starts, match.start()) - 1
+            term = match.group(1).lower()
+            if term not in seen[idx]:
+                seen[idx].add(term)
+                scores[idx] += self.weights[term]
+        return scores
+
+    def score_by_ticker(self, headlines_by_ticker: Mapping[str, Iterable[str]]) -> Dict[str, Dict]:
+        """
+        Aggregates for every ticker from one batch scan:
+        {ticker: {"score", "headlines", "bullish", "bearish"}} (bullish/bearish = headline counts).
+        """
+        tickers, batch = [], []
+        for ticker, headlines in headlines_by_ticker.items():
+            for headline in headlines:
+                tickers.append(ticker)
+                batch.append(headline)
+
+        totals = {t: {"score": 0.0, "headlines": 0, "bullish": 0, "bearish": 0} for t in headlines_by_ticker}
+        for ticker, value in zip(tickers, self.score(batch)):
+            agg = totals[ticker]
+            agg["score"] += value
+            agg["headlines"] += 1
+            agg["bullish"] += value > 0
+            agg["bearish"] += value < 0
+        return totals
+
+
+def classify(score: float) -> str:
+    if score > 0:
+        return "positive"
+    if score < 0:
+        return "negative"
+    return "neutral"
+
+
+headline_scorer = HeadlineScorer()
@@ -0,0 +1,71 @@
+"""
+Conditional GET support (ETag / If-None-Match) for market analytics routes.
+
+Snapshot, heatmap, seasonality and forecast payloads only change when a new
+bar arrives, so their ETag is derived from the route, ticker, query variant
+and the timestamp of the latest bar — all known before any work is done.
+A matching If-None-Match is answered with 304 without touching the store,
+the offload pool or the serializer.
+
+The tags are weak (W/"..."): GZipMiddleware sends the same tag on gzip and
+identity bodies, which are different byte representations, so the validator
+only promises semantic equivalence and is compared weakly.
+"""
+import os
+import hashlib
+from datetime import datetime, time
+from typing import Optional
+from fastapi import Request, Response
+from src.utils.node_cache import IST, MARKET_CLOSE, last_market_date
+
+MARKET_OPEN = time(9, 15)
+
+# Live snapshot prices move intraday; their "bar" is this many seconds wide
+SNAPSHOT_BAR_SECONDS = int(os.getenv("SNAPSHOT_BAR_SECONDS", "60"))
+
+# Every client/CDN copy must revalidate, but may be stored and reused on 304
+CACHE_CONTROL = "public, no-cache"
+
+# Bump when a payload shape changes so old client copies stop matching
+ETAG_VERSION = "2"
+
+
+def last_bar_stamp(intraday_seconds: Optional[int] = None, now: Optional[datetime] = None) -> str:
+    """
+    Timestamp of the latest bar a payload can contain.
+    Daily analytics use the last completed NSE session; with `intraday_seconds`,
+    market hours are bucketed into bars of that width instead.
+    """
+    now = (now or datetime.now(IST)).astimezone(IST)
+    if intraday_seconds and now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE:
+        bucket = int(now.timestamp()) // intraday_seconds * intraday_seconds
+        return datetime.fromtimestamp(bucket, IST).isoformat(timespec="seconds")
+    return last_market_date(now).isoformat()
+
+
+def make_etag(kind: str, ticker: str, variant: str = "", stamp: Optional[str] = None) -> str:
+    """Weak ETag for one (route, ticker, variant) payload at the latest bar."""
+    stamp = stamp or last_bar_stamp()
+    digest = hashlib.sha1(f"{ETAG_VERSION}|{kind}|{ticker}|{variant}|{stamp}".encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (RFC 9110 weak comparison: W/ prefixes are ignored on both sides)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def tag_response(response: Response, etag: str):
+    """Stamps the validator on a 200 response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
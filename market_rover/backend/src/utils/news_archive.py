@@ -0,0 +1,66 @@
+"""
+Read-only access to the scraper's local news archive.
+
+The Streamlit crew's news tools keep every parsed article in a SQLite store
+(root `utils/article_store.py`) with a story -> ticker map. Graph nodes read
+recent headlines from it directly so they do not go back to the network for
+coverage the process already has. A missing or empty store just yields [].
+
+This is a local/dev optimisation: the store is only populated where the
+Streamlit app runs next to the API on the same disk. The deployed container
+runs the API alone with a per-instance /tmp, so on Cloud Run (K_SERVICE set)
+the archive is off unless NEWS_ARCHIVE=true, and sentiment goes straight to the
+live feed.
+"""
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_REPO_ROOT = Path(__file__).resolve().parents[4]
+_DEFAULT_PATH = Path("/tmp/news_store.sqlite") if os.getenv("K_SERVICE") else Path("data/news_store.sqlite")
+NEWS_STORE_PATH = _REPO_ROOT / os.getenv("NEWS_STORE_PATH", str(_DEFAULT_PATH))
+
+NEWS_ARCHIVE_ENABLED = os.getenv("NEWS_ARCHIVE", "false" if os.getenv("K_SERVICE") else "true").lower() == "true"
+
+# Headlines newer than this are considered current enough to skip a live fetch
+NEWS_ARCHIVE_MAX_AGE_DAYS = int(os.getenv("NEWS_ARCHIVE_MAX_AGE_DAYS", "2"))
+
+_HEADLINES_SQL = """
+SELECT a.title
+FROM articles a
+JOIN stories s ON s.url = a.url
+WHERE a.parsed = 1
+  AND s.story_id IN (
+      SELECT t.story_id FROM story_tickers t
+      WHERE REPLACE(REPLACE(UPPER(t.ticker), '.NS', ''), '.BO', '') = ?
+  )
+  AND substr(COALESCE(a.published_at, datetime(a.fetched_at, 'unixepoch')), 1, 10) >= ?
+GROUP BY s.story_id
+ORDER BY MAX(COALESCE(a.published_at, datetime(a.fetched_at, 'unixepoch'))) DESC
+LIMIT ?
+"""
+
+
+def recent_headlines(ticker: str, days: int = NEWS_ARCHIVE_MAX_AGE_DAYS, limit: int = 5,
+                     path: Path = None) -> List[str]:
+    """Newest story headlines archived for `ticker` in the last `days` days (one per story)."""
+    path = Path(path or NEWS_STORE_PATH)
+    if not path.exists():
+        return []
+    key = ticker.strip().upper().replace(".NS", "").replace(".BO", "")
+    since = (datetime.now() - timedelta(days=days)).date().isoformat()
+    try:
+        with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+            rows = conn.execute(_HEADLINES_SQL, (key, since, limit)).fetchall()
+        return [title for (title,) in rows if title]
+    except sqlite3.Error as e:
+        # Older store without the story tables, or locked mid-migration
+        logger.debug(f"News archive unavailable for {ticker}: {e}")
+        return []
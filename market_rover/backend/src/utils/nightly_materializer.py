@@ -0,0 +1,163 @@
+"""
+Nightly materialization of market analytics for the whole ticker universe.
+
+After the NSE close this job downloads each ticker's full history once and
+precomputes the seasonality, backtest, forecast, robust heatmap, monthly
+heatmap and strategic calendar payloads (both outlier variants) into the
+analytics store. Run it from a scheduler/cron with:
+
+    python -m src.utils.nightly_materializer [--tickers TCS.NS INFY.NS] [--workers 4]
+
+or in-process by setting NIGHTLY_MATERIALIZE=true on the API server.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, time as dtime
+from typing import List, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MATERIALIZE_AT = os.getenv("MATERIALIZE_AT", "16:30")  # IST, after the 15:30 close
+MATERIALIZE_WORKERS = int(os.getenv("MATERIALIZE_WORKERS", str(min(4, os.cpu_count() or 1))))
+OUTLIER_VARIANTS = (False, True)
+
+
+def universe_tickers() -> List[str]:
+    """Every symbol in the ticker_resources universes (Nifty 50, Sensex, Next 50, Midcap)."""
+    from rover_tools.ticker_resources import get_common_tickers
+    return sorted({entry.split(" - ")[0].strip().upper() for entry in get_common_tickers("All")})
+
+
+def materialize_ticker(ticker: str) -> list:
+    """
+    Computes every materialized payload for one ticker (runs inside a pool worker).
+    Returns (kind, ticker, variant, payload) rows; empty if the ticker has no data.
+    """
+    from src.utils import analytics_jobs as jobs
+    from src.utils.analytics_store import make_variant
+
+    ticker_clean = jobs.normalize_ticker(ticker)
+    raw = jobs._download(ticker_clean, "max")
+    if raw.empty:
+        return []
+
+    # The robust heatmap uses a 5-year window; slice it from the shared download
+    raw_5y = raw[raw.index >= raw.index[-1] - timedelta(days=5 * 365)]
+
+    rows = []
+    for exclude in OUTLIER_VARIANTS:
+        variant = make_variant(exclude_outliers=exclude)
+        rows.append(("seasonality", ticker_clean, variant, jobs.seasonality_job(ticker_clean, exclude, raw=raw)))
+        rows.append(("backtest", ticker_clean, variant, jobs.backtest_job(ticker_clean, exclude, raw=raw)))
+        rows.append(("robust_heatmap", ticker_clean, variant, jobs.robust_heatmap_job(ticker_clean, exclude, raw=raw_5y)))
+        rows.append(("calendar", ticker_clean, variant, jobs.calendar_job(ticker_clean, exclude, raw=raw)))
+        rows.append((
+            "forecast", ticker_clean,
+            make_variant(exclude_outliers=exclude, target_date=jobs.DEFAULT_TARGET_DATE),
+            jobs.forecast_job(ticker_clean, exclude, jobs.DEFAULT_TARGET_DATE, raw=raw),
+        ))
+    rows.append(("heatmap", ticker_clean, "", jobs.heatmap_job(ticker_clean)))
+    return [r for r in rows if r[3] is not None]
+
+
+def run_nightly(tickers: Optional[List[str]] = None, workers: int = MATERIALIZE_WORKERS) -> dict:
+    """Materializes the universe in a process pool and writes results from this process."""
+    from src.utils.analytics_store import analytics_store
+
+    tickers = tickers or universe_tickers()
+    started = time.time()
+    done, failed, rows_written = 0, [], 0
+
+    logger.info(f"Nightly materialization started for {len(tickers)} tickers ({workers} workers).")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(materialize_ticker, t): t for t in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                rows = future.result()
+                analytics_store.put_many(rows)
+                rows_written += len(rows)
+                done += 1
+            except Exception as e:
+                logger.error(f"Materialization failed for {ticker}: {e}")
+                failed.append(ticker)
+
+    summary = {
+        "tickers": len(tickers),
+        "succeeded": done,
+        "failed": failed,
+        "rows": rows_written,
+        "seconds": round(time.time() - started, 1),
+    }
+    logger.info(f"Nightly materialization finished: {summary}")
+    return summary
+
+
+def _seconds_until_next_run(now: Optional[datetime] = None) -> float:
+    """Seconds until the next weekday MATERIALIZE_AT (IST)."""
+    from src.utils.node_cache import IST
+    now = (now or datetime.now(IST)).astimezone(IST)
+    hour, minute = (int(x) for x in MATERIALIZE_AT.split(":"))
+    run_at = datetime.combine(now.date(), dtime(hour, minute), tzinfo=IST)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    while run_at.weekday() >= 5:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+
+class NightlyScheduler:
+    """Daemon thread that runs `run_nightly` once per trading day after the close."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(_seconds_until_next_run()):
+            try:
+                run_nightly()
+            except Exception as e:
+                logger.error(f"Nightly materialization crashed: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nightly-materializer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Signals the thread and waits briefly; an in-progress run is left to finish as a daemon."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+
+nightly_scheduler = NightlyScheduler()
+
+
+def main(argv=None):
+    # Make src.* and the root-level rover_tools importable when run as a script
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for path in (backend_dir, os.path.dirname(os.path.dirname(backend_dir))):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    parser = argparse.ArgumentParser(description="Precompute market analytics for the ticker universe.")
+    parser.add_argument("--tickers", nargs="*", help="Subset of tickers (default: whole universe)")
+    parser.add_argument("--workers", type=int, default=MATERIALIZE_WORKERS)
+    args = parser.parse_args(argv)
+    summary = run_nightly(args.tickers, workers=args.workers)
+    return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Node-level result memoization for the Market-Rover Intelligence Graph.
+
+Per-ticker branches (dividend, technicals, forensic, sector) only depend on the
+ticker and the last NSE close, never on the user. Results are therefore cached
+per (namespace, ticker, market_date) and shared across every user's graph run.
+Concurrent requests for the same key are coalesced so a popular ticker is
+computed once per trading day.
+"""
+import os
+import asyncio
+import functools
+import inspect
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Optional
+from zoneinfo import ZoneInfo
+
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_CLOSE = time(15, 30)
+
+# Upper bound on cached node outputs across all namespaces
+NODE_CACHE_MAX_ENTRIES = int(os.getenv("NODE_CACHE_MAX_ENTRIES", "4096"))
+
+
+def last_market_date(now: Optional[datetime] = None) -> date:
+    """
+    Returns the date of the most recent completed NSE session.
+    Before 15:30 IST (or on weekends) this rolls back to the previous weekday.
+    Exchange holidays are not modelled; they simply reuse the prior close key.
+    """
+    now = (now or datetime.now(IST)).astimezone(IST)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:  # Saturday / Sunday
+        day -= timedelta(days=1)
+    return day
+
+
+class NodeResultCache:
+    """
+    Bounded LRU cache of node outputs keyed by (namespace, ticker, market_date).
+    Entries from older market dates are never served and are evicted lazily.
+    """
+
+    def __init__(self, max_entries: int = NODE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._locks: dict = {}
+        self._market_date: Optional[date] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def get(self, key: tuple) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: tuple, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+    def lock_for(self, key: tuple) -> asyncio.Lock:
+        """Per-key lock used to coalesce concurrent misses (single-flight)."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def purge_stale(self, market_date: date):
+        """Drops every entry computed for a market date other than `market_date`."""
+        if market_date == self._market_date:
+            return
+        self._market_date = market_date
+        for key in [k for k in self._entries if k[2] != market_date]:
+            del self._entries[key]
+        for key in [k for k in self._locks if k[2] != market_date]:
+            del self._locks[key]
+
+    def clear(self):
+        self._entries.clear()
+        self._locks.clear()
+        self._market_date = None
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global singleton shared by every graph run in this process
+node_cache = NodeResultCache()
+
+
+def memoize_by_market_date(namespace: str, cacheable: Callable[[Any], bool] = lambda r: r is not None):
+    """
+    Decorator for async per-ticker node helpers: `async def fn(ticker, ...)`.
+    The first parameter (default included) is treated as the ticker. Results rejected by
+    `cacheable` (e.g. error placeholders) are returned but not stored.
+    """
+    def decorator(func: Callable[..., Any]):
+        signature = inspect.signature(func)
+        first_param = next(iter(signature.parameters))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            ticker = str(bound.arguments[first_param])
+            market_date = last_market_date()
+            key = (namespace, ticker.strip().upper(), market_date)
+
+            cached = node_cache.get(key)
+            if cached is not None:
+                return cached
+
+            async with node_cache.lock_for(key):
+                # Another coroutine may have filled the slot while we waited
+                if key in node_cache:
+                    return node_cache.get(key)
+
+                result = await func(*args, **kwargs)
+                if cacheable(result):
+                    node_cache.purge_stale(market_date)
+                    node_cache.set(key, result)
+                return result
+        return wrapper
+    return decorator
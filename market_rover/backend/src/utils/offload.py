@@ -0,0 +1,67 @@
+"""
+CPU / blocking-work offload for async route handlers.
+
+`yf.download` plus the pandas analytics behind the seasonality, forecast,
+heatmap and snapshot routes would otherwise run on the event loop and stall
+every other request on the worker. `run_blocking` ships the work to a shared
+process pool (or a thread pool when OFFLOAD_EXECUTOR=thread, e.g. in tests)
+and bounds it with a timeout.
+"""
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+OFFLOAD_EXECUTOR = os.getenv("OFFLOAD_EXECUTOR", "process")  # "process" | "thread"
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+OFFLOAD_TIMEOUT = float(os.getenv("OFFLOAD_TIMEOUT", "45"))
+
+_executor: Optional[Executor] = None
+
+
+class OffloadTimeout(Exception):
+    """Raised when offloaded work exceeds its time budget."""
+
+
+def get_executor() -> Executor:
+    """Returns the shared executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        if OFFLOAD_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=OFFLOAD_WORKERS, thread_name_prefix="offload")
+        else:
+            # 'spawn' keeps workers free of the parent's event loop and locks
+            _executor = ProcessPoolExecutor(max_workers=OFFLOAD_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Offload executor ready ({OFFLOAD_EXECUTOR}, {OFFLOAD_WORKERS} workers).")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Runs `fn(*args, **kwargs)` off the event loop and awaits the result.
+    `fn` must be a picklable module-level function in process mode.
+    If the timeout fires or the request is cancelled, work that has not started
+    yet is cancelled; a task already running in a worker is left to finish but
+    its result is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout=timeout or OFFLOAD_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Offloaded call {getattr(fn, '__name__', fn)} timed out after {timeout or OFFLOAD_TIMEOUT}s")
+        raise OffloadTimeout(f"{getattr(fn, '__name__', 'task')} exceeded {timeout or OFFLOAD_TIMEOUT}s")
+
+
+def shutdown_executor():
+    """Stops the shared executor, dropping queued work (called on server shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
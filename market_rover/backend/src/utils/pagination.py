@@ -0,0 +1,55 @@
+"""
+Keyset (seek) pagination helpers for the agent_memory_ltm history queries.
+
+Pages are ordered newest first by (analysis_date, <unique tiebreakers>) and the
+cursor is an opaque token holding the last row's key, so every page is one
+bounded index range scan no matter how much history exists.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+PAGE_DEFAULT = 50
+PAGE_MAX = 200
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor this server did not issue."""
+
+
+def encode_cursor(analysis_date: datetime, *tiebreakers: str) -> str:
+    raw = json.dumps([analysis_date.isoformat(), *tiebreakers]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], parts: int) -> Optional[Tuple]:
+    """Returns (analysis_date, *tiebreakers), or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != parts:
+            raise ValueError("wrong shape")
+        # Tiebreakers are bound straight into the seek predicate, so anything
+        # but a non-empty string would surface as a driver error instead of a 400
+        if not all(isinstance(v, str) and v for v in values):
+            raise ValueError("cursor keys must be non-empty strings")
+        return (datetime.fromisoformat(values[0]), *values[1:])
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def split_page(rows: Sequence, limit: int, key_fields: Sequence[str]) -> Tuple[list, Optional[str]]:
+    """
+    Trims a `limit + 1` fetch to `limit` rows and returns the cursor for the
+    next page (None when this is the last page).
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last["analysis_date"], *(last[f] for f in key_fields))
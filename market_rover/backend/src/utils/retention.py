@@ -0,0 +1,289 @@
+"""
+Monthly partitioning, retention and daily roll-ups for the telemetry tables.
+
+`user_activity_log` is range-partitioned by month on `timestamp`
+(user_activity_log_pYYYYMM, plus a DEFAULT catch-all). Partitions are created
+ahead of time on connect and by the daily job; once a month falls out of the
+ACTIVITY_RETENTION_MONTHS window its rows are compacted into
+`user_activity_daily` (one row per day/user/action/platform) and the partition
+is dropped.
+
+`agent_memory_ltm` is not touched: it holds the live upserted stance per
+(user, ticker), not history, and the forecast and shadow feeds read it directly.
+
+Provisioning and partition creation run under a transaction-scoped advisory
+lock, so API workers connecting at the same time (and the daily job) never
+race each other through the legacy-table conversion or a partition ATTACH.
+
+Run it from a scheduler/cron with:
+
+    python -m src.utils.retention
+
+or in-process by setting DB_RETENTION=true on the API server.
+"""
+import os
+import re
+import sys
+import asyncio
+from datetime import date, datetime, timedelta, timezone, time as dtime
+from typing import List, Optional, Tuple
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ACTIVITY_RETENTION_MONTHS = int(os.getenv("ACTIVITY_RETENTION_MONTHS", "3"))
+PARTITIONS_AHEAD = int(os.getenv("ACTIVITY_PARTITIONS_AHEAD", "2"))
+RETENTION_AT = os.getenv("RETENTION_AT", "02:30")  # IST, outside market hours
+
+ACTIVITY_TABLE = "user_activity_log"
+DEFAULT_PARTITION = f"{ACTIVITY_TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{ACTIVITY_TABLE}_p(\d{{4}})(\d{{2}})$")
+_LOCK_SQL = f"SELECT pg_advisory_xact_lock(hashtext('{ACTIVITY_TABLE}'))"
+
+ACTIVITY_LOG_DDL = f"""
+    CREATE TABLE IF NOT EXISTS public.{ACTIVITY_TABLE} (
+        id BIGSERIAL,
+        user_id TEXT NOT NULL,
+        action_type TEXT NOT NULL,
+        platform TEXT DEFAULT 'WEB',
+        timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (id, timestamp)
+    ) PARTITION BY RANGE (timestamp);
+
+    CREATE TABLE IF NOT EXISTS public.{DEFAULT_PARTITION}
+        PARTITION OF public.{ACTIVITY_TABLE} DEFAULT;
+"""
+
+ROLLUP_DDL = """
+    CREATE TABLE IF NOT EXISTS public.user_activity_daily (
+        day DATE NOT NULL,
+        user_id TEXT NOT NULL,
+        action_type TEXT NOT NULL,
+        platform TEXT NOT NULL DEFAULT 'WEB',
+        events INTEGER NOT NULL,
+        PRIMARY KEY (day, user_id, action_type, platform)
+    );
+"""
+
+_ROLLUP_ACTIVITY = """
+    INSERT INTO public.user_activity_daily (day, user_id, action_type, platform, events)
+    SELECT timestamp::date, user_id, action_type, COALESCE(platform, 'WEB'), count(*)
+    FROM public.{source}
+    {where}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (day, user_id, action_type, platform) DO UPDATE
+    SET events = user_activity_daily.events + EXCLUDED.events
+"""
+
+
+
+def _utc_today() -> date:
+    # Timestamps are naive UTC (server clock), so partitions follow UTC months
+    return datetime.now(timezone.utc).date()
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    """First day of the month `months` away from d's month."""
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{ACTIVITY_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Inverse of partition_name; None for the DEFAULT or unrelated tables."""
+    match = _PARTITION_RE.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def expired_partitions(names: List[str], today: date,
+                       keep_months: int = ACTIVITY_RETENTION_MONTHS) -> List[Tuple[str, date]]:
+    """Monthly partitions that end on or before the retention cutoff, oldest first."""
+    cutoff = add_months(month_start(today), -keep_months)
+    months = [(name, partition_month(name)) for name in names]
+    return sorted(((n, m) for n, m in months if m and add_months(m, 1) <= cutoff), key=lambda x: x[1])
+
+
+async def _create_partition(conn, month: date):
+    """
+    Creates one monthly partition. Rows for that month that already landed in
+    the DEFAULT partition are moved into it first, otherwise ATTACH would fail.
+    """
+    name = partition_name(month)
+    if await conn.fetchval("SELECT to_regclass($1)", f"public.{name}"):
+        return
+    lo, hi = datetime.combine(month, dtime.min), datetime.combine(add_months(month, 1), dtime.min)
+    async with conn.transaction():
+        await conn.execute(f"CREATE TABLE public.{name} (LIKE public.{ACTIVITY_TABLE} INCLUDING DEFAULTS)")
+        await conn.execute(f"""
+            WITH moved AS (
+                DELETE FROM public.{DEFAULT_PARTITION}
+                WHERE timestamp >= $1 AND timestamp < $2
+                RETURNING *
+            )
+            INSERT INTO public.{name} SELECT * FROM moved
+        """, lo, hi)
+        await conn.execute(
+            f"ALTER TABLE public.{ACTIVITY_TABLE} ATTACH PARTITION public.{name} "
+            f"FOR VALUES FROM ('{lo.isoformat(sep=' ')}') TO ('{hi.isoformat(sep=' ')}')"
+        )
+    logger.info(f"Created activity partition {name}.")
+
+
+async def ensure_partitions(conn, today: Optional[date] = None, ahead: int = PARTITIONS_AHEAD):
+    """Makes sure the current month and the next `ahead` months have partitions."""
+    current = month_start(today or _utc_today())
+    for offset in range(ahead + 1):
+        await _create_partition(conn, add_months(current, offset))
+
+
+async def _migrate_unpartitioned(conn, today: date):
+    """
+    One-off conversion of a pre-partitioning user_activity_log (plain table with
+    a SERIAL id) into the partitioned layout, preserving ids.
+    """
+    legacy = f"{ACTIVITY_TABLE}_legacy"
+    logger.info("Converting user_activity_log to monthly partitions...")
+    async with conn.transaction():
+        await conn.execute(f"ALTER TABLE public.{ACTIVITY_TABLE} RENAME TO {legacy}")
+        await conn.execute(
+            f"ALTER TABLE public.{legacy} RENAME CONSTRAINT {ACTIVITY_TABLE}_pkey TO {legacy}_pkey"
+        )
+        await conn.execute(ACTIVITY_LOG_DDL)
+
+        oldest = await conn.fetchval(f"SELECT min(timestamp) FROM public.{legacy}")
+        month = month_start(oldest.date()) if oldest else month_start(today)
+        while month <= month_start(today):
+            await _create_partition(conn, month)
+            month = add_months(month, 1)
+
+        await conn.execute(f"""
+            INSERT INTO public.{ACTIVITY_TABLE} (id, user_id, action_type, platform, timestamp)
+            SELECT id, user_id, action_type, platform, COALESCE(timestamp, CURRENT_TIMESTAMP)
+            FROM public.{legacy}
+        """)
+        await conn.execute(f"""
+            SELECT setval(pg_get_serial_sequence('public.{ACTIVITY_TABLE}', 'id'),
+                          GREATEST((SELECT max(id) FROM public.{ACTIVITY_TABLE}), 1))
+        """)
+        await conn.execute(f"DROP TABLE public.{legacy}")
+
+
+async def provision(conn, today: Optional[date] = None):
+    """Creates the partitioned activity log, roll-up tables and upcoming partitions."""
+    today = today or _utc_today()
+    async with conn.transaction():
+        # Held until commit; a worker that waited here sees the converted table
+        await conn.execute(_LOCK_SQL)
+        kind = await conn.fetchval("SELECT relkind FROM pg_class WHERE oid = to_regclass($1)",
+                                   f"public.{ACTIVITY_TABLE}")
+        if kind == "r":
+            await _migrate_unpartitioned(conn, today)
+        else:
+            await conn.execute(ACTIVITY_LOG_DDL)
+        await conn.execute(ROLLUP_DDL)
+        await ensure_partitions(conn, today)
+
+
+async def _list_partitions(conn) -> List[str]:
+    rows = await conn.fetch("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass($1)
+    """, f"public.{ACTIVITY_TABLE}")
+    return [r["relname"] for r in rows]
+
+
+async def rollup_activity(conn, today: date) -> int:
+    """Compacts and drops expired monthly partitions; returns how many were dropped."""
+    dropped = 0
+    for name, _month in expired_partitions(await _list_partitions(conn), today):
+        async with conn.transaction():
+            await conn.execute(_ROLLUP_ACTIVITY.format(source=name, where=""))
+            await conn.execute(f"ALTER TABLE public.{ACTIVITY_TABLE} DETACH PARTITION public.{name}")
+            await conn.execute(f"DROP TABLE public.{name}")
+        dropped += 1
+        logger.info(f"Rolled up and dropped activity partition {name}.")
+
+    # Stray out-of-range rows in the DEFAULT partition follow the same cutoff
+    cutoff = datetime.combine(add_months(month_start(today), -ACTIVITY_RETENTION_MONTHS), dtime.min)
+    async with conn.transaction():
+        await conn.execute(_ROLLUP_ACTIVITY.format(source=DEFAULT_PARTITION, where="WHERE timestamp < $1"), cutoff)
+        await conn.execute(f"DELETE FROM public.{DEFAULT_PARTITION} WHERE timestamp < $1", cutoff)
+    return dropped
+
+
+async def run_retention(db, today: Optional[date] = None) -> dict:
+    """Creates upcoming partitions, then compacts everything past retention."""
+    today = today or _utc_today()
+    await db.connect()
+    async with db._conn() as conn:
+        async with conn.transaction():
+            await conn.execute(_LOCK_SQL)
+            await ensure_partitions(conn, today)
+        summary = {"activity_partitions_dropped": await rollup_activity(conn, today)}
+    logger.info(f"Retention finished: {summary}")
+    return summary
+
+
+def _seconds_until_next_run(now: Optional[datetime] = None) -> float:
+    """Seconds until the next RETENTION_AT (IST)."""
+    from src.utils.node_cache import IST
+    now = (now or datetime.now(IST)).astimezone(IST)
+    hour, minute = (int(x) for x in RETENTION_AT.split(":"))
+    run_at = datetime.combine(now.date(), dtime(hour, minute), tzinfo=IST)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+
+class RetentionScheduler:
+    """Event-loop task that runs `run_retention` once a day on the shared pool."""
+
+    def __init__(self, db):
+        self.db = db
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(_seconds_until_next_run())
+            try:
+                await run_retention(self.db)
+            except Exception as e:
+                logger.error(f"Retention job crashed: {e}")
+
+    def start(self):
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="db-retention")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def main(argv=None):
+    # Make src.* importable when run as a script
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
+    from src.utils.db_manager import db
+    asyncio.run(run_retention(db))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,171 @@
+import os
 import asyncio
-from typing import TypeVar, Callable, Any
+import random
+from collections import deque
+from typing import TypeVar, Callable, Any, Optional
 import functools
+from src.utils.logger import get_logger
 
 T = TypeVar("T")
 
-# Standard concurrency limit for Market-Rover data/API calls
-# Prevents 'Rate Exceeded' errors from yfinance and Gemini
-CONCURRENCY_LIMIT = 5
-_semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
+logger = get_logger(__name__)
+
+# Per-destination concurrency envelopes: (initial, min, max).
+# Each upstream gets its own AIMD limiter so slow Postgres queries cannot starve
+# yfinance calls or vice versa. Max can be overridden with THROTTLE_<HOST>_MAX.
+# Limiters must wrap the raw upstream call: helpers that swallow errors hide
+# the 429 / timeout signals the limiter backs off on.
+HOST_LIMITS = {
+    "yfinance": (5, 1, 20),
+    "postgres": (10, 2, 20),  # Never above the asyncpg pool max_size
+}
+DEFAULT_HOST = "yfinance"
+
+# Multiplicative decrease applied on 429 / quota / timeout signals
+BACKOFF_FACTOR = 0.5
+
+_OVERLOAD_MARKERS = ["rate limit", "too many", "429", "quota", "timed out", "timeout"]
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for errors that mean 'slow down' (rate limits, quotas, timeouts)."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    error_msg = str(exc).lower()
+    return any(x in error_msg for x in _OVERLOAD_MARKERS)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for one upstream destination.
+    Every success grows the window by 1/limit (≈ +1 per full window of calls);
+    an overload signal multiplies it by BACKOFF_FACTOR. Waiters are plain
+    futures on the running loop, so the limiter is safe to share module-wide.
+    """
+
+    def __init__(self, name: str, initial: int, min_limit: int, max_limit: int,
+                 backoff_factor: float = BACKOFF_FACTOR):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self.successes = 0
+        self.backoffs = 0
+        self._waiters: deque = deque()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        while self.in_flight >= self.capacity:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                elif not fut.cancelled():
+                    # We were woken but will not use the slot: pass it on
+                    self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self, overloaded: bool = False, success: bool = True):
+        self.in_flight -= 1
+        if overloaded:
+            self.backoffs += 1
+            self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+            logger.warning(f"Throttle[{self.name}] backing off to {self.capacity} concurrent calls.")
+        elif success:
+            self.successes += 1
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        free = self.capacity - self.in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc is None:
+            self.release()
+        else:
+            self.release(overloaded=is_overload_error(exc), success=False)
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.capacity,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "successes": self.successes,
+            "backoffs": self.backoffs,
+        }
+
+
+_limiters: dict = {}
+
+
+def get_limiter(host: str = DEFAULT_HOST) -> AdaptiveLimiter:
+    """Returns the process-wide limiter for `host`, creating it on first use."""
+    limiter = _limiters.get(host)
+    if limiter is None:
+        initial, min_limit, max_limit = HOST_LIMITS.get(host, HOST_LIMITS[DEFAULT_HOST])
+        max_limit = int(os.getenv(f"THROTTLE_{host.upper()}_MAX", max_limit))
+        limiter = _limiters[host] = AdaptiveLimiter(host, initial, min_limit, max_limit)
+    return limiter
+
+
+def limiter_stats() -> dict:
+    """Snapshot of every active limiter, for health/metrics endpoints."""
+    return {host: limiter.stats() for host, limiter in _limiters.items()}
+
+
+def throttled(func: Optional[Callable[..., Any]] = None, *, host: str = DEFAULT_HOST, max_retries: int = 3):
+    """
+    Decorator to limit concurrency per upstream and automatically retry on rate limits.
+    Usable bare (`@throttled`, defaults to yfinance) or as `@throttled(host="nse")`.
+    """
+    if func is None:
+        return lambda f: throttled(f, host=host, max_retries=max_retries)
 
-def throttled(func: Callable[..., Any]):
-    """Decorator to limit concurrency and automatically retry on rate limits."""
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        max_retries = 3
         base_delay = 1.0 # seconds
+        limiter = get_limiter(host)
+
+        for attempt in range(max_retries):
+            await limiter.acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                overloaded = is_overload_error(e)
+                limiter.release(overloaded=overloaded, success=False)
+                if not overloaded or attempt == max_retries - 1:
+                    raise # Not a rate limit error, or last attempt failed
 
-        async with _semaphore:
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    # Catch 'Rate Limit', 'Too Many Requests', '429', 'Quota'
-                    if any(x in error_msg for x in ["rate limit", "too many", "429", "quota"]):
-                        if attempt == max_retries - 1:
-                            raise # Last attempt failed
-
-                        wait_time = base_delay * (2 ** attempt) # Exponential backoff
-                        import random
-                        wait_time += random.uniform(0, 0.5) # Add jitter
-
-                        print(f"⚠️ Rate limit hit. Retrying in {wait_time:.2f}s... (Attempt {attempt+1}/{max_retries})")
-                        await asyncio.sleep(wait_time)
-                    else:
-                        raise # Not a rate limit error, re-raise
+                # Back off outside the slot so other callers keep flowing
+                wait_time = base_delay * (2 ** attempt) # Exponential backoff
+                wait_time += random.uniform(0, 0.5) # Add jitter
+                logger.warning(f"Rate limit hit on {host}. Retrying in {wait_time:.2f}s... (Attempt {attempt+1}/{max_retries})")
+                await asyncio.sleep(wait_time)
+            except BaseException:
+                limiter.release(success=False) # Cancellation: free the slot, no signal
+                raise
+            else:
+                limiter.release()
+                return result
     return wrapper
 
 async def gather_with_concurrency(n: int, *tasks):
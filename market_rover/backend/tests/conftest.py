@@ -9,10 +9,15 @@ Solution: Inject stub MagicMock modules for every rover_tools sub-package
           imports resolve to MagicMock objects — which is exactly what the
           test suite patches over anyway.
 """
+import os
 import sys
 import types
 from unittest.mock import MagicMock
 
+# Offloaded route work must run in-process so test patches stay visible
+os.environ.setdefault("OFFLOAD_EXECUTOR", "thread")
+os.environ.setdefault("GRAPH_WARMUP", "false")
+
 
 def _stub_module(name: str) -> types.ModuleType:
     mod = types.ModuleType(name)
@@ -31,6 +36,7 @@ _RT_SUBS = [
     "rover_tools.ticker_resources",
     "rover_tools.analytics",
     "rover_tools.analytics.forensic_engine",
+    "rover_tools.analytics.seasonality_calendar",
     "rover_tools.forensic_tool",
     "rover_tools.corporate_actions_tool",
 ]
@@ -45,6 +51,8 @@ _adv = sys.modules["rover_tools.advanced_skills"]
 _adv.analyze_retail_sentiment_tool   = MagicMock(return_value="Neutral market breadth.")
 _adv.calculate_mtc_score_tool        = MagicMock(return_value="MTC Score: 55/100")
 _adv.detect_technical_patterns_tool  = MagicMock(return_value="No patterns detected.")
+_adv.mtc_score_report                = MagicMock(return_value="MTC Score: 55/100")
+_adv.technical_patterns_report       = MagicMock(return_value="No patterns detected.")
 _adv.fetch_subha_muhurtham_tool      = MagicMock(return_value="Check almanac.")
 
 _glob = sys.modules["rover_tools.global_market_tool"]
@@ -64,6 +72,9 @@ _ticker.NIFTY_50_SECTOR_MAP          = {}
 _analytics = sys.modules["rover_tools.analytics"]
 _analytics.AnalyzersUnified          = MagicMock()
 
+_calendar_pkg = sys.modules["rover_tools.analytics.seasonality_calendar"]
+_calendar_pkg.SeasonalityCalendar    = MagicMock()
+
 _forensic_pkg = sys.modules["rover_tools.analytics.forensic_engine"]
 _forensic_pkg.ForensicAnalyzer       = MagicMock()
 
@@ -72,3 +83,24 @@ _forensic_tool.run_forensic_audit_tool = MagicMock()
 
 _corp_tool = sys.modules["rover_tools.corporate_actions_tool"]
 _corp_tool.fetch_shareholding_pattern_tool = MagicMock()
+
+
+# ── Reset process-wide caches between tests ───────────────────────────────────
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_node_cache():
+    from src.utils.node_cache import node_cache
+    node_cache.clear()
+    yield
+    node_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_analytics_store(tmp_path):
+    from src.utils.analytics_store import analytics_store
+    original = analytics_store.path
+    analytics_store.path = str(tmp_path / "analytics_store.db")
+    yield analytics_store
+    analytics_store.path = original
@@ -0,0 +1,165 @@
+"""
+test_activity_writer.py — Tests for the write-behind activity/memory buffer.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.utils.activity_writer import WriteBehindBuffer
+from src.utils.db_manager import DBManager
+
+
+class _FakeDB:
+    def __init__(self, fail=False):
+        self.connect = AsyncMock()
+        self.conn = MagicMock()
+        self.conn.copy_records_to_table = AsyncMock(side_effect=Exception("db down") if fail else None)
+        self.conn.executemany = AsyncMock()
+        self.conn.transaction = MagicMock(return_value=AsyncMock())
+
+    @asynccontextmanager
+    async def _conn(self):
+        yield self.conn
+
+
+@pytest.mark.asyncio
+async def test_flushes_batch_with_copy_when_size_reached():
+    db = _FakeDB()
+    buf = WriteBehindBuffer(db, flush_size=3, flush_seconds=30)
+    buf.start()
+    for i in range(3):
+        assert buf.submit_activity(f"user{i}", "LOGIN")
+    await asyncio.sleep(0.05)
+
+    db.conn.copy_records_to_table.assert_awaited_once()
+    kwargs = db.conn.copy_records_to_table.await_args.kwargs
+    assert [r[0] for r in kwargs["records"]] == ["user0", "user1", "user2"]
+    assert kwargs["columns"] == ["user_id", "action_type", "platform", "timestamp"]
+    assert buf.stats()["flushed"] == 3
+    await buf.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_remaining_and_dedupes_memory():
+    db = _FakeDB()
+    buf = WriteBehindBuffer(db, flush_size=100, flush_seconds=30)
+    buf.start()
+    buf.submit_memory("u", "TCS.NS", "BULLISH", "first")
+    buf.submit_memory("u", "TCS.NS", "BEARISH", "second")
+    buf.submit_memory("u", "INFY.NS", "NEUTRAL", "only")
+    await asyncio.sleep(0.01)
+    db.conn.executemany.assert_not_awaited()   # Below size, before the interval
+
+    await buf.stop()
+    rows = db.conn.executemany.await_args.args[1]
+    assert [(r[1], r[2]) for r in rows] == [("TCS.NS", "BEARISH"), ("INFY.NS", "NEUTRAL")]
+    assert not buf.running
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_pending():
+    db = _FakeDB(fail=True)
+    buf = WriteBehindBuffer(db, flush_size=1, flush_seconds=30)
+    buf.start()
+    buf.submit_activity("u", "LOGIN")
+    await asyncio.sleep(0.05)
+    assert buf.stats()["pending"] == 1 and buf.stats()["failures"] == 1
+
+    db.conn.copy_records_to_table.side_effect = None
+    await buf.stop()
+    assert buf.stats()["pending"] == 0 and buf.stats()["flushed"] == 1
+
+
+async def _until(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_backs_off_and_retries_without_new_rows():
+    db = _FakeDB(fail=True)
+    buf = WriteBehindBuffer(db, flush_size=1, flush_seconds=0.05, retry_max_seconds=0.2)
+    buf.start()
+    buf.submit_activity("u", "LOGIN")
+    await _until(lambda: buf.stats()["failures"] == 1)
+
+    # New rows during the backoff do not trigger immediate retries against the down DB
+    for i in range(20):
+        buf.submit_activity(f"u{i}", "VIEW")
+        await asyncio.sleep(0)
+    assert buf.stats()["failures"] == 1
+    assert buf.stats()["retry_in"] == pytest.approx(0.05)
+
+    await _until(lambda: buf.stats()["failures"] >= 3)
+    assert buf.stats()["retry_in"] == pytest.approx(min(0.05 * 2 ** (buf.stats()["failures"] - 1), 0.2))
+
+    # Retried on the timer once the DB is back; no new row needed
+    db.conn.copy_records_to_table.side_effect = None
+    await _until(lambda: buf.stats()["pending"] == 0)
+    assert buf.stats()["flushed"] == 21 and buf.stats()["retry_in"] == 0
+    await buf.stop()
+
+
+@pytest.mark.asyncio
+async def test_pending_backlog_evicts_oldest_rows():
+    db = _FakeDB(fail=True)
+    buf = WriteBehindBuffer(db, flush_size=1, flush_seconds=30, max_queue=3)
+    buf.start()
+    for i in range(5):
+        buf.submit_activity(f"u{i}", "LOGIN")
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+    assert buf.stats()["pending"] == 3 and buf.stats()["evicted"] == 2
+
+    db.conn.copy_records_to_table.side_effect = None
+    await buf.stop()
+    records = db.conn.copy_records_to_table.await_args.kwargs["records"]
+    assert [r[0] for r in records] == ["u2", "u3", "u4"]
+
+
+@pytest.mark.asyncio
+async def test_stop_lets_in_flight_flush_finish_once():
+    db = _FakeDB()
+    release = asyncio.Event()
+
+    async def slow_copy(*args, **kwargs):
+        await release.wait()
+    db.conn.copy_records_to_table.side_effect = slow_copy
+
+    buf = WriteBehindBuffer(db, flush_size=1, flush_seconds=30)
+    buf.start()
+    buf.submit_activity("u", "LOGIN")
+    await asyncio.sleep(0.01)                      # Flush is now waiting inside COPY
+
+    stopping = asyncio.create_task(buf.stop())
+    await asyncio.sleep(0.01)
+    release.set()
+    await stopping
+
+    db.conn.copy_records_to_table.assert_awaited_once()
+    assert buf.stats()["flushed"] == 1 and buf.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_db_manager_enqueues_and_falls_back_when_full():
+    mgr = DBManager()
+    mgr.writer = WriteBehindBuffer(mgr, flush_size=100, flush_seconds=30, max_queue=1)
+    mock_conn = AsyncMock()
+    mock_pool = MagicMock()
+    mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+    mgr.pool = mock_pool
+
+    mgr.start_write_behind()
+    await mgr.log_activity("u", "LOGIN")           # Enqueued: no DB round-trip
+    await mgr.log_activity("u", "LOGOUT")          # Queue full: dropped
+    mock_conn.execute.assert_not_awaited()
+    assert mgr.writer.stats()["dropped"] == 1
+
+    await mgr.store_memory("u", "TCS.NS", "BULLISH", "x")  # Queue full: direct upsert
+    mock_conn.execute.assert_awaited_once()
+
+    mgr.writer._task.cancel()
@@ -0,0 +1,97 @@
+"""
+test_analytics_store.py — Tests for the nightly-materialized analytics store.
+"""
+from datetime import date, datetime
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routes import router as api_router
+from src.utils.analytics_store import make_variant
+from src.utils.node_cache import IST
+from src.utils import nightly_materializer
+
+_test_app = FastAPI()
+_test_app.include_router(api_router, prefix="/api")
+client = TestClient(_test_app)
+
+
+def test_make_variant_is_stable():
+    assert make_variant(target_date="2026-12-31", exclude_outliers=True) == \
+        "exclude_outliers=1;target_date=2026-12-31"
+    assert make_variant() == ""
+
+
+def test_put_get_roundtrip(_isolated_analytics_store):
+    store = _isolated_analytics_store
+    store.put("seasonality", "TCS.NS", {"data": [1, 2]}, make_variant(exclude_outliers=False))
+    assert store.get("seasonality", "TCS.NS", "exclude_outliers=0") == {"data": [1, 2]}
+    assert store.get("seasonality", "TCS.NS", "exclude_outliers=1") is None
+    assert store.stats()["seasonality"]["rows"] == 1
+
+
+def test_get_many_returns_current_rows_only(_isolated_analytics_store):
+    store = _isolated_analytics_store
+    with patch("src.utils.analytics_store.last_market_date", return_value=date(2026, 1, 5)):
+        store.put("backtest", "INFY.NS", {"old": True})
+    store.put_many([("backtest", "TCS.NS", "", {"n": 1}), ("seasonality", "SBIN.NS", "", {"n": 2})])
+    assert store.get_many("backtest", ["TCS.NS", "INFY.NS", "SBIN.NS"]) == {"TCS.NS": {"n": 1}}
+    assert store.get_many("backtest", []) == {}
+
+
+def test_nightly_scheduler_stop_joins_thread():
+    scheduler = nightly_materializer.NightlyScheduler()
+    with patch.object(nightly_materializer, "_seconds_until_next_run", return_value=3600):
+        scheduler.start()
+        thread = scheduler._thread
+        scheduler.stop()
+    assert not thread.is_alive()
+    assert scheduler._thread is None
+
+
+def test_stale_market_date_is_ignored(_isolated_analytics_store):
+    store = _isolated_analytics_store
+    with patch("src.utils.analytics_store.last_market_date", return_value=date(2026, 1, 5)):
+        store.put("heatmap", "INFY.NS", {"heatmap": {}})
+    with patch("src.utils.analytics_store.last_market_date", return_value=date(2026, 1, 6)):
+        assert store.get("heatmap", "INFY.NS") is None
+
+
+def test_route_served_from_store_without_compute(_isolated_analytics_store):
+    payload = {"ticker": "TCS.NS", "exclude_outliers": False, "data": [{"Month": "Jan"}]}
+    _isolated_analytics_store.put("seasonality", "TCS.NS", payload, make_variant(exclude_outliers=False))
+    with patch("src.routes.analysis.run_blocking", AsyncMock()) as mock_run:
+        res = client.get("/api/analysis/seasonality/tcs")
+    assert res.status_code == 200
+    assert res.json() == payload
+    mock_run.assert_not_awaited()
+
+
+def test_strategic_calendar_writes_through(_isolated_analytics_store):
+    payload = {"ticker": "TCS.NS", "exclude_outliers": True, "months": []}
+    with patch("src.routes.calendar.run_blocking", AsyncMock(return_value=payload)):
+        res = client.get("/api/calendar/strategic/tcs?exclude_outliers=true")
+    assert res.status_code == 200
+    assert _isolated_analytics_store.get("calendar", "TCS.NS", "exclude_outliers=1") == payload
+
+
+def test_seconds_until_next_run_skips_weekend():
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=IST)
+    with patch.object(nightly_materializer, "MATERIALIZE_AT", "16:30"):
+        seconds = nightly_materializer._seconds_until_next_run(friday_evening)
+    # Next run is Monday 16:30 IST
+    assert seconds == (datetime(2026, 10, 19, 16, 30, tzinfo=IST) - friday_evening).total_seconds()
+
+
+def test_materialize_ticker_shares_one_download():
+    idx = pd.date_range("2015-01-01", "2025-12-31", freq="B")
+    raw = pd.DataFrame({"Close": np.linspace(100, 200, len(idx))}, index=idx)
+    with patch("src.utils.analytics_jobs._download", return_value=raw) as mock_dl:
+        rows = nightly_materializer.materialize_ticker("tcs")
+    # One daily "max" download feeds every kind; only the monthly heatmap fetches separately
+    daily_calls = [c for c in mock_dl.call_args_list if "interval" not in c.kwargs]
+    assert [c.args for c in daily_calls] == [("TCS.NS", "max")]
+    kinds = {kind for kind, *_ in rows}
+    assert {"seasonality", "backtest", "forecast"} <= kinds
+    assert all(ticker == "TCS.NS" for _, ticker, _, _ in rows)
@@ -0,0 +1,43 @@
+"""
+test_background_workers.py — Tests for the shared startup/shutdown of background workers.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.utils.background_workers import start_background_workers, stop_background_workers
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    monkeypatch.setenv("DB_RETENTION", "false")
+    monkeypatch.setenv("NIGHTLY_MATERIALIZE", "false")
+    db = MagicMock()
+    db.retention.stop = AsyncMock()
+    db.stop_write_behind = AsyncMock()
+    snapshot = MagicMock()
+    with patch("src.utils.db_manager.db", db), \
+         patch("src.routes.analyze.start_graph_warmup") as warmup, \
+         patch("utils.market_snapshot.market_snapshot", snapshot), \
+         patch("src.utils.offload.shutdown_executor") as shutdown:
+        yield db, snapshot, warmup, shutdown
+
+
+def test_start_survives_market_snapshot_failure(workers):
+    db, snapshot, warmup, _ = workers
+    snapshot.start.side_effect = RuntimeError("no network")
+
+    start_background_workers()
+
+    warmup.assert_called_once()
+    db.start_write_behind.assert_called_once()
+    db.retention.start.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stop_survives_market_snapshot_failure(workers):
+    db, snapshot, _, shutdown = workers
+    snapshot.stop.side_effect = RuntimeError("already stopped")
+
+    await stop_background_workers()
+
+    db.stop_write_behind.assert_awaited_once()
+    shutdown.assert_called_once()
@@ -0,0 +1,100 @@
+"""
+test_batch_analysis.py — Tests for multi-ticker (watchlist) analysis endpoints.
+"""
+from unittest.mock import AsyncMock, patch
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routes import router as api_router
+from src.utils.analytics_jobs import download_panel, seasonality_batch_job
+from src.utils.analytics_store import make_variant
+
+_test_app = FastAPI()
+_test_app.include_router(api_router, prefix="/api")
+client = TestClient(_test_app)
+
+
+def _frames(seed=7):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2015-01-01", "2024-12-31", freq="B")
+    frames = {}
+    for ticker in ("TCS.NS", "INFY.NS"):
+        close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, len(idx)))
+        frames[ticker] = pd.DataFrame({"Close": close}, index=idx)
+    # A later listing: early months must not count for this ticker
+    frames["INFY.NS"] = frames["INFY.NS"].loc["2019-06-01":]
+    return frames
+
+
+def _reference(frame, exclude_outliers):
+    """Per-ticker reference mirroring AnalyticsCore.calculate_seasonality."""
+    monthly = frame["Close"].resample("ME").last().pct_change().dropna()
+    rows = {}
+    for month, data in monthly.groupby(monthly.index.month):
+        if exclude_outliers and len(data) >= 4:
+            q1, q3 = data.quantile(0.25), data.quantile(0.75)
+            iqr = q3 - q1
+            data = data[(data >= q1 - 1.5 * iqr) & (data <= q3 + 1.5 * iqr)]
+        rows[month] = (round(data.mean() * 100, 2), round((data > 0).sum() / len(data) * 100, 2), len(data))
+    return rows
+
+
+def test_vectorized_seasonality_matches_per_ticker_reference():
+    frames = _frames()
+    for exclude in (False, True):
+        payloads = seasonality_batch_job(list(frames), exclude, frames=frames)
+        for ticker, frame in frames.items():
+            expected = _reference(frame, exclude)
+            got = {r["month"]: (r["avg_return"], r["win_rate"], r["count"]) for r in payloads[ticker]["data"]}
+            assert got == expected
+
+
+def test_download_panel_splits_multiindex():
+    idx = pd.date_range("2024-01-01", periods=3, freq="B")
+    cols = pd.MultiIndex.from_product([["TCS.NS", "BAD.NS"], ["Close"]])
+    raw = pd.DataFrame([[1.0, np.nan], [2.0, np.nan], [3.0, np.nan]], index=idx, columns=cols)
+    with patch("src.utils.analytics_jobs.yf.download", return_value=raw) as mock_dl:
+        frames = download_panel(["TCS.NS", "BAD.NS"])
+    mock_dl.assert_called_once()
+    assert list(frames) == ["TCS.NS"]
+
+
+def test_batch_seasonality_is_columnar_and_reuses_store(_isolated_analytics_store):
+    cached = {"ticker": "TCS.NS", "exclude_outliers": False,
+              "data": [{"month": 1, "month_name": "Jan", "avg_return": 1.5, "win_rate": 60.0, "count": 10}]}
+    _isolated_analytics_store.put("seasonality", "TCS.NS", cached, make_variant(exclude_outliers=False))
+    computed = {"INFY.NS": {"ticker": "INFY.NS", "exclude_outliers": False,
+                            "data": [{"month": 2, "month_name": "Feb", "avg_return": -0.5, "win_rate": 40.0, "count": 5}]}}
+
+    with patch("src.routes.analysis.run_blocking", AsyncMock(return_value=computed)) as mock_run:
+        res = client.get("/api/analysis/batch/seasonality?tickers=tcs,infy,tcs,zzz")
+
+    assert res.status_code == 200
+    body = res.json()
+    # Only the store misses are computed, in one offloaded call
+    assert mock_run.await_args.args[1] == ["INFY.NS", "ZZZ.NS"]
+    assert body["tickers"] == ["TCS.NS", "INFY.NS"]
+    assert body["missing"] == ["ZZZ.NS"]
+    assert body["avg_return"][0][:2] == [1.5, None]
+    assert body["avg_return"][1][:2] == [None, -0.5]
+    assert _isolated_analytics_store.get("seasonality", "INFY.NS", "exclude_outliers=0") == computed["INFY.NS"]
+
+
+def test_batch_forecast_returns_field_arrays():
+    computed = {
+        "TCS.NS": {"strategy": "sd", "confidence": "High", "target_date": "2026-12-31",
+                   "current_price": 100.0, "forecast_price": 110.0, "annualized_growth": 8.0},
+    }
+    with patch("src.routes.analysis.run_blocking", AsyncMock(return_value=computed)):
+        res = client.get("/api/analysis/batch/forecast?tickers=TCS")
+    body = res.json()
+    assert body["tickers"] == ["TCS.NS"]
+    assert body["forecast_price"] == [110.0]
+    assert "projection_path" not in body
+
+
+def test_batch_rejects_empty_and_oversized_lists():
+    assert client.get("/api/analysis/batch/backtest?tickers=,").status_code == 400
+    with patch("src.routes.analysis.BATCH_MAX_TICKERS", 2):
+        assert client.get("/api/analysis/batch/backtest?tickers=A,B,C").status_code == 400
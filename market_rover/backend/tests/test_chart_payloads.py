@@ -0,0 +1,64 @@
+"""
+test_chart_payloads.py — Tests for columnar snapshot/heatmap payloads and gzip.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from src.server import app
+from src.utils.analytics_jobs import heatmap_job, snapshot_job, _column
+
+client = TestClient(app)
+
+
+def test_column_rounds_and_nulls_nan():
+    assert _column(pd.Series([1.234, np.nan, 2.0])) == [1.23, None, 2.0]
+    assert _column([[1.005, np.nan], [np.nan, 3.3333]]) == [[1.0, None], [None, 3.33]]
+
+
+def test_heatmap_job_builds_year_by_month_matrix():
+    idx = pd.DatetimeIndex([datetime(2024, 11, 30), datetime(2024, 12, 31), datetime(2025, 1, 31)])
+    raw = pd.DataFrame({"Close": [100.0, 110.0, 99.0]}, index=idx)
+    with patch("src.utils.analytics_jobs._download", return_value=raw):
+        result = heatmap_job("TCS.NS")
+
+    assert result["years"] == [2024, 2025]
+    assert len(result["data"]) == 2 and all(len(row) == 12 for row in result["data"])
+    assert result["data"][0][10] is None          # first bar has no prior close
+    assert result["data"][0][11] == 10.0           # Dec 2024
+    assert result["data"][1][0] == -10.0           # Jan 2025
+    assert result["best"] == {"month": "Dec 2024", "return": 10.0}
+    assert result["worst"] == {"month": "Jan 2025", "return": -10.0}
+
+
+def test_snapshot_job_returns_aligned_columns():
+    idx = pd.date_range("2024-01-01", periods=300, freq="B")
+    close = np.linspace(100, 130, len(idx))
+    hist = pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close}, index=idx)
+    stock = MagicMock()
+    stock.fast_info = {"lastPrice": 130.0, "previousClose": 129.0}
+    stock.history.return_value = hist
+
+    with patch("src.utils.analytics_jobs.yf.Ticker", return_value=stock):
+        result = snapshot_job("TCS.NS")
+
+    chart = result["chart"]
+    assert len(chart["date"]) == 252
+    assert {len(v) for v in chart.values()} == {252}
+    assert chart["date"][-1] == idx[-1].strftime("%Y-%m-%d")
+    assert chart["close"][-1] == 130.0
+    assert chart["dma_200"][-1] is not None
+
+
+def test_large_json_response_is_gzipped():
+    dates = pd.date_range("2024-01-01", periods=252, freq="B").strftime("%Y-%m-%d").tolist()
+    chart = {key: [123.45] * 252 for key in
+             ("open", "high", "low", "close", "dma_50", "dma_200", "macd", "macd_signal", "rsi")}
+    payload = {"ticker": "TCS.NS", "metrics": {}, "chart": {"date": dates, **chart}}
+    with patch("src.routes.snapshot.run_blocking", AsyncMock(return_value=payload)):
+        res = client.get("/api/snapshot/TCS.NS", headers={"Accept-Encoding": "gzip"})
+
+    assert res.status_code == 200
+    assert res.headers.get("content-encoding") == "gzip"
+    assert res.json()["chart"]["date"] == dates
@@ -397,7 +397,7 @@ async def test_ownerise_node_runs():
 
 
 def test_analysis_endpoint_mock():
-    with patch("src.routes.analysis.MarketAnalyzer") as mock_analyzer:
+    with patch("src.utils.analytics_jobs.MarketAnalyzer") as mock_analyzer:
         mock_analyzer.return_value.get_volatility.return_value = {"volatility": "Low"}
         res = client.get("/api/analysis/volatility/TCS.NS")
         assert res.status_code in (200, 404, 500)
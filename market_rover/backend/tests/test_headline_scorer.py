@@ -0,0 +1,42 @@
+"""
+test_headline_scorer.py — Tests for the compiled weighted headline scorer.
+"""
+from src.utils.headline_scorer import HeadlineScorer, classify, headline_scorer
+
+
+def test_weighted_terms_match_word_starts_once_per_headline():
+    scores = headline_scorer.score([
+        "Reliance gains as profit surges",          # gain + profit + surge
+        "Stock falls on loss warning",              # fall + loss + warning
+        "Gains, gains and more gains",              # each term counts once
+        "Analysts follow the slowdown below par",   # no word starts with low/fall
+        "",
+    ])
+    assert scores == [3.0, -3.0, 1.0, 0.0, 0.0]
+
+
+def test_phrases_beat_their_leading_word():
+    scorer = HeadlineScorer({"record": -1.0, "record high": 2.0})
+    assert scorer.score(["Nifty at record high", "Record outflows"]) == [2.0, -1.0]
+
+
+def test_newlines_inside_a_headline_do_not_shift_offsets():
+    assert headline_scorer.score(["Profit\nwarning", "Upgrade"]) == [0.0, 1.5]
+
+
+def test_score_by_ticker_aggregates_in_one_batch():
+    totals = headline_scorer.score_by_ticker({
+        "TCS.NS": ["TCS beats estimates", "TCS cuts guidance"],
+        "INFY.NS": [],
+    })
+    assert totals["TCS.NS"] == {"score": 0.5, "headlines": 2, "bullish": 1, "bearish": 1}
+    assert totals["INFY.NS"] == {"score": 0.0, "headlines": 0, "bullish": 0, "bearish": 0}
+    assert [classify(s) for s in (0.5, 0.0, -2.0)] == ["positive", "neutral", "negative"]
+
+
+def test_scores_thousands_of_tickers_in_one_batch():
+    batch = {f"T{i}.NS": ["Shares surge after upgrade", "Debt worries drag stock lower", "Board meets"]
+             for i in range(2000)}
+    totals = headline_scorer.score_by_ticker(batch)
+    assert len(totals) == 2000
+    assert totals["T0.NS"]["score"] == totals["T1999.NS"]["score"] == 0.5
@@ -0,0 +1,75 @@
+"""
+test_http_cache.py — Tests for ETag / If-None-Match handling on analytics routes.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routes import router as api_router
+from src.utils.http_cache import last_bar_stamp, make_etag
+from src.utils.node_cache import IST
+
+_test_app = FastAPI()
+_test_app.include_router(api_router, prefix="/api")
+client = TestClient(_test_app)
+
+SEASONALITY = {"ticker": "TCS.NS", "exclude_outliers": False, "data": []}
+
+
+def test_last_bar_stamp_daily_vs_intraday():
+    during = datetime(2026, 10, 16, 11, 7, 42, tzinfo=IST)    # Friday, market open
+    after = datetime(2026, 10, 17, 11, 0, tzinfo=IST)         # Saturday
+    assert last_bar_stamp(now=during) == "2026-10-15"
+    assert last_bar_stamp(60, now=during) == "2026-10-16T11:07:00+05:30"
+    assert last_bar_stamp(60, now=after) == "2026-10-16"
+
+
+def test_etag_varies_by_variant_and_bar():
+    base = make_etag("seasonality", "TCS.NS", "exclude_outliers=0", stamp="2026-10-15")
+    # Weak: gzip and identity bodies of one payload share the tag
+    assert base.startswith('W/"') and base.endswith('"')
+    assert base == make_etag("seasonality", "TCS.NS", "exclude_outliers=0", stamp="2026-10-15")
+    assert base != make_etag("seasonality", "TCS.NS", "exclude_outliers=1", stamp="2026-10-15")
+    assert base != make_etag("seasonality", "TCS.NS", "exclude_outliers=0", stamp="2026-10-16")
+
+
+def test_seasonality_revalidation_returns_304_without_compute():
+    with patch("src.routes.analysis.run_blocking", AsyncMock(return_value=SEASONALITY)) as mock_run:
+        first = client.get("/api/analysis/seasonality/tcs")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "public, no-cache"
+
+        assert etag.startswith('W/"')
+        # Weak comparison: the strong spelling of the same tag matches too
+        strong = etag.removeprefix("W/")
+        second = client.get("/api/analysis/seasonality/tcs", headers={"If-None-Match": f'{strong}, "other"'})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    assert mock_run.await_count == 1
+
+
+def test_forecast_etag_depends_on_target_date():
+    with patch("src.routes.analysis.run_blocking", AsyncMock(return_value={"ticker": "TCS.NS"})):
+        a = client.get("/api/analysis/forecast/tcs?target_date=2026-12-31")
+        b = client.get("/api/analysis/forecast/tcs?target_date=2027-06-30",
+                       headers={"If-None-Match": a.headers["etag"]})
+    assert b.status_code == 200
+    assert a.headers["etag"] != b.headers["etag"]
+
+
+def test_heatmap_stale_etag_recomputes():
+    payload = {"ticker": "TCS.NS", "years": [], "months": [], "data": [], "best": {}, "worst": {}}
+    with patch("src.routes.heatmap.run_blocking", AsyncMock(return_value=payload)) as mock_run:
+        res = client.get("/api/heatmap/TCS", headers={"If-None-Match": '"stale"'})
+    assert res.status_code == 200
+    assert res.headers["etag"] == make_etag("heatmap", "TCS.NS")
+    mock_run.assert_awaited_once()
+
+
+def test_error_responses_are_not_tagged():
+    with patch("src.routes.snapshot.run_blocking", AsyncMock(side_effect=Exception("boom"))):
+        res = client.get("/api/snapshot/TCS.NS")
+    assert res.status_code == 500
+    assert "etag" not in res.headers
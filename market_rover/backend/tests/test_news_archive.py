@@ -0,0 +1,72 @@
+"""
+test_news_archive.py — Tests for the read-only news archive and its use in the sentiment node.
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from utils.article_store import ArticleStore  # Writer side (repo root), so the schema stays in step
+from src.utils.news_archive import recent_headlines
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    store = ArticleStore(tmp_path / "news_store.sqlite")
+    now = datetime.now().replace(microsecond=0)
+    articles = [
+        ("https://www.moneycontrol.com/news/a-1.html", "TCS wins $2 billion deal", now, ["TCS.NS"]),
+        ("https://www.moneycontrol.com/news/b-2.html", "IT stocks surge on deal momentum", now - timedelta(hours=6), ["TCS", "INFY.NS"]),
+        ("https://www.moneycontrol.com/news/c-3.html", "TCS profit falls in weak quarter", now - timedelta(days=10), ["TCS.NS"]),
+    ]
+    for url, title, published, tickers in articles:
+        store.save_page(url, f"<html>{title}</html>")
+        store.save_parsed(url, title, f"{title}. Full story text.", published)
+        story = store.assign_story(url, title, f"{title}. Full story text.")
+        for ticker in tickers:
+            store.attach_ticker(story, ticker)
+    store._conn.close()
+    return store.path
+
+
+def test_recent_headlines_match_ticker_newest_first(store_path):
+    assert recent_headlines("tcs.ns", days=2, path=store_path) == [
+        "TCS wins $2 billion deal", "IT stocks surge on deal momentum",
+    ]
+    assert recent_headlines("INFY.NS", days=2, path=store_path) == ["IT stocks surge on deal momentum"]
+    assert recent_headlines("WIPRO.NS", path=store_path) == []
+
+
+def test_missing_or_foreign_store_yields_nothing(tmp_path):
+    assert recent_headlines("TCS.NS", path=tmp_path / "absent.sqlite") == []
+    (tmp_path / "junk.sqlite").write_bytes(b"")
+    assert recent_headlines("TCS.NS", path=tmp_path / "junk.sqlite") == []
+
+
+@pytest.mark.asyncio
+async def test_sentiment_node_prefers_archive_over_live_fetch(store_path):
+    from src.agents.sentiment_node import sentiment_node
+
+    with patch("src.agents.sentiment_node.recent_headlines",
+               side_effect=lambda t: recent_headlines(t, path=store_path)), \
+         patch("yfinance.Ticker") as mock_yf:
+        result = await sentiment_node({"tickers": ["TCS.NS", "WIPRO.NS"]})
+
+    tcs, wipro = result["sentiment_data"]
+    assert tcs["news_source"] == "archive" and tcs["sentiment"] == "positive"
+    assert tcs["summary"] == "TCS wins $2 billion deal"
+    assert wipro["news_source"] == "yfinance"
+    mock_yf.assert_called_once_with("WIPRO.NS")
+
+
+@pytest.mark.asyncio
+async def test_sentiment_node_skips_archive_when_disabled(monkeypatch):
+    from src.agents.sentiment_node import sentiment_node
+    from src.utils import news_archive
+
+    monkeypatch.setattr(news_archive, "NEWS_ARCHIVE_ENABLED", False)
+    with patch("src.agents.sentiment_node.recent_headlines") as archive, patch("yfinance.Ticker") as mock_yf:
+        mock_yf.return_value.news = [{"title": "TCS wins $2 billion deal"}]
+        result = await sentiment_node({"tickers": ["TCS.NS"]})
+
+    archive.assert_not_called()
+    assert result["sentiment_data"][0]["news_source"] == "yfinance"
@@ -0,0 +1,104 @@
+"""
+test_node_cache.py — Tests for market-date keyed node memoization.
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.utils.node_cache import IST, last_market_date, memoize_by_market_date, node_cache
+
+
+def test_last_market_date_after_close():
+    now = datetime(2026, 4, 15, 16, 0, tzinfo=IST)  # Wednesday, post close
+    assert last_market_date(now).isoformat() == "2026-04-15"
+
+
+def test_last_market_date_before_close_rolls_back():
+    now = datetime(2026, 4, 15, 10, 0, tzinfo=IST)
+    assert last_market_date(now).isoformat() == "2026-04-14"
+
+
+def test_last_market_date_weekend_uses_friday():
+    assert last_market_date(datetime(2026, 4, 18, 12, 0, tzinfo=IST)).isoformat() == "2026-04-17"
+    # Monday morning rolls back across the weekend
+    assert last_market_date(datetime(2026, 4, 20, 9, 0, tzinfo=IST)).isoformat() == "2026-04-17"
+
+
+@pytest.mark.asyncio
+async def test_memoize_shares_result_across_calls():
+    compute = AsyncMock(return_value={"ticker": "TCS.NS", "value": 1})
+
+    @memoize_by_market_date("unit")
+    async def fetch(ticker):
+        return await compute(ticker)
+
+    first = await fetch("TCS.NS")
+    second = await fetch("tcs.ns")
+    assert first == second
+    assert compute.await_count == 1
+    assert node_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memoize_skips_uncacheable_results():
+    compute = AsyncMock(return_value={"status": "Error"})
+
+    @memoize_by_market_date("unit", cacheable=lambda r: r["status"] != "Error")
+    async def fetch(ticker):
+        return await compute(ticker)
+
+    await fetch("INFY.NS")
+    await fetch("INFY.NS")
+    assert compute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_memoize_coalesces_concurrent_misses():
+    import asyncio
+    calls = 0
+
+    @memoize_by_market_date("unit")
+    async def fetch(ticker):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"ticker": ticker}
+
+    await asyncio.gather(*[fetch("RELIANCE.NS") for _ in range(5)])
+    assert calls == 1
+
+
+def test_cache_is_bounded():
+    from src.utils.node_cache import NodeResultCache
+    cache = NodeResultCache(max_entries=2)
+    for i in range(3):
+        cache.set(("unit", f"T{i}", None), i)
+    assert cache.stats()["entries"] == 2
+    assert ("unit", "T0", None) not in cache
+
+
+@pytest.mark.asyncio
+async def test_dividend_node_reuses_cached_ticker():
+    from src.agents.dividend_node import dividend_node
+    with patch("src.agents.dividend_node.yf.Ticker") as mock_yf:
+        mock_yf.return_value.info = {"dividendYield": 0.01, "payoutRatio": 0.2}
+        await dividend_node({"tickers": ["TCS.NS"]})
+        await dividend_node({"tickers": ["TCS.NS"]})
+        assert mock_yf.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_technical_tool_failures_are_not_cached():
+    from src.agents.technical_node import analyze_ticker_technicals
+    with patch("src.agents.technical_node.fetch_price_history", new_callable=AsyncMock), \
+         patch("src.agents.technical_node.mtc_score_report") as mock_mtc, \
+         patch("src.agents.technical_node.technical_patterns_report") as mock_pat:
+        mock_mtc.return_value = "MTC Score for HDFC.NS: Insufficient Data"
+        mock_pat.return_value = "No technical data for HDFC.NS"
+        first = await analyze_ticker_technicals("HDFC.NS")
+
+        mock_mtc.return_value = "MTC Score for HDFC.NS: 100/100. Status: STRONG BUY CONCORDANCE."
+        mock_pat.return_value = "Pattern Detection for HDFC.NS: RSI (14) at 55.00. MACD is No Crossover."
+        second = await analyze_ticker_technicals("HDFC.NS")
+
+    assert first["concordance"] == "Data Unavailable"
+    assert second["concordance"] == "Strong"
@@ -50,11 +50,10 @@ async def test_sentiment_node_consensus(base_state):
 # --- Technical Node Tests ---
 @pytest.mark.asyncio
 async def test_technical_node_triple_concordance(base_state):
-    with patch("src.agents.technical_node.calculate_mtc_score_tool") as mock_mtc:
-        with patch("src.agents.technical_node.detect_technical_patterns_tool") as mock_pat:
-            mock_mtc.run.return_value = "STRONG BUY CONCORDANCE [85/100]"
+    with patch("src.agents.technical_node.fetch_price_history", new_callable=AsyncMock), \
+         patch("src.agents.technical_node.mtc_score_report") as mock_mtc:
+        with patch("src.agents.technical_node.technical_patterns_report") as mock_pat:
             mock_mtc.return_value = "STRONG BUY CONCORDANCE [85/100]"
-            mock_pat.run.return_value = "Cup and Handle detected."
             mock_pat.return_value = "Cup and Handle detected."
             result = await technical_node(base_state)
             assert result["technical_data"][0]["concordance"] == "Strong"
@@ -99,3 +98,12 @@ async def test_reporting_node_synthesis(base_state):
         result = await reporting_node(base_state)
         assert "# Market-Rover Intelligence Report" in result["final_report"]
         assert any(c["type"] == "FINAL_CONFETTI_BURST" for c in result["celebrations"])
+
+# --- Graph Singleton Tests ---
+def test_graph_is_compiled_once_on_first_use():
+    from src.routes import analyze
+    with patch.object(analyze, "_graph", None), \
+         patch("src.market_rover_graph.create_market_rover_graph", return_value=object()) as mock_build:
+        first = analyze.get_graph()
+        assert analyze.get_graph() is first
+        mock_build.assert_called_once()
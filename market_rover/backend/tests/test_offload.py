@@ -0,0 +1,58 @@
+"""
+test_offload.py — Tests for event-loop offload of blocking analytics work.
+"""
+import time
+import pytest
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routes import router as api_router
+from src.utils.offload import run_blocking, OffloadTimeout
+
+_test_app = FastAPI()
+_test_app.include_router(api_router, prefix="/api")
+client = TestClient(_test_app)
+
+
+def _slow(seconds):
+    time.sleep(seconds)
+    return "done"
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_returns_result():
+    assert await run_blocking(sum, [1, 2, 3]) == 6
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_times_out():
+    with pytest.raises(OffloadTimeout):
+        await run_blocking(_slow, 0.5, timeout=0.05)
+
+
+def test_seasonality_route_uses_job():
+    payload = {"ticker": "TCS.NS", "exclude_outliers": False, "data": []}
+    with patch("src.routes.analysis.run_blocking", AsyncMock(return_value=payload)) as mock_run:
+        res = client.get("/api/analysis/seasonality/tcs")
+        assert res.status_code == 200
+        assert res.json()["ticker"] == "TCS.NS"
+        assert mock_run.await_args.args[1] == "TCS.NS"
+
+
+def test_analysis_route_no_data_returns_404():
+    with patch("src.utils.analytics_jobs.yf.download", return_value=pd.DataFrame()):
+        res = client.get("/api/analysis/backtest/FAKEXXX")
+        assert res.status_code == 404
+
+
+def test_analysis_route_timeout_returns_504():
+    with patch("src.routes.analysis.run_blocking", AsyncMock(side_effect=OffloadTimeout("slow"))):
+        res = client.get("/api/analysis/forecast/TCS")
+        assert res.status_code == 504
+
+
+def test_snapshot_route_timeout_returns_504():
+    with patch("src.routes.snapshot.run_blocking", AsyncMock(side_effect=OffloadTimeout("slow"))):
+        res = client.get("/api/snapshot/TCS.NS")
+        assert res.status_code == 504
@@ -0,0 +1,124 @@
+"""
+test_pagination.py — Tests for keyset-paginated forecast and shadow history.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.routes import router as api_router
+from src.utils.db_manager import db
+from src.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, split_page
+
+_test_app = FastAPI()
+_test_app.include_router(api_router, prefix="/api")
+client = TestClient(_test_app)
+
+T0 = datetime(2026, 10, 16, 15, 45)
+
+
+def _rows(n, **extra):
+    return [{"ticker": f"T{i:02d}.NS", "stance": "ACCUMULATION", "logic_summary": "",
+             "analysis_date": T0 - timedelta(minutes=i), **extra} for i in range(n)]
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    cursor = encode_cursor(T0, "u@x.com", "TCS.NS")
+    assert decode_cursor(cursor, parts=3) == (T0, "u@x.com", "TCS.NS")
+    assert decode_cursor(None, parts=2) is None
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", parts=2)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, parts=2)
+
+
+def test_split_page_emits_cursor_only_when_more_rows():
+    page, cursor = split_page(_rows(3), 2, key_fields=("ticker",))
+    assert len(page) == 2
+    assert decode_cursor(cursor, parts=2) == (page[-1]["analysis_date"], "T01.NS")
+    assert split_page(_rows(2), 2, key_fields=("ticker",))[1] is None
+
+
+def test_forecast_route_pages_with_header_cursor():
+    mock_history = AsyncMock(return_value=_rows(3))
+    with patch.object(db, "connect", AsyncMock()), patch.object(db, "get_forecast_history", mock_history):
+        first = client.get("/api/forecasts/u@x.com?limit=2")
+        assert first.status_code == 200
+        assert len(first.json()) == 2
+        cursor = first.headers["x-next-cursor"]
+
+        client.get(f"/api/forecasts/u@x.com?limit=2&cursor={cursor}")
+    assert mock_history.await_args_list[0].kwargs == {"limit": 3, "before": None}
+    assert mock_history.await_args.kwargs["before"] == (T0 - timedelta(minutes=1), "T01.NS")
+
+
+def test_cursor_rejects_tampered_tiebreakers():
+    for values in (["2026-10-16T15:45:00", 7], ["2026-10-16T15:45:00", {"t": 1}],
+                   ["2026-10-16T15:45:00", ""], [1760000000, "TCS.NS"]):
+        raw = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        with pytest.raises(InvalidCursor):
+            decode_cursor(raw, parts=2)
+
+
+def test_forecast_route_rejects_bad_cursor_and_limit():
+    assert client.get("/api/forecasts/u@x.com?cursor=garbage").status_code == 400
+    tampered = base64.urlsafe_b64encode(json.dumps([T0.isoformat(), ["x"]]).encode()).decode()
+    with patch.object(db, "connect", AsyncMock()), patch.object(db, "get_forecast_history", AsyncMock()) as history:
+        assert client.get(f"/api/forecasts/u@x.com?cursor={tampered}").status_code == 400
+    history.assert_not_awaited()
+    assert client.get("/api/forecasts/u@x.com?limit=100000").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_history_uses_seek_query():
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch.object(db, "pool", pool):
+        await db.get_forecast_history("u@x.com", limit=10)
+        assert "LIMIT $2" in conn.fetch.await_args.args[0]
+        await db.get_forecast_history("u@x.com", limit=10_000, before=(T0, "TCS.NS"))
+    sql, *params = conn.fetch.await_args.args
+    assert "(analysis_date, ticker) < ($2, $3)" in sql
+    assert params == ["u@x.com", T0, "TCS.NS", 201]
+
+
+def test_market_shadow_next_page_uses_keyset():
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(return_value=_rows(2, user_id="u@x.com"))
+    pool_cm = AsyncMock()
+    pool_cm.__aenter__ = AsyncMock(return_value=conn)
+    pool_cm.__aexit__ = AsyncMock(return_value=None)
+    with patch("src.routes.shadow.db") as mock_db:
+        mock_db.connect = AsyncMock()
+        mock_db._conn = MagicMock(return_value=pool_cm)
+        cursor = encode_cursor(T0, "u@x.com", "TCS.NS")
+        res = client.get(f"/api/shadow/market?limit=1&cursor={cursor}")
+
+    assert res.status_code == 200
+    assert len(res.json()) == 1
+    assert "x-next-cursor" in res.headers
+    sql, *params = conn.fetch.await_args.args
+    assert "(analysis_date, user_id, ticker) < ($2, $3, $4)" in sql
+    assert params == [2, T0, "u@x.com", "TCS.NS"]
+
+
+@pytest.mark.asyncio
+async def test_keyset_queries_skip_rows_without_analysis_date():
+    from src.routes import shadow
+    conn = AsyncMock()
+    conn.fetch = AsyncMock(return_value=[])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch.object(db, "pool", pool):
+        await db.get_forecast_history("u@x.com", limit=10)
+        await db.get_forecast_history("u@x.com", limit=10, before=(T0, "TCS.NS"))
+    statements = [call.args[0] for call in conn.fetch.await_args_list]
+    statements += [shadow._MARKET_FIRST, shadow._MARKET_NEXT, shadow._USER_FIRST, shadow._USER_NEXT]
+    # A NULL date sorts first under DESC and would reach encode_cursor as the page's last key
+    assert all("analysis_date IS NOT NULL" in sql for sql in statements)
@@ -96,8 +96,7 @@ async def test_shadow_user_returns_list():
         mock_conn.fetch = AsyncMock(return_value=[mock_row])
         mock_pool.__aenter__ = AsyncMock(return_value=mock_conn)
         mock_pool.__aexit__ = AsyncMock(return_value=None)
-        mock_db.pool = MagicMock()
-        mock_db.pool.acquire = MagicMock(return_value=mock_pool)
+        mock_db._conn = MagicMock(return_value=mock_pool)
 
         res = route_client.get("/api/shadow/test@gmail.com")
         assert res.status_code == 200
@@ -106,7 +105,7 @@ async def test_shadow_user_returns_list():
 # ── Heatmap Route (src/routes/heatmap.py) ────────────────────────────────────
 
 def test_heatmap_no_data_returns_404():
-    with patch("src.routes.heatmap.yf.download") as mock_dl:
+    with patch("src.utils.analytics_jobs.yf.download") as mock_dl:
         import pandas as pd
         mock_dl.return_value = pd.DataFrame()
         res = route_client.get("/api/heatmap/FAKEXXX")
@@ -114,7 +113,7 @@ def test_heatmap_no_data_returns_404():
 
 
 def test_heatmap_valid_ticker():
-    with patch("src.routes.heatmap.yf.download") as mock_dl:
+    with patch("src.utils.analytics_jobs.yf.download") as mock_dl:
         import pandas as pd
         from datetime import datetime
         idx = pd.DatetimeIndex([
@@ -0,0 +1,109 @@
+"""
+test_retention.py — Tests for activity-log partitioning and retention roll-ups.
+"""
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.utils import retention
+from src.utils.retention import (
+    add_months, expired_partitions, partition_month, partition_name, run_retention
+)
+
+
+class _FakeConn:
+    """Records every statement; answers the catalog lookups retention issues."""
+
+    def __init__(self, existing=(), relkind="p", oldest=None):
+        self.existing = set(existing)
+        self.relkind = relkind
+        self.oldest = oldest
+        self.sql = []
+        self.transaction = MagicMock(return_value=AsyncMock())
+
+    async def execute(self, sql, *args):
+        self.sql.append(" ".join(sql.split()))
+        if sql.startswith("CREATE TABLE public."):
+            self.existing.add(sql.split()[2].split(".")[-1])
+
+    async def fetchval(self, sql, *args):
+        self.sql.append(" ".join(sql.split()))
+        if "relkind" in sql:
+            return self.relkind
+        if "min(timestamp)" in sql:
+            return self.oldest
+        if "to_regclass($1)" in sql:
+            return args[0].split(".")[-1] in self.existing or None
+        return None
+
+    async def fetch(self, sql, *args):
+        return [{"relname": name} for name in sorted(self.existing)]
+
+
+def _fake_db(conn):
+    db = MagicMock()
+    db.connect = AsyncMock()
+
+    @asynccontextmanager
+    async def _conn():
+        yield conn
+    db._conn = _conn
+    return db
+
+
+def test_month_arithmetic_and_partition_names():
+    assert add_months(date(2026, 11, 20), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 5), -1) == date(2025, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == "user_activity_log_p202603"
+    assert partition_month("user_activity_log_p202603") == date(2026, 3, 1)
+    assert partition_month("user_activity_log_default") is None
+
+
+def test_expired_partitions_respect_retention_window():
+    names = [partition_name(date(2026, m, 1)) for m in range(5, 11)] + ["user_activity_log_default"]
+    expired = expired_partitions(names, today=date(2026, 10, 19), keep_months=3)
+    # July onwards is inside the window (Jul, Aug, Sep + current October)
+    assert [n for n, _ in expired] == ["user_activity_log_p202605", "user_activity_log_p202606"]
+
+
+@pytest.mark.asyncio
+async def test_run_retention_creates_ahead_and_rolls_up_expired(monkeypatch):
+    monkeypatch.setattr(retention, "ACTIVITY_RETENTION_MONTHS", 3)
+    conn = _FakeConn(existing={"user_activity_log_p202606", "user_activity_log_p202610"})
+
+    summary = await run_retention(_fake_db(conn), today=date(2026, 10, 19))
+
+    assert summary == {"activity_partitions_dropped": 1}
+    assert conn.sql[0].startswith("SELECT pg_advisory_xact_lock")
+    created = [s for s in conn.sql if s.startswith("CREATE TABLE public.")]
+    assert created == [
+        "CREATE TABLE public.user_activity_log_p202611 (LIKE public.user_activity_log INCLUDING DEFAULTS)",
+        "CREATE TABLE public.user_activity_log_p202612 (LIKE public.user_activity_log INCLUDING DEFAULTS)",
+    ]
+    rollup = next(s for s in conn.sql if "FROM public.user_activity_log_p202606" in s)
+    assert rollup.startswith("INSERT INTO public.user_activity_daily")
+    assert "DROP TABLE public.user_activity_log_p202606" in conn.sql
+    assert not any("p202610" in s and "DROP" in s for s in conn.sql)
+    # The live stance table is never rolled up or pruned
+    assert not any("agent_memory_ltm" in s for s in conn.sql)
+
+
+@pytest.mark.asyncio
+async def test_provision_converts_legacy_table():
+    conn = _FakeConn(relkind="r", oldest=datetime(2026, 9, 3))
+
+    await retention.provision(conn, today=date(2026, 10, 19))
+
+    # The conversion runs under the provisioning lock, inside its transaction
+    assert conn.sql[0].startswith("SELECT pg_advisory_xact_lock")
+    assert conn.transaction.call_count >= 2
+    assert conn.sql[2] == "ALTER TABLE public.user_activity_log RENAME TO user_activity_log_legacy"
+    assert any("PARTITION BY RANGE (timestamp)" in s for s in conn.sql)
+    copied = next(s for s in conn.sql if "FROM public.user_activity_log_legacy" in s and s.startswith("INSERT"))
+    assert "SELECT id, user_id" in copied
+    assert conn.sql.index(copied) > conn.sql.index(
+        "CREATE TABLE public.user_activity_log_p202609 (LIKE public.user_activity_log INCLUDING DEFAULTS)"
+    )
+    assert "DROP TABLE public.user_activity_log_legacy" in conn.sql
+    created = [s.split()[2] for s in conn.sql if s.startswith("CREATE TABLE public.")]
+    assert created == [f"public.user_activity_log_p2026{m:02d}" for m in (9, 10, 11, 12)]
@@ -0,0 +1,103 @@
+"""
+test_throttle.py — Tests for the per-host AIMD concurrency limiters.
+"""
+import asyncio
+import pytest
+from unittest.mock import PropertyMock, patch
+from src.utils.throttle import AdaptiveLimiter, get_limiter, is_overload_error, throttled
+
+
+def test_is_overload_error():
+    assert is_overload_error(Exception("HTTP 429 Too Many Requests"))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert not is_overload_error(ValueError("bad ticker"))
+
+
+def test_limiters_are_per_host():
+    assert get_limiter("postgres") is get_limiter("postgres")
+    assert get_limiter("postgres") is not get_limiter("yfinance")
+
+
+@pytest.mark.asyncio
+async def test_additive_increase_on_success():
+    limiter = AdaptiveLimiter("unit", initial=2, min_limit=1, max_limit=4)
+    for _ in range(10):
+        async with limiter:
+            pass
+    assert limiter.capacity > 2
+    assert limiter.capacity <= 4
+
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_on_overload():
+    limiter = AdaptiveLimiter("unit", initial=8, min_limit=1, max_limit=8)
+    with pytest.raises(RuntimeError):
+        async with limiter:
+            raise RuntimeError("429 rate limit")
+    assert limiter.capacity == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrency():
+    limiter = AdaptiveLimiter("unit", initial=2, min_limit=2, max_limit=2)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[job() for _ in range(6)])
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_throttled_retries_rate_limits():
+    calls = 0
+
+    @throttled(host="unit-retry")
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise Exception("Too Many Requests")
+        return "ok"
+
+    with patch("src.utils.throttle.asyncio.sleep") as mock_sleep:
+        mock_sleep.return_value = None
+        assert await flaky() == "ok"
+    assert calls == 2
+    assert get_limiter("unit-retry").stats()["backoffs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_throttled_reraises_other_errors():
+    @throttled
+    async def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await broken()
+    assert get_limiter("yfinance").in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_node_helpers_expose_rate_limits_to_the_limiter():
+    from src.agents.dividend_node import get_ticker_dividend
+    limiter = get_limiter("yfinance")
+    backoffs = limiter.backoffs
+
+    with patch("src.agents.dividend_node.yf.Ticker") as mock_yf, \
+         patch("src.utils.throttle.asyncio.sleep") as mock_sleep:
+        type(mock_yf.return_value).info = PropertyMock(
+            side_effect=Exception("Too Many Requests. Rate limited. Try after a while."))
+        mock_sleep.return_value = None
+        result = await get_ticker_dividend("ITC.NS")
+
+    # The helper still degrades gracefully, but only after the throttle backed off and retried
+    assert result["yield"] == "Data Unavailable"
+    assert mock_yf.call_count == 3
+    assert limiter.backoffs == backoffs + 3
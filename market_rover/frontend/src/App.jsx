@@ -727,11 +727,11 @@ const App = () => {
                         </tr>
                       </thead>
                       <tbody>
-                        {heatData.years.map(yr => (
+                        {heatData.years.map((yr, yi) => (
                           <tr key={yr}>
                             <td style={{ padding: '6px 10px', fontSize: '0.8rem', fontWeight: 700, color: '#94a3b8', whiteSpace: 'nowrap' }}>{yr}</td>
-                            {heatData.months.map(m => (
-                              <HeatCell key={m} val={heatData.data[String(yr)]?.[m] ?? null} />
+                            {heatData.months.map((m, mi) => (
+                              <HeatCell key={m} val={heatData.data[yi]?.[mi] ?? null} />
                             ))}
                           </tr>
                         ))}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import axios from 'axios';
 import { LineChart, Line, XAxis, YAxis, Tooltip as RechartsTooltip, ResponsiveContainer } from 'recharts';
 import { Activity, ArrowUpCircle, ArrowDownCircle, AlertCircle, Info } from 'lucide-react';
@@ -6,6 +6,14 @@ import { motion } from 'framer-motion';
 
 const api = axios.create({ baseURL: '' });
 
+// The snapshot API returns the chart column-wise ({ date: [...], close: [...] });
+// Recharts wants one object per point.
+const toChartRows = (chart) => {
+  if (!chart?.date) return [];
+  const keys = Object.keys(chart);
+  return chart.date.map((_, i) => Object.fromEntries(keys.map(k => [k, chart[k][i]])));
+};
+
 // Helper Components
 const GlassMetric = ({ title, value, sub, icon }) => (
   <div style={{
@@ -299,6 +307,8 @@ export default function StockSnapshot({ ticker }) {
     }
   }, [ticker]);
 
+  const chart_data = useMemo(() => toChartRows(data?.chart), [data]);
+
   if (!ticker) return null;
 
   if (loading) {
@@ -320,7 +330,7 @@ export default function StockSnapshot({ ticker }) {
     );
   }
 
-  const { metrics, chart_data } = data;
+  const { metrics } = data;
 
   return (
     <div className="glass-card" style={{ padding: '1.5rem', marginBottom: '1.5rem', display: 'flex', flexDirection: 'column', gap: '1.5rem' }}>
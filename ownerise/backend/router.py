@@ -10,7 +10,6 @@ from .calculations import (
     calculate_subscription_pl,
     calculate_additional_allotment_probability
 )
-from .orchestrator import run_ownerise_audit
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -267,6 +266,7 @@ class AuditRequest(BaseModel):
 async def audit_rights_issue(req: AuditRequest):
     """Triggers the AI Agent Crew to analyze a rights issue filing."""
     try:
+        from .orchestrator import run_ownerise_audit  # CrewAI is heavy; import on first audit, not at startup
         result = run_ownerise_audit(req.filing_text)
         return {"symbol": req.symbol, "analysis": result}
     except Exception as e:
@@ -2,7 +2,6 @@ import asyncio
 from fastapi import APIRouter, BackgroundTasks
 from pydantic import BaseModel
 from ..data.scan_manager import ScanManager
-from ..agents.council import run_council
 from ..agents.harvester import ExchangeHarvester
 
 router = APIRouter()
@@ -37,6 +36,7 @@ async def perform_scan_background(filing_text: str = None):
 
         # 2. Run Agentic Suite
         # In a real app, we'd fetch metrics from the DB to ground the agents
+        from ..agents.council import run_council  # CrewAI is heavy; import on first scan, not at startup
         result = await run_council(filing_text)
 
         # 3. Persist Results (SQL Transaction)
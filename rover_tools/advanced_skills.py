@@ -57,6 +57,56 @@ def analyze_retail_sentiment_tool(ticker: str) -> str:
          return f"Failed to analyze retail sentiment for {ticker}."
 
 # --- 4. Technical Market Analyst Skill ---
+def technical_patterns_report(ticker: str, data) -> str:
+    """RSI (14) / MACD (12, 26, 9) summary from daily OHLC data (fetched by the caller)."""
+    if data.empty:
+        return f"No technical data for {ticker}"
+
+    # Simple RSI (14)
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs)).iloc[-1]
+
+    # MACD (12, 26, 9)
+    exp1 = data['Close'].ewm(span=12, adjust=False).mean()
+    exp2 = data['Close'].ewm(span=26, adjust=False).mean()
+    macd = exp1 - exp2
+    signal = macd.ewm(span=9, adjust=False).mean()
+
+    crossover = "No Crossover"
+    if macd.iloc[-1] > signal.iloc[-1] and macd.iloc[-2] <= signal.iloc[-2]:
+        crossover = "BULLISH CROSSOVER"
+    elif macd.iloc[-1] < signal.iloc[-1] and macd.iloc[-2] >= signal.iloc[-2]:
+        crossover = "BEARISH CROSSOVER"
+
+    return f"Pattern Detection for {ticker}: RSI (14) at {rsi:.2f}. MACD is {crossover}."
+
+
+def mtc_score_report(ticker: str, d_data, h_data) -> str:
+    """Multi-Timeframe Concordance summary from daily and 1h OHLC data (fetched by the caller)."""
+    if d_data.empty or h_data.empty:
+        return f"MTC Score for {ticker}: Insufficient Data"
+
+    # Check Trend (Price > 20EMA)
+    d_trend = d_data['Close'].iloc[-1] > d_data['Close'].ewm(span=20).mean().iloc[-1]
+    h_trend = h_data['Close'].iloc[-1] > h_data['Close'].ewm(span=20).mean().iloc[-1]
+
+    score = 0
+    if d_trend and h_trend:
+        score = 100
+        status = "STRONG BUY CONCORDANCE"
+    elif not d_trend and not h_trend:
+        score = 100
+        status = "STRONG SELL CONCORDANCE"
+    else:
+        score = 50
+        status = "CONFLICTING TRENDS"
+
+    return f"MTC Score for {ticker}: {score}/100. Status: {status}."
+
+
 @tool("detect_technical_patterns_tool")
 def detect_technical_patterns_tool(ticker: str) -> str:
     """
@@ -65,29 +115,7 @@ def detect_technical_patterns_tool(ticker: str) -> str:
     """
     try:
         data = yf.download(ticker, period="1mo", interval="1d", progress=False)
-        if data.empty:
-             return f"No technical data for {ticker}"
-
-        # Simple RSI (14)
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-
-        # MACD (12, 26, 9)
-        exp1 = data['Close'].ewm(span=12, adjust=False).mean()
-        exp2 = data['Close'].ewm(span=26, adjust=False).mean()
-        macd = exp1 - exp2
-        signal = macd.ewm(span=9, adjust=False).mean()
-
-        crossover = "No Crossover"
-        if macd.iloc[-1] > signal.iloc[-1] and macd.iloc[-2] <= signal.iloc[-2]:
-            crossover = "BULLISH CROSSOVER"
-        elif macd.iloc[-1] < signal.iloc[-1] and macd.iloc[-2] >= signal.iloc[-2]:
-            crossover = "BEARISH CROSSOVER"
-
-        return f"Pattern Detection for {ticker}: RSI (14) at {rsi:.2f}. MACD is {crossover}."
+        return technical_patterns_report(ticker, data)
     except Exception as e:
          logger.error(f"Error in detect_technical_patterns_tool: {e}")
          return f"Failed to detect technical patterns for {ticker}."
@@ -190,26 +218,7 @@ def calculate_mtc_score_tool(ticker: str) -> str:
         # Fetch Daily and 1h data
         d_data = yf.download(ticker, period="1mo", interval="1d", progress=False)
         h_data = yf.download(ticker, period="5d", interval="1h", progress=False)
-
-        if d_data.empty or h_data.empty:
-            return f"MTC Score for {ticker}: Insufficient Data"
-
-        # Check Trend (Price > 20EMA)
-        d_trend = d_data['Close'].iloc[-1] > d_data['Close'].ewm(span=20).mean().iloc[-1]
-        h_trend = h_data['Close'].iloc[-1] > h_data['Close'].ewm(span=20).mean().iloc[-1]
-
-        score = 0
-        if d_trend and h_trend:
-            score = 100
-            status = "STRONG BUY CONCORDANCE"
-        elif not d_trend and not h_trend:
-            score = 100
-            status = "STRONG SELL CONCORDANCE"
-        else:
-            score = 50
-            status = "CONFLICTING TRENDS"
-
-        return f"MTC Score for {ticker}: {score}/100. Status: {status}."
+        return mtc_score_report(ticker, d_data, h_data)
     except Exception as e:
         logger.error(f"Error in calculate_mtc_score_tool: {e}")
         return f"Failed to calculate MTC score for {ticker}."
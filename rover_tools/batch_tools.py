@@ -2,32 +2,131 @@
 Batch Tools - Parallel processing for Market Rover agents.
 Replaces single-stock tools with optimized batch operations.
 """
+import atexit
+import threading
+import asyncio
 import concurrent.futures
+from collections import deque
 import yfinance as yf
 from crewai.tools import tool
 from typing import List, Dict
 import json
+from config import BATCH_MAX_WORKERS, BATCH_QUEUE_SIZE
 from rover_tools.shadow_tools import detect_silent_accumulation
-from rover_tools.news_scraper_tool import scrape_stock_news
+from rover_tools.news_scraper_tool import collect_stock_articles, news_http
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# --- Shared executor for all batch tools ---
+class BoundedExecutor:
+    """
+    Long-lived thread pool with a capped backlog: submit() blocks once
+    max_workers running + queue_size waiting tasks are in flight.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int):
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rover-batch")
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._run, fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    @staticmethod
+    def _run(fn, *args):
+        _worker.active = True
+        return fn(*args)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_worker = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> BoundedExecutor:
+    """The process-wide batch executor, created on first use and kept for the life of the process."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(BATCH_MAX_WORKERS, BATCH_QUEUE_SIZE)
+            atexit.register(_executor.shutdown, wait=False)
+        return _executor
+
+
 # --- Helper for Parallel Execution ---
 def run_in_parallel(func, items, max_workers=10):
-    """Run a function for multiple items in parallel using threading."""
+    """
+    Run a function for multiple items on the shared executor, with at most
+    `max_workers` of this call's items in flight. Results keep input order.
+    """
     results = {}
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_item = {executor.submit(func, item): item for item in items}
-        for future in concurrent.futures.as_completed(future_to_item):
-            item = future_to_item[future]
-            try:
-                data = future.result()
-                results[item] = data
-            except Exception as e:
-                logger.error(f"Error processing {item}: {e}")
-                results[item] = f"Error: {str(e)}"
-    return results
+
+    def _settle(item, call):
+        try:
+            results[item] = call()
+        except Exception as e:
+            logger.error(f"Error processing {item}: {e}")
+            results[item] = f"Error: {str(e)}"
+
+    if getattr(_worker, 'active', False):
+        # Nested batch call from a pool thread: run inline instead of waiting on our own pool
+        for item in items:
+            _settle(item, lambda: func(item))
+        return results
+
+    executor = get_executor()
+    queue = deque(items)
+    pending = {}
+    while queue or pending:
+        while queue and len(pending) < max_workers:
+            item = queue.popleft()
+            pending[executor.submit(func, item)] = item
+        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            _settle(pending.pop(future), future.result)
+
+    return {item: results[item] for item in items}
+
+
+def _format_quote(sym: str, price: float, prev: float) -> str:
+    change_pct = ((price - prev) / prev) * 100 if prev else 0.0
+    return f"{sym}: ₹{price:.2f} ({change_pct:+.2f}%)"
+
+
+def fetch_quotes(symbols: List[str]) -> Dict[str, str]:
+    """
+    Price snapshot for every symbol from ONE multi-symbol download (last close
+    vs the one before). Symbols the download returned nothing for are omitted.
+    """
+    data = yf.download(symbols, period="5d", progress=False)
+    if data is None or data.empty:
+        return {}
+
+    closes = data['Close'] if 'Close' in data else data
+    if not hasattr(closes, 'columns'):  # Older yfinance returns a Series for one symbol
+        closes = closes.to_frame(symbols[0])
+
+    quotes = {}
+    for sym in symbols:
+        if sym not in closes.columns:
+            continue
+        series = closes[sym].dropna()
+        if series.empty:
+            continue
+        price = float(series.iloc[-1])
+        prev = float(series.iloc[-2]) if len(series) > 1 else price
+        quotes[sym] = _format_quote(sym, price, prev)
+    return quotes
 
 @tool("Batch Stock Data Fetcher")
 def batch_get_stock_data(tickers: str) -> str:
@@ -54,12 +153,14 @@ def batch_get_stock_data(tickers: str) -> str:
             
         logger.info(f"Batch fetching stock data for: {final_list}")
 
-        # 2. Fetch all at once using yfinance (optimized)
-        # yfinance can fetch multiple tickers in one call: yf.download(tickers)
-        # But for 'info', we still need separate calls usually, or we use .Tickers
-        
-        # Strategy: Use ThreadPool for 'info' as it's often faster for detailed data vs bulk download which gives only OHLC
-        
+        # 2. One bulk quote request for all symbols
+        try:
+            results = fetch_quotes(final_list)
+        except Exception as e:
+            logger.warning(f"Bulk quote failed, falling back to per-ticker: {e}")
+            results = {}
+
+        # 3. Per-ticker fast_info only for symbols the bulk request missed
         def fetch_single(sym):
             t = yf.Ticker(sym)
             try:
@@ -74,12 +175,14 @@ def batch_get_stock_data(tickers: str) -> str:
                     else:
                         return f"{sym}: No Data"
                 
-                change_pct = ((price - prev) / prev) * 100 if prev else 0.0
-                return f"{sym}: ₹{price:.2f} ({change_pct:+.2f}%)"
+                return _format_quote(sym, price, prev)
             except Exception as e:
                 return f"{sym}: Error ({str(e)})"
 
-        results = run_in_parallel(fetch_single, final_list, max_workers=10)
+        missing = [sym for sym in final_list if sym not in results]
+        if missing:
+            results.update(run_in_parallel(fetch_single, missing, max_workers=10))
+        results = {sym: results[sym] for sym in final_list}
         
         # Format Output
         output = "📊 **Batch Stock Market Data**:\n"
@@ -92,10 +195,23 @@ def batch_get_stock_data(tickers: str) -> str:
         return f"Batch Fetch Failed: {str(e)}"
 
 
+def group_stories(per_ticker: Dict[str, List[Dict]]) -> List[Dict]:
+    """Collapses ticker -> articles into unique stories, each listing every ticker it appeared under."""
+    stories = {}
+    for sym, articles in per_ticker.items():
+        for art in articles:
+            key = art.get('story_id') or art['title']
+            story = stories.setdefault(key, {'article': art, 'tickers': []})
+            if sym not in story['tickers']:
+                story['tickers'].append(sym)
+    return list(stories.values())
+
+
 @tool("Batch News Scraper")
 def batch_scrape_news(tickers: str) -> str:
     """
     Scrapes news for MULTIPLE stocks in parallel.
+    Market-wide stories are reported once with every ticker they mention.
     
     Args:
         tickers: Comma-separated stock symbols.
@@ -104,19 +220,32 @@ def batch_scrape_news(tickers: str) -> str:
         Summarized news for all stocks.
     """
     try:
-        ticker_list = [t.strip() for t in tickers.split(',') if t.strip()]
+        ticker_list = list(dict.fromkeys(t.strip() for t in tickers.split(',') if t.strip()))
         logger.info(f"Batch scraping news for: {ticker_list}")
 
-        # Re-use existing scrape_stock_news logic but parallelize it
-        # We need to wrap it to return string result
-        
-        results = run_in_parallel(scrape_stock_news.run, ticker_list, max_workers=5) # Lower workers for scraping to be nice
-        
-        output = "📰 **Batch News Report**:\n\n"
-        for sym, news in results.items():
+        # All tickers share one gather on the pooled news client (no thread per ticker)
+        async def gather_all():
+            return await asyncio.gather(*(collect_stock_articles(t) for t in ticker_list), return_exceptions=True)
+
+        per_ticker, quiet = {}, []
+        for sym, articles in zip(ticker_list, news_http.run(gather_all())):
+            if isinstance(articles, Exception):
+                logger.error(f"Error processing {sym}: {articles}")
+                quiet.append(f"{sym} (error)")
+            elif articles:
+                per_ticker[sym] = articles
+            else:
+                quiet.append(sym)
+
+        stories = group_stories(per_ticker)
+        output = f"📰 **Batch News Report** ({len(stories)} unique stories):\n\n"
+        for story in stories:
+            art = story['article']
             # Truncate to save context window
-            summary = news[:500] + "..." if len(news) > 500 else news
-            output += f"**{sym}**:\n{summary}\n\n"
+            summary = art['summary'][:500] + "..." if len(art['summary']) > 500 else art['summary']
+            output += f"**{art['title']}** ({art['date']}) — {', '.join(story['tickers'])}\n{summary}\n\n"
+        if quiet:
+            output += f"No recent news: {', '.join(quiet)}\n"
             
         return output
 
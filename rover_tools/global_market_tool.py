@@ -1,14 +1,17 @@
 """
 Global Market Tool - Fetches key global indices and commodities to assess market sentiment.
-Uses yfinance to track Crude Oil, Gold, NASDAQ, and USDINR.
+Reads Crude Oil, Gold, NASDAQ, USDINR etc. from the shared market snapshot.
 """
-import yfinance as yf
 from crewai.tools import tool
 from utils.logger import get_logger
+from utils.market_snapshot import GLOBAL_INDICES, market_snapshot
 from utils.metrics import track_error_detail
 
 logger = get_logger(__name__)
 
+# Indicators listed by get_global_cues, in display order
+GLOBAL_CUES = ["Brent Crude ($)", "Gold ($)", "NASDAQ", "S&P 500", "USD/INR", "VIX", "US 10Y Yield"]
+
 @tool("Get Global Market Cues")
 def get_global_cues() -> str:
     """
@@ -24,44 +27,16 @@ def get_global_cues() -> str:
         A formatted string summarizing the global cues (Price and % Change).
     """
     try:
-        tickers = {
-            "Brent Crude ($)": "CL=F",
-            "Gold ($)": "GC=F",
-            "NASDAQ": "^NDX",
-            "S&P 500": "^GSPC",
-            "USD/INR": "INR=X",
-            "VIX": "^VIX",
-            "US 10Y Yield": "^TNX"
-        }
+        if market_snapshot.frame().empty:
+            raise ValueError("Global market snapshot is unavailable")
 
         output = "🌍 **Global Market Cues**:\n"
 
-        # Download data for all tickers
-        # Using auto_adjust=False to get close price
-        data = yf.download(list(tickers.values()), period="5d", progress=False)
-
-        # yfinance return structure changed in recent versions
-        # Ideally we want 'Close' or 'Adj Close'
-        if 'Close' in data:
-            close_data = data['Close']
-        else:
-            close_data = data
-
-        latest_data = close_data.iloc[-1]
-        prev_data = close_data.iloc[-2]
-
-        for name, ticker in tickers.items():
+        for name in GLOBAL_CUES:
             try:
-                # Handle potential MultiIndex columns in newer yfinance
-                val_current = 0
-                val_prev = 0
-
-                if ticker in latest_data:
-                    val_current = latest_data[ticker]
-                    val_prev = prev_data[ticker]
-                else:
-                    # Fallback or loop to find
-                     pass
+                closes = market_snapshot.closes(GLOBAL_INDICES[name])
+                val_current = closes.iloc[-1] if len(closes) >= 2 else 0
+                val_prev = closes.iloc[-2] if len(closes) >= 2 else 0
 
                 # If values are found
                 if val_current and val_prev:
@@ -90,15 +65,15 @@ def get_global_cues_data() -> dict:
     Returns raw numeric data for global metrics to be used by agents.
     """
     try:
-        tickers = {"vix": "^VIX", "yield_10y": "^TNX", "dxy": "DX-Y.NYB", "sp500": "^GSPC"}
-        data = yf.download(list(tickers.values()), period="2d", progress=False)
-        latest = data['Close'].iloc[-1]
+        defaults = {"vix": 20, "yield_10y": 3.5, "dxy": 100, "sp500": 5000}
+        symbols = {"vix": "^VIX", "yield_10y": "^TNX", "dxy": "DX-Y.NYB", "sp500": "^GSPC"}
+        if market_snapshot.frame().empty:
+            raise ValueError("Global market snapshot is unavailable")
 
-        return {
-            "vix": float(latest.get("^VIX", 20)),
-            "yield_10y": float(latest.get("^TNX", 3.5)),
-            "dxy": float(latest.get("DX-Y.NYB", 100)),
-            "sp500": float(latest.get("^GSPC", 5000))
-        }
+        result = {}
+        for key, symbol in symbols.items():
+            closes = market_snapshot.closes(symbol)
+            result[key] = float(closes.iloc[-1]) if len(closes) else defaults[key]
+        return result
     except Exception:
         return {"vix": 20, "yield_10y": 3.5, "dxy": 100}
@@ -4,8 +4,8 @@ Market Context Tool - Analyzes Nifty 50 and sector indices.
 import yfinance as yf
 from typing import Dict
 from crewai.tools import tool
-from datetime import datetime, timedelta
 from utils.logger import get_logger
+from utils.market_snapshot import HORIZON_SESSIONS, change_over, market_snapshot
 
 logger = get_logger(__name__)
 
@@ -26,20 +26,17 @@ def analyze_market_context(portfolio_stocks: str = None) -> str:
         Market context analysis
     """
     def _get_index_performance(symbol: str, name: str) -> Dict:
-        """Get performance data for an index."""
+        """Get performance data for an index from the shared snapshot."""
         try:
-            index = yf.Ticker(symbol)
-            hist = index.history(period="1mo")
+            hist = market_snapshot.closes(symbol).to_frame('Close')
             
             if hist.empty:
                 return None
             
             current = hist['Close'].iloc[-1]
-            week_ago = hist['Close'].iloc[-5] if len(hist) >= 5 else hist['Close'].iloc[0]
-            month_ago = hist['Close'].iloc[0]
-            
-            week_change = ((current - week_ago) / week_ago) * 100
-            month_change = ((current - month_ago) / month_ago) * 100
+            # Same lookbacks as the sector table (the snapshot holds ~3 months)
+            week_change = change_over(hist['Close'], HORIZON_SESSIONS["1W"])
+            month_change = change_over(hist['Close'], HORIZON_SESSIONS["1M"])
             
             return {
                 'name': name,
@@ -1,11 +1,10 @@
 """
 Memory Tool - Persistent Learning for Market Rover Agents
 """
-import json
-import os
 import datetime
 import yfinance as yf
 from utils.logger import get_logger
+from utils.prediction_ledger import prediction_ledger
 try:
     from crewai.tools import tool
 except ImportError:
@@ -16,84 +15,74 @@ except ImportError:
 
 logger = get_logger(__name__)
 
-MEMORY_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'memory.json')
+# Previous JSON ledger; imported into the prediction ledger on first use
+MEMORY_FILE_PATH = str(prediction_ledger.legacy_json)
 
-def _ensure_memory_file():
-    """Ensure the memory JSON file exists."""
-    if not os.path.exists(MEMORY_FILE_PATH):
-        try:
-            os.makedirs(os.path.dirname(MEMORY_FILE_PATH), exist_ok=True)
-            with open(MEMORY_FILE_PATH, 'w') as f:
-                json.dump([], f)
-        except Exception as e:
-            logger.error(f"Failed to create memory file: {e}")
+# Rows shown by the Brain tab; the ledger itself keeps every prediction
+MEMORY_DISPLAY_LIMIT = 1000
 
-def read_memory():
-    """Read the entire memory ledger."""
-    _ensure_memory_file()
+def read_memory(limit: int = MEMORY_DISPLAY_LIMIT):
+    """Read the most recent `limit` ledger entries (oldest first)."""
     try:
-        with open(MEMORY_FILE_PATH, 'r') as f:
-            return json.load(f)
+        return prediction_ledger.entries(limit=limit)
     except Exception as e:
-        logger.error(f"Failed to read memory file: {e}")
+        logger.error(f"Failed to read prediction ledger: {e}")
         return []
 
-def write_memory(data):
-    """Write data to the memory ledger."""
-    _ensure_memory_file()
+def memory_stats():
+    """Total, validated and successful prediction counts over the whole ledger."""
     try:
-        with open(MEMORY_FILE_PATH, 'w') as f:
-            json.dump(data, f, indent=4)
-        return True
+        return prediction_ledger.stats()
     except Exception as e:
-        logger.error(f"Failed to write memory file: {e}")
-        return False
+        logger.error(f"Failed to read prediction ledger stats: {e}")
+        return {"total": 0, "validated": 0, "wins": 0}
 
 def evaluate_pending_predictions():
     """
     Evaluates 'Pending' predictions in the memory against actual market movement
     if they are older than 3 days. Updates the outcome in the memory ledger.
     """
-    memory = read_memory()
-    updated = False
     today = datetime.date.today()
+    updated = 0
+    
+    # We need at least 3 days to judge a short term swing/prediction
+    try:
+        pending = prediction_ledger.pending(today - datetime.timedelta(days=3))
+    except Exception as e:
+        logger.error(f"Failed to read pending predictions: {e}")
+        return
     
-    for entry in memory:
-        if entry.get("outcome") == "Pending":
-            try:
-                pred_date_str = entry.get("date")
-                pred_date = datetime.datetime.strptime(pred_date_str, "%Y-%m-%d").date()
+    for entry in pending:
+        try:
+            pred_date_str = entry.get("date")
+            pred_date = datetime.datetime.strptime(pred_date_str, "%Y-%m-%d").date()
+            ticker = entry.get("ticker", "")
+            signal = str(entry.get("signal", "")).lower()
+            
+            # Fetch brief history
+            stock = yf.Ticker(ticker)
+            hist = stock.history(start=pred_date.isoformat(), end=today.isoformat())
+            
+            if not hist.empty and len(hist) > 1:
+                price_then = hist.iloc[0]['Close']
+                price_now = hist.iloc[-1]['Close']
+                price_diff = (price_now - price_then) / price_then
                 
-                # We need at least 3 days to judge a short term swing/prediction
-                if (today - pred_date).days >= 3:
-                    ticker = entry.get("ticker", "")
-                    signal = str(entry.get("signal", "")).lower()
-                    
-                    # Fetch brief history
-                    stock = yf.Ticker(ticker)
-                    hist = stock.history(start=pred_date.isoformat(), end=today.isoformat())
+                logger.info(f"Evaluating {ticker}: Predicted {signal} on {pred_date_str}. Price moved {price_diff*100:.2f}%.")
+                
+                if any(s in signal for s in ["buy", "accumulate", "bullish"]):
+                    outcome = "Success" if price_diff > 0 else "Failed"
+                elif any(s in signal for s in ["sell", "trap", "bearish"]):
+                    outcome = "Success" if price_diff < 0 else "Failed"
+                else:
+                    outcome = "Neutral (No Direction)"
                     
-                    if not hist.empty and len(hist) > 1:
-                        price_then = hist.iloc[0]['Close']
-                        price_now = hist.iloc[-1]['Close']
-                        price_diff = (price_now - price_then) / price_then
-                        
-                        logger.info(f"Evaluating {ticker}: Predicted {signal} on {pred_date_str}. Price moved {price_diff*100:.2f}%.")
-                        
-                        if any(s in signal for s in ["buy", "accumulate", "bullish"]):
-                            entry["outcome"] = "Success" if price_diff > 0 else "Failed"
-                        elif any(s in signal for s in ["sell", "trap", "bearish"]):
-                            entry["outcome"] = "Success" if price_diff < 0 else "Failed"
-                        else:
-                            entry["outcome"] = "Neutral (No Direction)"
-                            
-                        updated = True
-            except Exception as e:
-                logger.error(f"Failed to evaluate prediction for {entry.get('ticker')}: {e}")
+                updated += prediction_ledger.set_outcome(entry["id"], outcome)
+        except Exception as e:
+            logger.error(f"Failed to evaluate prediction for {entry.get('ticker')}: {e}")
                 
     if updated:
-        write_memory(memory)
-        logger.info("Memory ledger outcomes updated.")
+        logger.info(f"Memory ledger outcomes updated ({updated}).")
 
 # ==============================================================================
 # AGENT TOOLS
@@ -108,22 +97,16 @@ def read_past_predictions_tool(ticker: str) -> str:
     Args:
         ticker: The stock symbol (e.g. INFY.NS)
     """
-    memory = read_memory()
-    if not memory:
-        return "No past predictions found."
-    
-    # Filter for the specific ticker
-    # Normalize ticker (remove .NS for flexible matching if needed, but strict is better)
     ticker = ticker.upper()
-    relevant = [m for m in memory if m.get('ticker') == ticker]
+    try:
+        latest = prediction_ledger.latest(ticker)
+    except Exception as e:
+        logger.error(f"Failed to read prediction ledger: {e}")
+        return "No past predictions found."
     
-    if not relevant:
+    if not latest:
         return f"No past history for {ticker}."
     
-    # Sort by date descending
-    relevant.sort(key=lambda x: x.get('date', ''), reverse=True)
-    latest = relevant[0]
-    
     outcome_str = f" (Outcome: {latest.get('outcome', 'Pending')})"
     return f"🧠 **Memory Recall**: On {latest['date']}, we predicted '{latest['signal']}' with {latest.get('confidence', 'N/A')} confidence{outcome_str}."
 
@@ -137,21 +120,10 @@ def save_prediction_tool(ticker: str, signal: str, confidence: str) -> str:
         signal: The core signal (e.g. "Buy", "Sell", "Wait").
         confidence: Assessment of confidence (High/Medium/Low).
     """
-    memory = read_memory()
-    
-    entry = {
-        "date": datetime.date.today().isoformat(),
-        "ticker": ticker.upper(),
-        "signal": signal,
-        "confidence": confidence,
-        "outcome": "Pending" # To be updated by a future 'outcome checker'
-    }
-    
-    memory.append(entry)
-    # Keep only last 1000 entries to prevent bloat
-    if len(memory) > 1000:
-        memory = memory[-1000:]
-        
-    if write_memory(memory):
+    try:
+        # Single atomic append; the ledger is never rewritten or truncated
+        prediction_ledger.append(ticker, signal, confidence)
         return f"Saved prediction for {ticker}."
-    return "Failed to save prediction."
+    except Exception as e:
+        logger.error(f"Failed to save prediction: {e}")
+        return "Failed to save prediction."
@@ -1,11 +1,16 @@
 """
 News Scraper Tool - Scrapes news from Moneycontrol using Newspaper3k.
 Supports both General Market News (Macro) and Specific Stock News (Micro).
-Optimized with AsyncIO/AIOHTTP for parallel fetching.
+Optimized with AsyncIO/AIOHTTP for parallel fetching: every request goes through
+one process-wide pooled client (keep-alive, per-host limits, timeouts) and
+article parsing runs in a small bounded thread pool. Pages and parsed articles
+are kept in the local article store and revalidated with conditional requests;
+near-duplicate copies of one story are collapsed and linked to every ticker.
+Store reads and writes (SQLite, zlib) run on their own worker thread so they
+never block the shared client's event loop.
 """
-import requests
 import asyncio
-import aiohttp
+from concurrent.futures import ThreadPoolExecutor
 try:
     from newspaper import Article
 except ImportError:
@@ -19,19 +24,42 @@ except ImportError:
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from crewai.tools import tool
-from config import LOOKBACK_DAYS, MONEYCONTROL_BASE_URL
+from config import (
+    LOOKBACK_DAYS, MONEYCONTROL_BASE_URL,
+    NEWS_HTTP_LIMIT, NEWS_HTTP_PER_HOST, NEWS_HTTP_TIMEOUT, NEWS_PARSE_WORKERS,
+    NEWS_ARTICLE_MAX_AGE_HOURS,
+)
 import time
+from utils.article_store import article_store, conditional_headers
+from utils.async_http import PooledHttpClient
 from utils.logger import get_logger
 from utils.metrics import track_error_detail, track_performance, PerformanceMonitor
 from bs4 import BeautifulSoup
 
 logger = get_logger(__name__)
 
-# Re-use the same session/headers for consistency? Requests uses Session better.
 REQUEST_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# Shared for the whole process: pooled keep-alive connections to Moneycontrol
+news_http = PooledHttpClient(
+    limit=NEWS_HTTP_LIMIT,
+    limit_per_host=NEWS_HTTP_PER_HOST,
+    timeout=NEWS_HTTP_TIMEOUT,
+    headers=REQUEST_HEADERS,
+)
+
+# Newspaper3k parsing is CPU-bound and synchronous; bound it separately from network I/O
+_parse_pool = ThreadPoolExecutor(max_workers=NEWS_PARSE_WORKERS, thread_name_prefix="news-parse")
+# The store serializes on one connection anyway, so a single thread is enough
+_store_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="news-store")
+
+
+async def _in_store(func, *args):
+    """Runs a blocking article-store call on the store thread."""
+    return await asyncio.get_running_loop().run_in_executor(_store_pool, func, *args)
+
 
 @tool("Scrape General Market News")
 def scrape_general_market_news(category: str = "business") -> str:
@@ -51,16 +79,14 @@ def scrape_general_market_news(category: str = "business") -> str:
         
         with PerformanceMonitor().measure("general_news_fetch"):
             try:
-                response = requests.get(url, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
+                response = news_http.run(news_http.get(url))
             except Exception as e:
                 return f"Failed to connect to news source: {str(e)}"
             
-            if response.status_code != 200:
-                return f"Failed to fetch news (Status: {response.status_code})"
+            if response.status != 200:
+                return f"Failed to fetch news (Status: {response.status})"
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.text, 'html.parser')
             stories = []
             seen_urls = set()
             
@@ -93,21 +119,32 @@ def scrape_general_market_news(category: str = "business") -> str:
 
 # --- Async Helper Functions for Stock News ---
 
-async def fetch_url(url: str) -> Optional[str]:
-    """Async fetch of a single URL using requests in a thread (to bypass 403s)."""
-    def blocking_fetch():
-        try:
-            response = requests.get(url, headers=REQUEST_HEADERS, timeout=10)
-            if response.status_code == 200:
-                return response.text
-            else:
-                logger.warning(f"Fetch failed for {url} with status {response.status_code}")
-                return None
-        except Exception as e:
-            logger.error(f"Fetch failed for {url}: {e}")
-            return None
+async def fetch_page(url: str) -> Optional[Dict]:
+    """
+    Conditional GET through the article store. Returns the stored record after
+    a 200 (saved) or 304 (revalidated); the stale copy if the network fails.
+    """
+    record = await _in_store(article_store.get, url)
+    try:
+        response = await news_http.get(url, headers=conditional_headers(record))
+    except Exception as e:
+        logger.error(f"Fetch failed for {url}: {e}")
+        return record
+    if response.status == 304 and record:
+        return await _in_store(article_store.mark_checked, url)
+    if response.status != 200:
+        logger.warning(f"Fetch failed for {url} with status {response.status}")
+        return None
+    return await _in_store(
+        article_store.save_page,
+        url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+    )
+
 
-    return await asyncio.to_thread(blocking_fetch)
+async def fetch_url(url: str) -> Optional[str]:
+    """Async fetch of a single URL on the pooled client (browser User-Agent to avoid 403s)."""
+    record = await fetch_page(url)
+    return record['html'] if record else None
 
 async def extract_links_from_search(symbol: str) -> List[str]:
     """Fetches article links from search pages in parallel."""
@@ -144,69 +181,97 @@ async def extract_links_from_search(symbol: str) -> List[str]:
     return article_urls
 
 async def process_article(url: str, date_threshold: datetime) -> Optional[Dict]:
-    """Downloads and parses a single article using Newspaper3k (Sync library running in thread)."""
-    # Newspaper3k is synchronous. To keep async loop unblocked, we *could* run it in a thread,
-    # but concurrent.futures within asyncio is a bit much.
-    # For now, we will just call it. Since we are parallelizing the *main* steps, optimization is mixed.
-    # HOWEVER, Newspaper3k does network I/O.
-    # Better approach: Use aiohttp to fetch HTML, then pass to Newspaper3k just for parsing.
-    
+    """
+    Returns the article's extraction from the store, fetching (conditionally) and
+    parsing with Newspaper3k in the parse pool only when it is missing or changed.
+    """
     try:
-        # Hybrid approach: Use Article just for parsing if possible, or just let it download.
-        # Given complexity, we'll wrap the blocking call in to_thread.
-        
-        def blocking_parse():
-            if Article is None:
+        if Article is None:
+            return None
+
+        record = await _in_store(article_store.get, url)
+        fresh = record and record['parsed'] and time.time() - record['checked_at'] < NEWS_ARTICLE_MAX_AGE_HOURS * 3600
+        if not fresh:
+            record = await fetch_page(url)
+            if not record or not record['html']:
                 return None
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-                return article
-            except Exception:
+
+        if not record['parsed']:
+            html = record['html']
+
+            def blocking_parse():
+                try:
+                    article = Article(url)
+                    article.download(input_html=html)
+                    article.parse()
+                    return article
+                except Exception:
+                    return None
+
+            article = await asyncio.get_running_loop().run_in_executor(_parse_pool, blocking_parse)
+            if not article:
                 return None
+            record = await _in_store(article_store.save_parsed, url, article.title, article.text, article.publish_date)
 
-        article = await asyncio.to_thread(blocking_parse)
-        
-        if not article:
-            return None
-            
-        pub_date = article.publish_date
+        story_id = await _in_store(article_store.assign_story, url, record['title'], record['body'])
+
+        pub_date = record['published_at']
         if pub_date:
             if pub_date.replace(tzinfo=None) < date_threshold:
                 return None
         
         return {
-            'title': article.title,
-            'summary': article.text[:300] if article.text else "No content",
+            'url': url,
+            'story_id': story_id,
+            'title': record['title'],
+            'summary': record['body'][:300] if record['body'] else "No content",
             'date': pub_date.strftime('%Y-%m-%d') if pub_date else "Recent"
         }
     except Exception:
         return None
 
+def dedupe_stories(symbol: str, articles: List[Optional[Dict]]) -> List[Dict]:
+    """
+    Keeps the first article of each story and attaches `symbol` to it in the
+    store. Blocking; collect_stock_articles runs it on the store thread.
+    """
+    unique, seen = [], set()
+    for art in articles:
+        if not art:
+            continue
+        story_id = art.get('story_id')
+        if story_id:
+            if story_id in seen:
+                continue
+            seen.add(story_id)
+            article_store.attach_ticker(story_id, symbol)
+        unique.append(art)
+    return unique
+
+
+async def collect_stock_articles(symbol: str) -> Optional[List[Dict]]:
+    """Recent unique stories for `symbol` (None when the search pages had no links)."""
+    date_threshold = datetime.now() - timedelta(days=LOOKBACK_DAYS)
+
+    # 1. Fetch Links (Parallel)
+    article_urls = await extract_links_from_search(symbol)
+    if not article_urls:
+        return None
+
+    # 2. Fetch Articles (Parallel; limit to 5)
+    tasks = [process_article(url, date_threshold) for url in article_urls[:5]]
+    results = await asyncio.gather(*tasks)
+    return await _in_store(dedupe_stories, symbol, results)
+
+
 async def async_scrape_stock_run(symbol: str) -> str:
     """Main async logic for scraping stock news."""
     try:
-        date_threshold = datetime.now() - timedelta(days=LOOKBACK_DAYS)
-        
-        # 1. Fetch Links (Parallel)
-        article_urls = await extract_links_from_search(symbol)
+        articles = await collect_stock_articles(symbol)
         
-        if not article_urls:
+        if articles is None:
             return f"No recent news found for {symbol}."
         
-        # 2. Fetch Articles (Parallel using threads)
-        # Limit to 5 articles
-        # process_article ALREADY uses to_thread internally, effectively.
-        # But we previously defined process_article to take 'url' and use Article.
-        # We can just call it directly.
-        
-        tasks = [process_article(url, date_threshold) for url in article_urls[:5]]
-        results = await asyncio.gather(*tasks)
-        
-        # Filter None
-        articles = [r for r in results if r]
-        
         if not articles:
             return f"No relevant news found for {symbol} in last {LOOKBACK_DAYS} days."
         
@@ -235,15 +300,37 @@ def scrape_stock_news(symbol: str) -> str:
     Returns:
         Analysis-ready text of recent news articles.
     """
-    # Create a new event loop for this thread if strictly necessary, 
-    # but asyncio.run() creates one.
+    # Runs on the shared client's loop thread, so pooled connections are reused across calls
+    return news_http.run(async_scrape_stock_run(symbol))
+
+
+@tool("Search News Archive")
+def search_news_archive(query: str = "", ticker: str = "", days: int = 30) -> str:
+    """
+    Searches every news article already collected by the scrapers (local
+    full-text index, no network). Use it before scraping to see past coverage.
+
+    Args:
+        query: Keywords (all must match; "OR" between words for either), e.g. "repo rate OR inflation"
+        ticker: Optional stock symbol to restrict to, e.g. "TCS.NS"
+        days: How far back to look (default 30)
+
+    Returns:
+        Matching stories with date, tickers and summary.
+    """
     try:
-        return asyncio.run(async_scrape_stock_run(symbol))
-    except RuntimeError:
-        # If loop is already running (e.g. inside another async env), we need to handle it.
-        # Streamlit doesn't run a loop by default in the script thread.
-        # But if we are called from an Executor, it's fine.
-        # Fallback: Just create a loop.
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(async_scrape_stock_run(symbol))
+        since = (datetime.now() - timedelta(days=int(days))).date()
+        hits = article_store.search(query=query, ticker=ticker or None, since=since, limit=10)
+        scope = " ".join(part for part in (ticker, f'"{query}"' if query else "") if part) or "all news"
+        if not hits:
+            return f"No archived news for {scope} in the last {days} days."
+
+        output = f"🗄️ **News Archive** ({len(hits)} stories for {scope}, last {days} days):\n\n"
+        for i, hit in enumerate(hits, 1):
+            when = hit['published_at'].strftime('%Y-%m-%d') if hit['published_at'] else "Undated"
+            tickers = f" [{', '.join(hit['tickers'])}]" if hit['tickers'] else ""
+            output += f"{i}. {hit['title']} ({when}){tickers}\n   {hit['summary']}\n\n"
+        return output
+    except Exception as e:
+        logger.error(f"News archive search failed: {e}")
+        return f"Error searching news archive: {str(e)}"
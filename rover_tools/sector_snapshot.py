@@ -0,0 +1,70 @@
+"""
+Sector Flow Snapshot - Shared sector rotation view.
+
+The sector rotation table is identical for every user, so it is derived from
+the process-wide market snapshot (utils.market_snapshot), which downloads the
+sector indices and the Nifty 50 in the same batch as every other index. The
+table is recomputed only when that snapshot has refreshed, so it follows the
+snapshot's scheduled refresher (market-hours aware, never on the request
+path) instead of running a download or thread of its own.
+"""
+import threading
+
+from utils.logger import get_logger
+from utils.market_snapshot import market_snapshot
+
+logger = get_logger(__name__)
+
+
+def _compute_sector_flow(closes):
+    # Resolved at call time so the snapshot always uses the current implementation
+    from rover_tools import shadow_tools
+    return shadow_tools.analyze_sector_flow(closes)
+
+
+class SectorFlowSnapshot:
+    """
+    Thread-safe sector rotation table derived from a MarketSnapshot. A failed
+    computation keeps the previous table until the closes refresh again.
+    """
+
+    def __init__(self, source=market_snapshot, compute=_compute_sector_flow):
+        self.source = source
+        self.compute = compute
+        self._df = None
+        self._closes = None  # Source frame the table was computed from
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns a copy of the latest table (None when no sector data has been available)."""
+        closes = self.source.frame()
+        with self._lock:
+            # The snapshot swaps in a new frame on every successful refresh
+            if closes is not self._closes and not closes.empty:
+                self._closes = closes
+                try:
+                    df = self.compute(closes)
+                except Exception as e:
+                    logger.error(f"Sector snapshot computation failed: {e}")
+                    df = None
+                if df is not None and not df.empty:
+                    self._df = df
+                else:
+                    logger.warning("Sector snapshot computation returned no data; serving previous table.")
+            df = self._df
+        return df.copy() if df is not None else None
+
+    def reset(self):
+        """Drops the cached table (used by tests)."""
+        with self._lock:
+            self._df = None
+            self._closes = None
+
+
+# Global singleton shared by the Streamlit tabs, CrewAI tools and the API nodes
+sector_flow_snapshot = SectorFlowSnapshot()
+
+
+def get_sector_flow_snapshot():
+    """Latest sector rotation DataFrame (see `analyze_sector_flow` for columns)."""
+    return sector_flow_snapshot.get()
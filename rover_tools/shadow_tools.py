@@ -16,6 +16,7 @@ except ImportError:
 
 from rover_tools.ticker_resources import NIFTY_50_SECTOR_MAP
 from utils.logger import get_logger
+from utils.market_snapshot import HORIZON_SESSIONS, change_over, market_snapshot
 try:
     from crewai.tools import tool
 except ImportError:
@@ -28,36 +29,52 @@ except ImportError:
 logger = get_logger(__name__)
 
 # --- 1. THE SPIDER WEB (Sector Rotation) ---
-def analyze_sector_flow():
+# Every index here (and the benchmark) is part of the shared market snapshot
+SECTOR_INDICES = {
+    "Nifty Bank": "^NSEBANK",
+    "Nifty Auto": "^CNXAUTO",
+    "Nifty IT": "^CNXIT",
+    "Nifty Metal": "^CNXMETAL",
+    "Nifty Pharma": "^CNXPHARMA",
+    "Nifty FMCG": "^CNXFMCG",
+    "Nifty Energy": "^CNXENERGY",
+    "Nifty Infra": "^CNXINFRA",
+    "Nifty Realty": "^CNXREALTY",
+    "Nifty PSU Bank": "^CNXPSUBANK"
+}
+SECTOR_BENCHMARK = "^NSEI"
+
+# Trading-day lookbacks for the multi-horizon relative strength metrics
+def _horizon_returns(series):
+    """Returns % change over 1D / 1W / 1M / 3M (full window) for a close series."""
+    out = {label: change_over(series, sessions) for label, sessions in HORIZON_SESSIONS.items()}
+    out["3M"] = change_over(series, len(series))
+    return out
+
+
+def analyze_sector_flow(closes: pd.DataFrame = None):
     """
     Analyzes relative strength of major sectors to detect rotation.
-    Returns a DataFrame with 1W, 1M performance and Relative Strength Ranking.
+    Returns a DataFrame with 1D/1W/1M/3M performance, relative strength versus
+    the Nifty 50 on each horizon, and a Momentum Ranking.
+
+    `closes` holds ~3 months of daily closes, one column per index; by default
+    they come from the shared market snapshot (one download for every index).
     """
-    sectors = {
-        "Nifty Bank": "^NSEBANK",
-        "Nifty Auto": "^CNXAUTO",
-        "Nifty IT": "^CNXIT",
-        "Nifty Metal": "^CNXMETAL",
-        "Nifty Pharma": "^CNXPHARMA",
-        "Nifty FMCG": "^CNXFMCG",
-        "Nifty Energy": "^CNXENERGY",
-        "Nifty Infra": "^CNXINFRA",
-        "Nifty Realty": "^CNXREALTY",
-        "Nifty PSU Bank": "^CNXPSUBANK"
-    }
-    
     results = []
     
     try:
-        # Fetch last 30 days of data for all sectors
-        tickers = list(sectors.values())
-        data = yf.download(tickers, period="1mo", progress=False)['Close']
+        data = market_snapshot.frame() if closes is None else closes
         
         if data.empty:
             logger.error("No sector data fetched")
             return pd.DataFrame()
 
-        for name, ticker in sectors.items():
+        bench = None
+        if SECTOR_BENCHMARK in data.columns and not data[SECTOR_BENCHMARK].dropna().empty:
+            bench = _horizon_returns(data[SECTOR_BENCHMARK].dropna())
+
+        for name, ticker in SECTOR_INDICES.items():
             if ticker not in data.columns:
                 continue
                 
@@ -65,23 +82,24 @@ def analyze_sector_flow():
             if series.empty:
                 continue
                 
-            current_price = series.iloc[-1]
-            week_ago = series.iloc[-5] if len(series) >= 5 else series.iloc[0]
-            month_ago = series.iloc[0]
-            
-            pct_1w = ((current_price - week_ago) / week_ago) * 100
-            pct_1m = ((current_price - month_ago) / month_ago) * 100
+            perf = _horizon_returns(series)
             
             # Simple Momentum Score
-            momentum = (pct_1w * 0.4) + (pct_1m * 0.6)
+            momentum = (perf["1W"] * 0.4) + (perf["1M"] * 0.6)
             
-            results.append({
+            row = {
                 "Sector": name,
                 "Ticker": ticker,
-                "1W %": round(pct_1w, 2),
-                "1M %": round(pct_1m, 2),
+                "1D %": round(perf["1D"], 2),
+                "1W %": round(perf["1W"], 2),
+                "1M %": round(perf["1M"], 2),
+                "3M %": round(perf["3M"], 2),
                 "Momentum Score": round(momentum, 2)
-            })
+            }
+            # Relative strength = sector return minus Nifty 50 return on the same horizon
+            for label in ("1W", "1M", "3M"):
+                row[f"RS {label}"] = round(perf[label] - bench[label], 2) if bench else np.nan
+            results.append(row)
             
         df = pd.DataFrame(results).sort_values(by="Momentum Score", ascending=False)
         df = df.reset_index(drop=True)
@@ -344,14 +362,8 @@ def get_trap_indicator():
 # WRAPPER TOOLS FOR AGENTS (Decorated for CrewAI)
 # ==============================================================================
 
-@tool("Analyze Sector Flow")
-def analyze_sector_flow_tool() -> str:
-    """
-    Analyzes relative strength of major sectors (Bank, Auto, IT, etc.) to detect rotation.
-    Returns a text summary of top performing sectors and their momentum.
-    """
-    df = analyze_sector_flow()
-    
+def format_sector_flow_report(df) -> str:
+    """Renders the sector rotation DataFrame as the agent-facing text summary."""
     if df is None:
         return "⚠️ Connection Error: Unable to fetch sector data."
         
@@ -364,10 +376,23 @@ def analyze_sector_flow_tool() -> str:
     top = df.head(3)
     output += "Top Sectors (Inflow):\n"
     for _, row in top.iterrows():
-        output += f"- {row['Sector']}: Momentum {row['Momentum Score']}, 1W: {row['1W %']}%\n"
+        output += f"- {row['Sector']}: Momentum {row['Momentum Score']}, 1W: {row['1W %']}%"
+        if pd.notna(row.get('RS 1M', np.nan)):
+            output += f", RS 1M vs Nifty: {row['RS 1M']}%"
+        output += "\n"
         
     return output
 
+@tool("Analyze Sector Flow")
+def analyze_sector_flow_tool() -> str:
+    """
+    Analyzes relative strength of major sectors (Bank, Auto, IT, etc.) to detect rotation.
+    Returns a text summary of top performing sectors and their momentum.
+    """
+    # Served from the shared, periodically refreshed snapshot (identical for every caller)
+    from rover_tools.sector_snapshot import get_sector_flow_snapshot
+    return format_sector_flow_report(get_sector_flow_snapshot())
+
 @tool("Fetch Block Deals")
 def fetch_block_deals_tool(symbol: str = None) -> str:
     """
@@ -52,7 +52,7 @@ def main():
         result = crew.run()
         
         logger.info("✅ Training Run Complete.")
-        logger.info("Predictions have been saved to memory.json")
+        logger.info("Predictions have been saved to the prediction ledger")
         logger.info("Run 'python scripts/validate_outcomes.py' after 3-7 days to close the loop.")
         
     except Exception as e:
@@ -1,7 +1,7 @@
 """
 Outcome Validator - The Learning Feedback Loop.
 
-This script audits the 'Agent Brain' (memory.json) to check if past predictions were correct.
+This script audits the 'Agent Brain' (prediction ledger) to check if past predictions were correct.
 It compares the 'Signal' (Buy/Sell) against actual price movement over the next 5-7 days using Yahoo Finance.
 
 Usage:
@@ -9,7 +9,6 @@ Usage:
 """
 import sys
 import os
-import json
 import yfinance as yf
 from datetime import datetime, timedelta
 from dateutil import parser
@@ -18,7 +17,7 @@ import pandas as pd
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.logger import get_logger
-from rover_tools.memory_tool import read_memory, write_memory
+from utils.prediction_ledger import prediction_ledger
 
 logger = get_logger(__name__)
 
@@ -87,25 +86,19 @@ def validate_prediction(signal: str, pct_change: float):
 def main():
     logger.info("🧠 Starting Outcome Validation (Learning Cycle)...")
     
-    memory = read_memory()
-    if not memory:
+    # Only validate Pending items older than 3 days
+    pending = prediction_ledger.pending(datetime.now().date() - timedelta(days=3))
+    if not pending:
         logger.info("No memories to validate.")
         return
 
     updated_count = 0
     
-    for entry in memory:
-        # Only validate Pending items older than 3 days
-        if entry.get('outcome') != 'Pending':
-            continue
-            
+    for entry in pending:
         pred_date_str = entry['date']
         pred_date = parser.parse(pred_date_str).date()
         days_passed = (datetime.now().date() - pred_date).days
         
-        if days_passed < 3:
-            continue # Too early to judge
-            
         logger.info(f"Validating {entry['ticker']} from {pred_date_str} ({days_passed} days ago)...")
         
         pct = get_price_change(entry['ticker'], pred_date_str)
@@ -113,17 +106,15 @@ def main():
         if pct is not None:
             result = validate_prediction(entry['signal'], pct)
             if result != "Skipped":
-                entry['outcome'] = f"{result} ({pct:+.2f}%)"
-                updated_count += 1
-                logger.info(f" -> Result: {entry['outcome']}")
+                outcome = f"{result} ({pct:+.2f}%)"
+                logger.info(f" -> Result: {outcome}")
             else:
-                 entry['outcome'] = f"Neutral ({pct:+.2f}%)" # Mark as closed even if neutral
-                 updated_count += 1
+                 outcome = f"Neutral ({pct:+.2f}%)" # Mark as closed even if neutral
+            updated_count += prediction_ledger.set_outcome(entry['id'], outcome)
         else:
             logger.warning(" -> No price data available.")
 
     if updated_count > 0:
-        write_memory(memory)
         logger.info(f"✅ Learning Complete. Updated {updated_count} memories.")
     else:
         logger.info("No memories required updates.")
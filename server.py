@@ -23,6 +23,7 @@ load_dotenv()
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 
@@ -35,6 +36,7 @@ for p in [REPO_ROOT, REPO_ROOT / "market_rover" / "backend"]:
 
 # 1. Import Market Rover Router
 from src.routes import router as market_router
+from src.utils.background_workers import start_background_workers, stop_background_workers
 
 # 2. Import Pledge Rover Router
 from pledge_rover.backend.src.routes import api_router as pledge_router
@@ -56,8 +58,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Compress JSON chart/heatmap payloads; tiny responses are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Mount satellite backend API sub-routers
 app.include_router(market_router, prefix="/api/v1/market")
 app.include_router(pledge_router, prefix="/api/v1/pledge")
@@ -66,6 +72,14 @@ app.include_router(ownerise_router, prefix="/api/v1/ownerise")
 # --- Legacy & Root Route Compatibility ---
 app.include_router(market_router, prefix="/api")
 
+@app.on_event("startup")
+async def start_background_refreshers():
+    start_background_workers()
+
+@app.on_event("shutdown")
+async def stop_background_refreshers():
+    await stop_background_workers()
+
 @app.get("/health")
 async def health_check():
     """Unified health check endpoint."""
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from rover_tools.memory_tool import read_memory
+from rover_tools.memory_tool import memory_stats, read_memory
 from utils.autonomy_logger import read_autonomy_events
 
 # ============================================================
@@ -283,18 +283,15 @@ def show_brain_tab():
 
             st.dataframe(df_mem, use_container_width=True, hide_index=True)
 
-            if not df_mem.empty and 'outcome' in df_mem.columns:
-                completed = df_mem[df_mem['outcome'] != 'Pending']
-                total_completed = len(completed)
+            # Counted over the whole ledger in SQL, not from the displayed rows
+            stats = memory_stats()
+            if stats['validated'] > 0:
+                win_rate = (stats['wins'] / stats['validated']) * 100
 
-                if total_completed > 0:
-                    wins = len(completed[completed['outcome'].str.contains('Success')])
-                    win_rate = (wins / total_completed) * 100
-
-                    m1c, m2c, m3c = st.columns(3)
-                    m1c.metric("Total Predictions", len(df_mem))
-                    m2c.metric("Validated Outcomes", total_completed)
-                    m3c.metric("🎯 Win Rate", f"{win_rate:.1f}%")
+                m1c, m2c, m3c = st.columns(3)
+                m1c.metric("Total Predictions", stats['total'])
+                m2c.metric("Validated Outcomes", stats['validated'])
+                m3c.metric("🎯 Win Rate", f"{win_rate:.1f}%")
 
     # --- 2. AUTONOMY STREAM ---
     with col2:
@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
 from rover_tools.shadow_tools import (
-    analyze_sector_flow, fetch_block_deals, 
+    fetch_block_deals, 
     detect_silent_accumulation, get_trap_indicator,
     get_sector_stocks_accumulation
 )
+from rover_tools.sector_snapshot import sector_flow_snapshot
+from utils.market_snapshot import market_snapshot
 from rover_tools.ticker_resources import get_common_tickers, NIFTY_50_SECTOR_MAP
 from utils.portfolio_manager import PortfolioManager
 
@@ -29,7 +31,9 @@ def show_shadow_tracker_tab():
             st.caption("Identify sectors where institutional money is secretly rotating.")
             
             with st.spinner("Analyzing Sector Shifts..."):
-                sector_df = analyze_sector_flow()
+                # Derived from the shared market snapshot, refreshed in the background
+                market_snapshot.start()
+                sector_df = sector_flow_snapshot.get()
                 
                 if sector_df is None:
                      st.warning("⚠️ Connection Error: Unable to fetch sector data.")
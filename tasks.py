@@ -65,19 +65,37 @@ def create_market_strategy_task(agent, context):
     )
 
 
-def create_sentiment_analysis_task(agent, context):
+# Per-stock crews run before the strategy task, so they get the regime from the VIX
+# snapshot (crew_engine.market_regime) as {market_regime} instead of the Strategic Report
+STOCK_REGIME_BRIEF = dedent("""
+    **REGIME**: {market_regime}
+    (Read from the VIX snapshot before the per-stock crews run; there is no Strategic Report for this stock.)
+""")
+
+
+def create_sentiment_analysis_task(agent, context, output_file="logs/task3_sentiment.txt", per_stock=False):
     """
     Task 3: Analyze sentiment (Fear/Greed).
+    With per_stock, the regime comes from {market_regime} rather than the Strategy task.
     """
-    return Task(
-        description=dedent("""
+    if per_stock:
+        brief = STOCK_REGIME_BRIEF + dedent("""
+            Classify the sentiment for this stock.
+        """)
+    else:
+        brief = dedent("""
             Analyze the Strategic Report from the previous task.
             Classify the sentiment for each stock and the overall market.
-
+        """)
+    return Task(
+        description=brief + dedent("""
             **Critically**: Identify where the sentiment is 'Extreme' (Panic or Euphoria).
             Look for the 'REGIME' flag. If REGIME is DEFENSIVE, 'Fear' is the baseline, essentially ignore minor bad news.
             This output will be used by the Shadow Analyst to detect Traps.
 
+            **PRE-FETCHED STOCK RESEARCH** (gathered per stock in parallel; use it before re-calling tools):
+            {stock_research}
+
             **CONTEXTUAL REFLECTION**:
             - **Nuance Check**: "Profit Down 10%" is bad. But "Profit Down 10% (Expected 20%)" is GOOD. Did you catch the beat/miss context?
             - **Hype Filter**: Is the news just a press release? If so, discount the 'Positive' score.
@@ -86,17 +104,18 @@ def create_sentiment_analysis_task(agent, context):
         agent=agent,
         context=context, # Depends on Strategy Task
         async_execution=True,
-        output_file="logs/task3_sentiment.txt",
+        output_file=output_file,
         expected_output="Sentiment classification with 'Extreme Sentiment' flags."
     )
 
 
-def create_technical_analysis_task(agent, context):
+def create_technical_analysis_task(agent, context, output_file="logs/task4_technical.txt", per_stock=False):
     """
     Task 4: Technical Analysis (Multi-Timeframe Concordance).
+    With per_stock, the regime comes from {market_regime} rather than the Strategy task.
     """
     return Task(
-        description=dedent("""
+        description=(STOCK_REGIME_BRIEF if per_stock else "") + dedent("""
             Analyze the Technical structure of the market using 'Concordance Scanning':
 
             **DYNAMIC TOOL USAGE & REGIME ADAPTATION**:
@@ -117,16 +136,19 @@ def create_technical_analysis_task(agent, context):
             - Price below POC = Institutional distribution.
 
             **Actionable Output**: Filter out 'Retail Breakouts' that lack volume support.
+
+            **PRE-FETCHED STOCK RESEARCH** (gathered per stock in parallel; use it before re-calling tools):
+            {stock_research}
         """),
         agent=agent,
         context=context,
         async_execution=True,
-        output_file="logs/task4_technical.txt",
+        output_file=output_file,
         expected_output="Technical report with MTC status and Volume POC levels."
     )
 
 
-def create_shadow_analysis_task(agent, context):
+def create_shadow_analysis_task(agent, context, output_file="logs/task5_shadow.txt"):
     """
     Task 5: Shadow Analysis (The Forensic Fingerprint).
     """
@@ -144,10 +166,13 @@ def create_shadow_analysis_task(agent, context):
             **MEMORIZE**: Use `save_prediction_tool` to store your final forensic stance.
 
             **Mission**: Distinguish between 'Retail Noise' and 'Institutional Intent'.
+
+            **PRE-FETCHED STOCK RESEARCH** (gathered per stock in parallel; use it before re-calling tools):
+            {stock_research}
         """),
         agent=agent,
         context=context,
-        output_file="logs/task5_shadow.txt",
+        output_file=output_file,
         expected_output="Forensic report identifying Institutional Absorption and Gamma Traps."
     )
 
@@ -207,6 +232,9 @@ def create_report_generation_task(agent, context):
                 - **JSON Check**: Did I include the JSON block at the end? is it Valid JSON (no trailing commas)?
                 - **Consistency**: Did I mention a 'Sell' signal for a stock that I earlier said has 'Positive News'? Resolve conflicts.
             Step 4: Output the Final Report with the strict JSON block.
+
+            **PER-STOCK ANALYSIS** (sentiment, technicals and shadow signals, one section per stock):
+            {stock_research}
         """),
         agent=agent,
         context=context, # Depends on ALL previous analysis
@@ -266,3 +294,24 @@ class TaskFactory:
         )
 
         return [task1, task2, task3, task4, task5, task_traditional, task6]
+
+    @staticmethod
+    def create_stock_tasks(agents, symbol):
+        """Sentiment, technical and shadow analysis of one stock (run as that stock's own crew, fed {market_regime})."""
+        logs = f"logs/stocks/{symbol}"
+        sentiment = create_sentiment_analysis_task(
+            agents['sentiment_analyzer'], context=None, output_file=f"{logs}/sentiment.txt", per_stock=True)
+        technical = create_technical_analysis_task(
+            agents['market_context'], context=None, output_file=f"{logs}/technical.txt", per_stock=True)
+        shadow = create_shadow_analysis_task(
+            agents['shadow_analyst'], context=[sentiment, technical], output_file=f"{logs}/shadow.txt")
+        return [sentiment, technical, shadow]
+
+    @staticmethod
+    def create_synthesis_tasks(agents):
+        """Portfolio-level tasks that run after the per-stock crews, fed their output as {stock_research}."""
+        task1 = create_portfolio_retrieval_task(agents['portfolio_manager'])
+        task2 = create_market_strategy_task(agents['news_scraper'], context=[task1])
+        task_traditional = create_traditional_timing_task(agents['traditional_timing'], context=[task1, task2])
+        report = create_report_generation_task(agents['report_generator'], context=[task2, task_traditional])
+        return [task1, task2, task_traditional, report]
@@ -0,0 +1,50 @@
+"""
+Cold-start import benchmark for the unified API server.
+
+Scale-from-zero latency is dominated by `import server`. These tests run the
+import in a fresh interpreter so regressions (an eager CrewAI / LangGraph /
+yfinance import creeping back into a router) show up in CI.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Must only load on first use (graph warm-up, audits, analytics jobs)
+HEAVY_MODULES = ["crewai", "langgraph", "langchain_google_genai", "yfinance", "matplotlib"]
+
+# Generous ceiling for slow CI runners; tighten locally with IMPORT_TIME_BUDGET_S
+IMPORT_TIME_BUDGET_S = float(os.getenv("IMPORT_TIME_BUDGET_S", "6.0"))
+
+_PROBE = (
+    "import json, sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "import server\n"
+    "elapsed = time.perf_counter() - t0\n"
+    f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print(json.dumps({'seconds': elapsed, 'heavy': heavy}))\n"
+)
+
+
+def _cold_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=REPO_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert out.returncode == 0, out.stderr[-2000:]
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_server_import_skips_heavy_modules():
+    assert _cold_import()["heavy"] == []
+
+
+@pytest.mark.benchmark(group="cold_start")
+def test_server_import_time(benchmark):
+    """Benchmark `import server` in a fresh interpreter."""
+    result = benchmark.pedantic(_cold_import, rounds=3, iterations=1)
+    assert result["seconds"] < IMPORT_TIME_BUDGET_S
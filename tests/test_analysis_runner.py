@@ -206,3 +206,38 @@ def test_run_analysis_runtime_error_in_thread(
     args, _ = mock_streamlit.session_state.job_manager.fail_job.call_args
     assert args[0] == job_id
     assert "Model Overload/Timeout" in str(args[1])
+
+def test_run_analysis_renders_crew_progress_events(
+    mock_streamlit, mock_crew, mock_thread, mock_visualizer,
+    mock_market_analyzer, mock_shadow_tools, sample_portfolio
+):
+    job_id = "job_progress"
+    mock_streamlit.session_state.job_manager.create_job.return_value = job_id
+
+    def run_with_progress(stocks=None):
+        callback = mock_crew.call_args.kwargs['progress_callback']
+        callback(15.0, 'RELIANCE.NS', 'completed')
+        callback(30.0, 'TCS.NS', 'completed')
+        callback(50.0, 'RELIANCE.NS', 'analyzed')
+        callback(70.0, 'TCS.NS', 'analysis_failed')
+        callback(100.0, 'Report Generator', 'task_completed')
+        return "Analysis Report Content"
+
+    mock_crew.return_value.run.side_effect = run_with_progress
+
+    with patch('builtins.open', new_callable=MagicMock):
+        with patch('utils.analysis_runner.logger'):
+            run_analysis(sample_portfolio, "portfolio.csv", max_parallel=2)
+
+    progress_calls = mock_streamlit.session_state.job_manager.update_progress.call_args_list
+    assert [c.args for c in progress_calls] == [
+        (job_id, 23, 'RELIANCE.NS'), (job_id, 36, 'TCS.NS'),
+        (job_id, 54, 'RELIANCE.NS'), (job_id, 72, 'TCS.NS'), (job_id, 99, 'Report Generator'),
+    ]
+    # Research and per-stock analysis are counted separately, each up to the portfolio size
+    texts = [c.args[0] for c in mock_streamlit.empty.return_value.markdown.call_args_list]
+    assert texts[:4] == [
+        "**Per-stock research:** 1/2 stocks", "**Per-stock research:** 2/2 stocks",
+        "**Per-stock analysis:** 1/2 stocks", "**Per-stock analysis:** 2/2 stocks",
+    ]
+    mock_streamlit.session_state.job_manager.complete_job.assert_called_with(job_id, "Analysis Report Content")
@@ -0,0 +1,242 @@
+"""Tests for the local article store and the scraper's conditional re-fetch path."""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from rover_tools import news_scraper_tool
+from utils.article_store import ArticleStore, canonical_url, conditional_headers
+from utils.async_http import HttpResponse
+
+URL = "https://www.moneycontrol.com/news/business/tcs-q2-results-123.html"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArticleStore(tmp_path / "news_store.sqlite")
+
+
+def test_canonical_url_drops_noise():
+    assert canonical_url("HTTPS://WWW.Moneycontrol.com/news/a.html/?utm_source=x&b=2&a=1#top") == \
+        "https://www.moneycontrol.com/news/a.html?a=1&b=2"
+
+
+def test_page_round_trip_and_validators(store):
+    assert conditional_headers(store.get(URL)) == {}
+    store.save_page(URL, "<html>v1</html>", etag='"abc"', last_modified="Mon, 19 Oct 2026 04:00:00 GMT")
+
+    record = store.get(URL + "?utm_medium=feed")
+    assert record['html'] == "<html>v1</html>"
+    assert conditional_headers(record) == {
+        'If-None-Match': '"abc"', 'If-Modified-Since': "Mon, 19 Oct 2026 04:00:00 GMT",
+    }
+
+
+def test_extraction_survives_identical_body_but_not_a_changed_one(store):
+    published = datetime(2026, 10, 18, 9, 30)
+    store.save_page(URL, "<html>v1</html>", etag='"abc"')
+    store.save_parsed(URL, "TCS Q2", "Revenue up 8%", published)
+
+    record = store.save_page(URL, "<html>v1</html>", etag='"abc"')
+    assert record['parsed'] and record['title'] == "TCS Q2" and record['published_at'] == published
+
+    assert store.save_page(URL, "<html>v2</html>", etag='"def"')['parsed'] is False
+
+
+@pytest.fixture
+def scraper(store):
+    article = MagicMock(title="TCS Q2", text="Revenue up 8%", publish_date=datetime.now())
+    with patch.object(news_scraper_tool, 'article_store', store), \
+         patch.object(news_scraper_tool.news_http, 'get', new_callable=AsyncMock) as get, \
+         patch.object(news_scraper_tool, 'Article', return_value=article) as article_cls:
+        yield get, article_cls
+
+
+def _process(threshold_days=7):
+    threshold = datetime.now() - timedelta(days=threshold_days)
+    return asyncio.run(news_scraper_tool.process_article(URL, threshold))
+
+
+def test_article_is_parsed_once_and_served_from_store(scraper, store):
+    get, article_cls = scraper
+    get.return_value = HttpResponse(200, "<html>v1</html>", {'ETag': '"abc"'})
+
+    first = _process()
+    second = _process()
+
+    assert first == second and first['title'] == "TCS Q2"
+    assert get.await_count == 1  # Fresh parsed article: no request at all
+    article_cls.return_value.download.assert_called_once_with(input_html="<html>v1</html>")
+
+
+def test_stale_article_revalidates_with_conditional_request(scraper, store):
+    get, article_cls = scraper
+    get.return_value = HttpResponse(200, "<html>v1</html>", {'ETag': '"abc"'})
+    _process()
+    store.mark_checked(URL, now=0)  # Older than NEWS_ARTICLE_MAX_AGE_HOURS
+
+    get.return_value = HttpResponse(304, "", {})
+    assert _process()['title'] == "TCS Q2"
+    assert get.call_args.kwargs['headers'] == {'If-None-Match': '"abc"'}
+    assert article_cls.call_count == 1
+
+
+def test_search_page_falls_back_to_stored_copy_on_network_error(scraper, store):
+    get, _ = scraper
+    store.save_page(URL, "<html>cached</html>")
+    get.side_effect = OSError("connection reset")
+
+    assert asyncio.run(news_scraper_tool.fetch_url(URL)) == "<html>cached</html>"
+
+
+def test_store_calls_run_off_the_event_loop_thread(scraper, store):
+    get, _ = scraper
+    get.return_value = HttpResponse(200, "<html>v1</html>", {})
+    threads = []
+    real_get = store.get
+
+    def recording_get(url):
+        threads.append(threading.current_thread().name)
+        return real_get(url)
+
+    with patch.object(store, 'get', side_effect=recording_get):
+        _process()
+    assert threads and all(name.startswith("news-store") for name in threads)
+
+
+def test_prune_drops_old_and_excess_pages_with_their_stories(tmp_path):
+    store = ArticleStore(tmp_path / "news_store.sqlite", max_age_days=30, max_articles=2)
+    now = 100 * 86400.0
+    for i, age_days in enumerate((40, 3, 2, 1)):
+        url = f"https://www.moneycontrol.com/news/business/a-{i}.html"
+        store.save_page(url, f"<html>{i}</html>", now=now - age_days * 86400)
+        story = store.assign_story(url, f"Headline {i}", f"Body of story number {i} " * 5)
+        store.attach_ticker(story, "TCS.NS")
+
+    # Saves prune as they go: a-0 is past the age limit, a-1 is beyond the size cap
+    assert store.get("https://www.moneycontrol.com/news/business/a-0.html") is None
+    assert store.get("https://www.moneycontrol.com/news/business/a-1.html") is None
+    assert store.get("https://www.moneycontrol.com/news/business/a-3.html") is not None
+    db = store._db()
+    assert db.execute("SELECT count(*) FROM stories").fetchone()[0] == 2
+    assert db.execute("SELECT count(*) FROM story_tickers").fetchone()[0] == 2
+    assert store.prune(now=now) == 0
+
+
+BODY = ("The Reserve Bank of India kept the repo rate unchanged at 6.5 per cent on Friday and retained its "
+        "stance, citing sticky food inflation. Governor said growth remains robust while the central bank "
+        "will stay watchful of global commodity prices and the rupee. Banks and NBFCs rallied after the decision.")
+
+
+def test_near_duplicate_copies_share_a_story(store):
+    syndicated = "https://www.moneycontrol.com/news/economy/rbi-holds-rate-pti-456.html"
+    other = "https://www.moneycontrol.com/news/business/tcs-q2-results-789.html"
+
+    story = store.assign_story(URL, "RBI keeps repo rate unchanged", BODY)
+    assert story == canonical_url(URL)
+    assert store.assign_story(syndicated, "RBI keeps repo rate unchanged", BODY + " Sensex closed higher.") == story
+    assert store.assign_story(other, "TCS Q2 net profit rises 8%", "Tata Consultancy Services reported "
+                              "a rise in quarterly profit on strong deal wins in BFSI.") != story
+    assert store.assign_story(URL, "edited later", "different") == story  # Idempotent per URL
+
+
+def test_wordless_articles_are_never_merged(store):
+    hindi = "https://www.moneycontrol.com/hindi/news/rbi-1.html"
+    other = "https://www.moneycontrol.com/hindi/news/tcs-2.html"
+    assert store.assign_story(hindi, "आरबीआई ने रेपो दर स्थिर रखी", "") == canonical_url(hindi)
+    assert store.assign_story(other, "टीसीएस का मुनाफा बढ़ा", None) == canonical_url(other)
+    assert store.assign_story(URL, "", "") == canonical_url(URL)
+    # A worded article never lands on a wordless one's band keys either
+    assert store.assign_story("https://www.moneycontrol.com/news/a.html", "RBI", BODY) == \
+        canonical_url("https://www.moneycontrol.com/news/a.html")
+
+
+def test_story_collects_every_ticker_once(store):
+    story = store.assign_story(URL, "RBI keeps repo rate unchanged", BODY)
+    store.attach_ticker(story, "HDFCBANK.NS", now=1)
+    store.attach_ticker(story, "SBIN.NS", now=2)
+    store.attach_ticker(story, "HDFCBANK.NS", now=3)
+    assert store.story_tickers(story) == ["SBIN.NS", "HDFCBANK.NS"]
+
+
+def test_stock_scrape_collapses_near_duplicates(scraper, store):
+    dup_url = "https://www.moneycontrol.com/news/economy/rbi-holds-rate-pti-456.html"
+    with patch.object(news_scraper_tool, 'extract_links_from_search', new_callable=AsyncMock) as links, \
+         patch.object(news_scraper_tool, 'process_article', new_callable=AsyncMock) as process:
+        links.return_value = [URL, dup_url]
+        process.side_effect = [
+            {'url': URL, 'story_id': "rbi", 'title': "RBI holds", 'summary': "s", 'date': "Recent"},
+            {'url': dup_url, 'story_id': "rbi", 'title': "RBI holds (PTI)", 'summary': "s", 'date': "Recent"},
+        ]
+        result = asyncio.run(news_scraper_tool.async_scrape_stock_run("SBIN.NS"))
+
+    assert "Found 1 articles for SBIN.NS" in result and "(PTI)" not in result
+    assert store.story_tickers("rbi") == ["SBIN.NS"]
+
+
+def _archive(store, url, title, body, published, tickers):
+    store.save_page(url, f"<html>{title}</html>")
+    store.save_parsed(url, title, body, published)
+    story = store.assign_story(url, title, body)
+    for t in tickers:
+        store.attach_ticker(story, t)
+    return story
+
+
+@pytest.fixture
+def archive(store):
+    today = datetime.now().replace(microsecond=0)
+    _archive(store, URL, "TCS Q2 profit rises on deal wins", "Tata Consultancy Services reported higher margins.",
+             today, ["TCS.NS"])
+    _archive(store, "https://www.moneycontrol.com/news/economy/rbi-1.html", "RBI keeps repo rate unchanged", BODY,
+             today - timedelta(days=1), ["HDFCBANK.NS", "TCS"])
+    _archive(store, "https://www.moneycontrol.com/news/economy/rbi-pti-2.html", "RBI keeps repo rate unchanged",
+             BODY + " Sensex closed higher.", today - timedelta(days=1), ["SBIN.NS"])
+    _archive(store, "https://www.moneycontrol.com/news/business/infy-3.html", "Infosys cuts revenue guidance",
+             "Infosys trimmed its full-year outlook citing weak discretionary spending.",
+             today - timedelta(days=40), ["INFY.NS"])
+    return store
+
+
+def test_search_by_keyword_collapses_story_copies(archive):
+    hits = archive.search("repo rates")  # Porter stemming: "rates" matches "rate"
+    assert [h['title'] for h in hits] == ["RBI keeps repo rate unchanged"]
+    assert set(hits[0]['tickers']) == {"HDFCBANK.NS", "TCS", "SBIN.NS"}
+
+
+def test_search_by_ticker_ignores_suffix_and_case(archive):
+    titles = [h['title'] for h in archive.search(ticker="tcs")]
+    assert titles == ["TCS Q2 profit rises on deal wins", "RBI keeps repo rate unchanged"]  # Newest first
+
+
+def test_search_by_date_range_and_or_keywords(archive):
+    since = (datetime.now() - timedelta(days=30)).date()
+    assert [h['title'] for h in archive.search("guidance OR margins", since=since)] == \
+        ["TCS Q2 profit rises on deal wins"]
+    assert [h['title'] for h in archive.search(until=since)] == ["Infosys cuts revenue guidance"]
+    assert archive.search("!!!") == []
+
+
+def test_index_follows_reparsed_articles_and_backfills_old_stores(archive, tmp_path):
+    archive.save_page(URL, "<html>v2</html>")
+    archive.save_parsed(URL, "TCS Q2 profit falls", "Margins slipped on wage hikes.", datetime.now())
+    assert archive.search("deal wins") == []
+    assert archive.search("wage")[0]['title'] == "TCS Q2 profit falls"
+
+    # A store written before the FTS table existed is indexed on first open
+    archive._db().executescript("DROP TABLE articles_fts; DROP TRIGGER articles_fts_ai; "
+                                "DROP TRIGGER articles_fts_ad; DROP TRIGGER articles_fts_au;")
+    archive._conn.close()
+    assert ArticleStore(archive.path).search("wage")[0]['title'] == "TCS Q2 profit falls"
+
+
+def test_archive_tool_formats_hits(archive):
+    with patch.object(news_scraper_tool, 'article_store', archive):
+        result = news_scraper_tool.search_news_archive.run(query="repo", ticker="SBIN.NS", days=7)
+        empty = news_scraper_tool.search_news_archive.run(query="guidance", days=7)
+
+    assert "1 stories for SBIN.NS \"repo\"" in result
+    assert "RBI keeps repo rate unchanged" in result and "HDFCBANK.NS" in result
+    assert empty == 'No archived news for "guidance" in the last 7 days.'
@@ -0,0 +1,91 @@
+"""Tests for the process-wide pooled async HTTP client."""
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+
+from utils.async_http import PooledHttpClient
+
+
+@pytest.fixture
+def served():
+    """A pooled client plus a local aiohttp server running on the client's own loop."""
+    client = PooledHttpClient(limit=10, limit_per_host=2, timeout=5, headers={'User-Agent': 'rover-test'})
+    stats = {'peers': [], 'active': 0, 'peak': 0, 'agents': set()}
+
+    async def page(request):
+        stats['peers'].append(request.transport.get_extra_info('peername'))
+        stats['agents'].add(request.headers.get('User-Agent'))
+        stats['active'] += 1
+        stats['peak'] = max(stats['peak'], stats['active'])
+        await asyncio.sleep(0.05)
+        stats['active'] -= 1
+        return web.Response(text=f"ok {request.path}", headers={'ETag': '"v1"'})
+
+    async def start():
+        app = web.Application()
+        app.router.add_get('/{name}', page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        return runner, site._server.sockets[0].getsockname()[1]
+
+    runner, port = client.run(start())
+    yield client, f"http://127.0.0.1:{port}", stats
+    client.run(runner.cleanup())
+    client.close()
+
+
+def test_get_returns_status_text_and_headers(served):
+    client, base, stats = served
+    response = client.run(client.get(f"{base}/tcs"))
+    assert response.status == 200
+    assert response.text == "ok /tcs"
+    assert response.headers['ETag'] == '"v1"'
+    assert stats['agents'] == {'rover-test'}
+
+
+def test_connections_are_kept_alive_across_calls(served):
+    client, base, stats = served
+    client.run(client.get(f"{base}/a"))
+    client.run(client.get(f"{base}/b"))
+    assert len(stats['peers']) == 2
+    assert stats['peers'][0] == stats['peers'][1]
+
+
+def test_per_host_concurrency_is_limited(served):
+    client, base, stats = served
+
+    async def burst():
+        return await asyncio.gather(*(client.get(f"{base}/p{i}") for i in range(6)))
+
+    responses = client.run(burst())
+    assert [r.status for r in responses] == [200] * 6
+    assert stats['peak'] == 2
+
+
+def test_loop_is_shared_across_threads(served):
+    client, base, _ = served
+    loops = []
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    threads = [threading.Thread(target=lambda: loops.append(client.run(current_loop()))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(map(id, loops))) == 1 and loops[0] is client.loop
+
+
+def test_run_from_own_loop_is_rejected(served):
+    client, _, _ = served
+
+    async def nested():
+        client.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="own event loop"):
+        client.run(nested())
@@ -1,11 +1,16 @@
+import threading
+import pandas as pd
 import pytest
 from unittest.mock import MagicMock, patch
-from rover_tools.batch_tools import batch_get_stock_data, batch_scrape_news, batch_detect_accumulation
+from rover_tools.batch_tools import (
+    batch_get_stock_data, batch_scrape_news, batch_detect_accumulation, get_executor, run_in_parallel,
+)
 
 class TestBatchTools:
     
+    @patch('rover_tools.batch_tools.yf.download', return_value=pd.DataFrame())
     @patch('rover_tools.batch_tools.yf.Ticker')
-    def test_batch_get_stock_data_success(self, mock_ticker):
+    def test_batch_get_stock_data_success(self, mock_ticker, mock_download):
         # Setup mock return values
         mock_instance = MagicMock()
         mock_instance.fast_info.last_price = 2500.0
@@ -21,8 +26,9 @@ class TestBatchTools:
         assert "2500.00" in result
         assert "+4.17%" in result # (2500-2400)/2400 * 100
 
+    @patch('rover_tools.batch_tools.yf.download', return_value=pd.DataFrame())
     @patch('rover_tools.batch_tools.yf.Ticker')
-    def test_batch_get_stock_data_fallback(self, mock_ticker):
+    def test_batch_get_stock_data_fallback(self, mock_ticker, mock_download):
         # Test fallback when fast_info is None
         mock_instance = MagicMock()
         mock_instance.fast_info.last_price = None
@@ -39,9 +45,11 @@ class TestBatchTools:
         result = batch_get_stock_data.run("INFY.NS")
         assert "INFY.NS" in result
         
-    @patch('rover_tools.batch_tools.scrape_stock_news')
-    def test_batch_scrape_news(self, mock_tool):
-        mock_tool.run.return_value = "Mock news content for stock"
+    @patch('rover_tools.batch_tools.collect_stock_articles')
+    def test_batch_scrape_news(self, mock_collect):
+        async def collect(symbol):
+            return [{'story_id': f"s-{symbol}", 'title': f"{symbol} update", 'summary': "Mock news content for stock", 'date': "Recent"}]
+        mock_collect.side_effect = collect
         
         tickers = "RELIANCE.NS, TCS.NS"
         result = batch_scrape_news.run(tickers)
@@ -49,7 +57,26 @@ class TestBatchTools:
         assert "Batch News Report" in result
         assert "RELIANCE.NS" in result
         assert "Mock news content" in result
-        assert mock_tool.run.call_count == 2 # Called for each ticker
+        assert mock_collect.call_count == 2 # Called for each ticker
+
+    @patch('rover_tools.batch_tools.collect_stock_articles')
+    def test_batch_scrape_news_reports_shared_story_once(self, mock_collect):
+        shared = {'story_id': "rbi-policy", 'title': "RBI holds repo rate", 'summary': "Policy unchanged", 'date': "2026-10-19"}
+        own = {'story_id': "tcs-q2", 'title': "TCS Q2 beats", 'summary': "Margins up", 'date': "2026-10-19"}
+        articles = {'HDFCBANK.NS': [shared], 'TCS.NS': [own, shared], 'INFY.NS': []}
+
+        async def collect(symbol):
+            if symbol == "WIPRO.NS":
+                raise OSError("timeout")
+            return articles[symbol]
+        mock_collect.side_effect = collect
+
+        result = batch_scrape_news.run("HDFCBANK.NS, TCS.NS, INFY.NS, WIPRO.NS")
+
+        assert "(2 unique stories)" in result
+        assert result.count("Policy unchanged") == 1
+        assert "**RBI holds repo rate** (2026-10-19) — HDFCBANK.NS, TCS.NS" in result
+        assert "No recent news: INFY.NS, WIPRO.NS (error)" in result
 
     @patch('rover_tools.batch_tools.detect_silent_accumulation')
     def test_batch_shadow_scan(self, mock_detect):
@@ -62,3 +89,65 @@ class TestBatchTools:
         assert "RELIANCE.NS" in result
         assert "Score: 85/100" in result
         assert "Volume Spike" in result
+
+    @patch('rover_tools.batch_tools.yf.Ticker')
+    @patch('rover_tools.batch_tools.yf.download')
+    def test_batch_get_stock_data_uses_one_bulk_quote(self, mock_download, mock_ticker):
+        closes = pd.DataFrame({'RELIANCE.NS': [2400.0, 2500.0], 'TCS.NS': [3500.0, None]})
+        mock_download.return_value = pd.concat({'Close': closes}, axis=1)
+        mock_ticker.return_value.fast_info.last_price = 1500.0
+        mock_ticker.return_value.fast_info.previous_close = 1500.0
+
+        result = batch_get_stock_data.run("RELIANCE.NS, TCS.NS, INFY")
+
+        mock_download.assert_called_once()
+        assert mock_download.call_args.args[0] == ['RELIANCE.NS', 'TCS.NS', 'INFY.NS']
+        # Only the symbol the bulk request had no rows for goes per-ticker
+        mock_ticker.assert_called_once_with('INFY.NS')
+        assert "RELIANCE.NS: ₹2500.00 (+4.17%)" in result
+        assert "TCS.NS: ₹3500.00 (+0.00%)" in result
+        assert result.index("RELIANCE.NS") < result.index("TCS.NS") < result.index("INFY.NS")
+
+
+class TestSharedExecutor:
+
+    def test_executor_is_reused_across_calls(self):
+        first_threads, second_threads = set(), set()
+        run_in_parallel(lambda i: first_threads.add(threading.current_thread().name), range(4))
+        run_in_parallel(lambda i: second_threads.add(threading.current_thread().name), range(4))
+
+        assert get_executor() is get_executor()
+        assert all(name.startswith("rover-batch") for name in first_threads | second_threads)
+
+    def test_results_keep_input_order_and_capture_errors(self):
+        def work(i):
+            if i == 2:
+                raise ValueError("boom")
+            return i * 10
+
+        results = run_in_parallel(work, [3, 1, 2, 0], max_workers=2)
+        assert list(results) == [3, 1, 2, 0]
+        assert results[3] == 30 and results[2] == "Error: boom"
+
+    def test_per_call_concurrency_is_capped(self):
+        lock, active, peak = threading.Lock(), [0], [0]
+        release = threading.Event()
+
+        def work(i):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait(0.05)
+            with lock:
+                active[0] -= 1
+            return i
+
+        run_in_parallel(work, range(8), max_workers=2)
+        assert peak[0] <= 2
+
+    def test_nested_calls_run_inline_on_pool_threads(self):
+        def outer(i):
+            inner = run_in_parallel(lambda j: threading.current_thread().name, ["a", "b"])
+            return set(inner.values()) == {threading.current_thread().name}
+
+        assert all(run_in_parallel(outer, range(3)).values())
@@ -1,5 +1,6 @@
 import pytest
 import sys
+import threading
 import os
 from unittest.mock import MagicMock, patch
 from pathlib import Path
@@ -7,7 +8,9 @@ from pathlib import Path
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from crew_engine import MarketRoverCrew, create_crew
+import pandas as pd
+
+from crew_engine import MarketRoverCrew, create_crew, market_regime
 
 class TestCrewEngine:
     @pytest.fixture
@@ -15,7 +18,8 @@ class TestCrewEngine:
         """Mock out all external dependencies"""
         with patch('crew_engine.Crew') as mock_crew, \
              patch('crew_engine.AgentFactory') as mock_agents, \
-             patch('crew_engine.TaskFactory') as mock_tasks:
+             patch('crew_engine.TaskFactory') as mock_tasks, \
+             patch('crew_engine.market_regime', return_value="DEFENSIVE (VIX 25.0 > 22)"):
             
             # Setup mocks
             mock_agents.create_all_agents.return_value = {
@@ -23,6 +27,7 @@ class TestCrewEngine:
                 'researcher': MagicMock(role='researcher')
             }
             mock_tasks.create_all_tasks.return_value = [MagicMock(), MagicMock()]
+            mock_tasks.create_synthesis_tasks.return_value = [MagicMock(), MagicMock()]
             
             yield mock_crew, mock_agents, mock_tasks
 
@@ -81,3 +86,65 @@ class TestCrewEngine:
         """Test the create_crew factory"""
         crew = create_crew()
         assert isinstance(crew, MarketRoverCrew)
+
+    def test_run_analyses_each_stock_in_its_own_parallel_crew(self, mock_dependencies):
+        """Per-stock research and agent crews run through the processor; only the synthesis is sequential"""
+        mock_crew_cls, _, mock_tasks = mock_dependencies
+        steps = {'technicals': ('yfinance', lambda stock: f"data for {stock['Symbol']}")}
+        both_running = threading.Barrier(2, timeout=5)
+        stock_inputs = []
+
+        def kickoff(inputs=None):
+            if 'task_callback' in mock_crew_cls.call_args.kwargs:
+                return "report"
+            stock_inputs.append(inputs['stock_research'])
+            assert inputs['market_regime'] == "DEFENSIVE (VIX 25.0 > 22)"
+            both_running.wait()  # Both stock crews are in flight at once
+            return "analysed " + inputs['stock_research'].splitlines()[0]
+
+        mock_crew_cls.return_value.kickoff.side_effect = kickoff
+        with patch('crew_engine.default_research_steps', return_value=steps):
+            crew = MarketRoverCrew(max_parallel_stocks=2)
+            assert crew.run(stocks=[{'Symbol': 'TCS.NS'}, {'Symbol': 'INFY.NS'}]) == "report"
+
+        assert sorted(c.args[1] for c in mock_tasks.create_stock_tasks.call_args_list) == ['INFY.NS', 'TCS.NS']
+        assert any("data for INFY.NS" in research for research in stock_inputs)
+        synthesis = mock_crew_cls.call_args.kwargs
+        assert synthesis['tasks'] == mock_tasks.create_synthesis_tasks.return_value
+        research = mock_crew_cls.return_value.kickoff.call_args.kwargs['inputs']['stock_research']
+        assert "### TCS.NS" in research and "analysed ### INFY.NS" in research
+
+    def test_progress_callback_receives_stock_and_task_completion(self, mock_dependencies):
+        """Research fills the first 30% of progress, per-stock crews the next 40%, synthesis tasks the rest"""
+        mock_crew_cls, _, _ = mock_dependencies
+        events = []
+        steps = {'technicals': ('yfinance', lambda stock: "ok")}
+
+        def kickoff(inputs=None):
+            task_callback = mock_crew_cls.call_args.kwargs.get('task_callback')
+            if task_callback:
+                task_callback(MagicMock(agent='Market Strategist'))
+                task_callback(MagicMock(agent='Report Generator'))
+            return "done"
+
+        mock_crew_cls.return_value.kickoff.side_effect = kickoff
+        with patch('crew_engine.default_research_steps', return_value=steps):
+            crew = MarketRoverCrew(progress_callback=lambda *e: events.append(e))
+            crew.run(stocks=[{'Symbol': 'TCS.NS'}])
+
+        assert events == [
+            (30.0, 'TCS.NS', 'completed'),
+            (70.0, 'TCS.NS', 'analyzed'),
+            (85.0, 'Market Strategist', 'task_completed'),
+            (100.0, 'Report Generator', 'task_completed'),
+        ]
+
+    @pytest.mark.parametrize("closes, expected", [
+        ([18.0, 25.3], "DEFENSIVE (VIX 25.3 > 22)"),
+        ([25.0, 14.2], "NORMAL (VIX 14.2 <= 22)"),
+        ([], "UNKNOWN (VIX unavailable; do not assume DEFENSIVE)"),
+    ])
+    def test_market_regime_reads_latest_vix_close(self, closes, expected):
+        """Per-stock crews get the strategy task's VIX > 22 rule, read once from the shared snapshot"""
+        with patch('utils.market_snapshot.market_snapshot.closes', return_value=pd.Series(closes, dtype=float)):
+            assert market_regime() == expected
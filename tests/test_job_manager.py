@@ -0,0 +1,87 @@
+"""Tests for the bounded job registry (LRU eviction, TTL expiry, result spill-to-disk)."""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from utils.job_manager import JobManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return JobManager(max_jobs=3, ttl_hours=1, spill_dir=tmp_path / "jobs", spill_bytes=1024)
+
+
+def _finished(manager, result="ok"):
+    job_id = manager.create_job("portfolio.csv", 2)
+    manager.start_job(job_id)
+    manager.complete_job(job_id, result)
+    return job_id
+
+
+def test_lifecycle_keeps_small_results_in_memory(manager):
+    job_id = manager.create_job("portfolio.csv", 2)
+    manager.start_job(job_id)
+    manager.update_progress(job_id, 140, "TCS.NS")
+    assert manager.get_job(job_id)['progress'] == 100
+    manager.complete_job(job_id, "short report")
+
+    job = manager.get_job(job_id)
+    assert job['status'] == 'completed'
+    assert job['result'] == "short report"
+    assert job['result_path'] is None
+    assert not (manager.spill_dir / f"{job_id}.pkl").exists()
+
+
+def test_large_results_spill_to_disk_and_load_lazily(manager):
+    frame = pd.DataFrame({'Symbol': ['TCS.NS'] * 500, 'Score': range(500)})
+    job_id = _finished(manager, frame)
+
+    listed = manager.get_all_jobs()[0]
+    assert listed['result'] is None
+    assert listed['result_path'].endswith(f"{job_id}.pkl")
+
+    pd.testing.assert_frame_equal(manager.get_job(job_id)['result'], frame)
+
+
+def test_lru_evicts_finished_jobs_and_their_spills(manager):
+    big = "x" * 4096
+    oldest = _finished(manager, big)
+    second = _finished(manager)
+    third = _finished(manager)
+    manager.get_job(oldest)  # Touch: `second` becomes least recently used
+    newest = manager.create_job("portfolio.csv", 1)
+
+    ids = [job['id'] for job in manager.get_all_jobs()]
+    assert second not in ids
+    assert set(ids) == {oldest, third, newest}
+    assert manager.get_job(oldest)['result'] == big
+
+
+def test_running_jobs_are_never_evicted(manager):
+    running = [manager.create_job("portfolio.csv", 1) for _ in range(4)]
+    assert len(manager.get_all_jobs()) == 4
+
+    manager.complete_job(running[0], "x" * 4096)
+    assert manager.get_job(running[0])['status'] == 'completed'  # Just finished: still readable
+    manager.fail_job(running[1], "timeout")
+    assert manager.get_job(running[0]) is None
+    assert list(manager.spill_dir.glob("*.pkl")) == []
+
+
+def test_expired_jobs_are_dropped_with_their_spills(manager):
+    job_id = _finished(manager, "x" * 4096)
+    manager.jobs[job_id]['created_at'] = datetime.now() - timedelta(hours=2)
+
+    assert manager.get_job(job_id) is None
+    assert list(manager.spill_dir.glob("*.pkl")) == []
+
+
+def test_cleanup_old_jobs_defaults_to_ttl(manager):
+    stale = _finished(manager)
+    fresh = _finished(manager)
+    manager.jobs[stale]['created_at'] = datetime.now() - timedelta(hours=2)
+
+    assert manager.cleanup_old_jobs() == 1
+    assert [job['id'] for job in manager.get_all_jobs()] == [fresh]
+    assert manager.cleanup_old_jobs(max_age_hours=0) == 1
@@ -0,0 +1,120 @@
+"""Tests for per-agent/task/model LLM token and latency accounting."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import utils.metrics as metrics
+from utils.llm_accounting import LLMCallTracker
+from utils.metrics import get_api_usage, track_llm_call
+
+T0 = datetime(2026, 10, 19, 10, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _tmp_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", tmp_path)
+
+
+def _event(call_id, seconds, **fields):
+    base = {"call_id": call_id, "timestamp": T0 + timedelta(seconds=seconds), "model": "gemini/flash",
+            "agent_role": "Shadow Analyst", "task_name": "shadow", "usage": None}
+    return SimpleNamespace(**{**base, **fields})
+
+
+def test_tracker_joins_out_of_order_events():
+    records = []
+    tracker = LLMCallTracker(sink=lambda **r: records.append(r))
+
+    # Thread-pool dispatch can deliver completion before the start event
+    tracker.completed(_event("c1", 2.5, usage={"prompt_tokens": 900, "completion_tokens": 120}))
+    tracker.chunk(_event("c1", 0.4))
+    assert records == []
+    tracker.started(_event("c1", 0.0))
+
+    assert records == [{
+        "model": "gemini/flash", "agent": "Shadow Analyst", "task": "shadow",
+        "prompt_tokens": 900, "completion_tokens": 120,
+        "ttft_sec": 0.4, "latency_sec": 2.5, "status": "success", "attempt": 1,
+    }]
+
+
+def test_unstreamed_call_uses_latency_as_ttft_and_records_failures():
+    records = []
+    tracker = LLMCallTracker(sink=lambda **r: records.append(r))
+    tracker.started(_event("c2", 0.0))
+    tracker.failed(_event("c2", 1.0))
+    assert records[0]["status"] == "failed" and records[0]["ttft_sec"] == 1.0
+
+
+def test_calls_after_a_failure_are_numbered_as_retries():
+    records = []
+    tracker = LLMCallTracker(sink=lambda **r: records.append(r))
+    for call_id, finish in (("a", tracker.failed), ("b", tracker.failed), ("c", tracker.completed), ("d", tracker.completed)):
+        tracker.started(_event(call_id, 0.0))
+        finish(_event(call_id, 1.0))
+    # Another agent's call is a first attempt regardless of the Shadow Analyst's failures
+    tracker.started(_event("e", 0.0, agent_role="Report Generator"))
+    tracker.completed(_event("e", 1.0, agent_role="Report Generator"))
+
+    assert [r["attempt"] for r in records] == [1, 2, 3, 1, 1]
+
+
+def test_unfinished_calls_are_dropped_after_ttl_or_cap(monkeypatch):
+    import utils.llm_accounting as accounting
+    now = [1000.0]
+    monkeypatch.setattr(accounting.time, "monotonic", lambda: now[0])
+    tracker = LLMCallTracker(sink=lambda **r: None, ttl=60, max_pending=3)
+
+    tracker.started(_event("lost", 0.0))
+    now[0] += 61
+    tracker.started(_event("live", 0.0))
+    assert tracker.pending() == 1 and tracker.dropped == 1
+
+    for i in range(4):
+        tracker.started(_event(f"burst-{i}", 0.0))
+    assert tracker.pending() == 3 and tracker.dropped == 3
+
+
+def test_get_api_usage_aggregates_per_agent_task_and_model():
+    track_llm_call("gemini/flash", "Shadow Analyst", "shadow", 1000, 200, 0.5, 3.0)
+    track_llm_call("gemini/flash", "Shadow Analyst", "shadow", 0, 0, 0.0, 1.0, status="failed")
+    track_llm_call("gemini/flash", "Shadow Analyst", "shadow", 500, 100, 0.5, 2.0, attempt=2)
+    track_llm_call("gemini/pro", "Report Generator", "report", 4000, 800, 1.0, 9.0)
+    track_llm_call("gemini/pro", "Report Generator", "report", status="cached")
+
+    usage = get_api_usage()
+    assert usage["today"] == 4 and usage["remaining"] == usage["limit"] - 4
+    assert usage["total_tokens"] == 6600
+    assert usage["by_agent"]["Shadow Analyst"]["retries"] == 1
+    assert usage["by_agent"]["Shadow Analyst"]["failed"] == 1
+    assert usage["by_agent"]["Shadow Analyst"]["avg_latency_sec"] == 2.0
+    assert usage["by_task"]["report"]["cached"] == 1
+    assert usage["by_model"]["gemini/pro"] == {
+        "calls": 1, "prompt_tokens": 4000, "completion_tokens": 800, "total_tokens": 4800,
+        "retries": 0, "failed": 0, "cached": 1, "avg_latency_sec": 9.0, "avg_ttft_sec": 1.0,
+    }
+
+
+def test_listener_records_events_from_crewai_bus():
+    pytest.importorskip("crewai")
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMCallStartedEvent
+    from utils.llm_accounting import install_usage_listener
+
+    listener = install_usage_listener()
+    records = []
+    listener.tracker._sink = lambda **r: records.append(r)
+    try:
+        for event in (
+            LLMCallStartedEvent(call_id="bus-1", model="gemini/flash", messages="hi"),
+            LLMCallCompletedEvent(call_id="bus-1", model="gemini/flash", messages="hi", response="ok",
+                                  call_type="llm_call", usage={"prompt_tokens": 5, "completion_tokens": 2}),
+        ):
+            future = crewai_event_bus.emit(None, event)
+            if future:
+                future.result(timeout=5)
+    finally:
+        listener.tracker._sink = track_llm_call
+
+    assert records and records[0]["prompt_tokens"] == 5 and records[0]["status"] == "success"
@@ -0,0 +1,100 @@
+"""Tests for the content-addressed LLM response cache."""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.llm_cache import IST, LLMResponseCache, cache_key, install_llm_cache, next_market_open
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    import utils.metrics
+    monkeypatch.setattr(utils.metrics, "METRICS_DIR", tmp_path)  # Cache hits are logged as LLM calls
+    return LLMResponseCache(tmp_path / "llm_cache.sqlite")
+
+
+def _fake_llm(response="Regime: REFLATION"):
+    llm = MagicMock()
+    llm.model = "gemini/gemini-2.5-flash"
+    llm.temperature = 0.3
+    llm._response_cache = None
+    llm.call.return_value = response
+    return llm
+
+
+def test_key_depends_on_model_prompt_tools_and_temperature():
+    messages = [{"role": "user", "content": "Analyze TCS.NS"}]
+    base = cache_key("gemini/flash", messages, 0.3, [{"function": {"name": "get_stock_data"}}])
+    assert base == cache_key("gemini/flash", [dict(m) for m in messages], 0.3, [{"function": {"name": "get_stock_data"}}])
+    assert base != cache_key("gemini/pro", messages, 0.3)
+    assert base != cache_key("gemini/flash", messages, 0.7, [{"function": {"name": "get_stock_data"}}])
+    observed = messages + [{"role": "tool", "content": "Price: 4100"}]
+    assert base != cache_key("gemini/flash", observed, 0.3, [{"function": {"name": "get_stock_data"}}])
+
+
+def test_repeated_prompt_is_served_from_disk(cache):
+    llm = _fake_llm()
+    underlying = llm.call
+    install_llm_cache(llm, cache)
+
+    assert llm.call("Analyze TCS.NS") == "Regime: REFLATION"
+    assert llm.call("Analyze TCS.NS") == "Regime: REFLATION"
+    assert underlying.call_count == 1
+    assert cache.stats()["hits"] == 1
+
+    llm.call("Analyze INFY.NS")
+    assert underlying.call_count == 2
+
+
+def test_non_text_responses_are_not_cached(cache):
+    llm = _fake_llm(response={"tool_calls": []})
+    underlying = llm.call
+    install_llm_cache(llm, cache)
+    llm.call("x")
+    llm.call("x")
+    assert underlying.call_count == 2
+
+
+def test_tool_offering_calls_cache_text_answers_but_not_tool_calls(cache):
+    llm = _fake_llm()
+    underlying = llm.call
+    install_llm_cache(llm, cache)
+    tools = [{"function": {"name": "get_stock_data", "parameters": {"type": "object"}}}]
+
+    # Agents always offer their tools; a plain-text answer is still served from disk
+    assert llm.call("Analyze TCS.NS", tools=tools) == "Regime: REFLATION"
+    assert llm.call("Analyze TCS.NS", tools=tools) == "Regime: REFLATION"
+    assert underlying.call_count == 1
+
+    # A tool invocation is never stored, so the agent re-asks the model each time
+    underlying.return_value = [{"function": {"name": "get_stock_data", "arguments": "{}"}}]
+    llm.call("Analyze INFY.NS", tools=tools)
+    llm.call("Analyze INFY.NS", tools=tools)
+    assert underlying.call_count == 3
+
+    # With available_functions the LLM runs the tool itself, so the cache is skipped entirely
+    underlying.return_value = "Price: 4100"
+    functions = {"get_stock_data": MagicMock(return_value="Price: 4100")}
+    llm.call("Analyze TCS.NS", tools=tools, available_functions=functions)
+    assert underlying.call_count == 4
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 3
+
+
+def test_entries_expire_at_next_market_open(cache):
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=IST)
+    assert next_market_open(friday_evening) == datetime(2026, 10, 19, 9, 15, tzinfo=IST)
+    assert next_market_open(datetime(2026, 10, 19, 8, 0, tzinfo=IST)) == datetime(2026, 10, 19, 9, 15, tzinfo=IST)
+
+    cache.put("k", "m", "cached", expires_at=1000.0)
+    assert cache.get("k", now=999.0) == "cached"
+    assert cache.get("k", now=1000.0) is None
+    assert cache.purge_expired(now=1000.0) == 1
+
+
+def test_wraps_real_crewai_llm(cache):
+    crewai = pytest.importorskip("crewai")
+    llm = crewai.LLM(model="gemini/gemini-2.5-flash", temperature=0.3, api_key="test")
+    install_llm_cache(llm, cache)
+    cache.put(cache_key(str(llm.model), "hello", 0.3), str(llm.model), "from cache")
+    assert llm.call("hello") == "from cache"
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock, patch
+from rover_tools import market_context_tool
 from rover_tools.market_context_tool import analyze_market_context
 
 @pytest.fixture
@@ -8,26 +9,20 @@ def mock_yf_ticker():
     with patch('yfinance.Ticker') as mock:
         yield mock
 
-def test_analyze_market_context_no_portfolio(mock_yf_ticker):
-    # Setup mocks for Nifty 50 and Bank Nifty
-    # Mock Nifty 50 (^NSEI)
-    mock_nifty_hist = pd.DataFrame({'Close': [100, 101, 102, 103, 104, 105]}) # rising
-    mock_bank_hist = pd.DataFrame({'Close': [200, 201, 202, 203, 204, 205]})
-    
-    # Configure mock side_effect based on ticker symbol
-    def side_effect(symbol):
-        ticker = MagicMock()
-        if 'NSEI' in symbol:
-            ticker.history.return_value = mock_nifty_hist
-            ticker.info = {'name': 'Nifty 50'}
-        elif 'NSEBANK' in symbol:
-            ticker.history.return_value = mock_bank_hist
-            ticker.info = {'name': 'Bank Nifty'}
-        else:
-            ticker.history.return_value = pd.DataFrame() # Default empty
-        return ticker
+@pytest.fixture
+def mock_snapshot():
+    with patch.object(market_context_tool, 'market_snapshot') as mock:
+        yield mock
 
-    mock_yf_ticker.side_effect = side_effect
+def _index_closes(closes_by_symbol):
+    return lambda symbol: pd.Series(closes_by_symbol.get(symbol, []), dtype=float)
+
+def test_analyze_market_context_no_portfolio(mock_yf_ticker, mock_snapshot):
+    # Index history comes from the shared snapshot: Nifty 50 (^NSEI) rising
+    mock_snapshot.closes.side_effect = _index_closes({
+        '^NSEI': [100, 101, 102, 103, 104, 105],
+        '^NSEBANK': [200, 201, 202, 203, 204, 205],
+    })
     
     result = analyze_market_context.run()
     assert "Nifty 50" in result
@@ -35,37 +30,28 @@ def test_analyze_market_context_no_portfolio(mock_yf_ticker):
     assert "Positive" in result
     assert "Market is showing" in result
 
-def test_analyze_market_context_with_stocks(mock_yf_ticker):
-    # Setup mocks for Ticker logic
-    # We need to handle:
-    # 1. Stock Info fetching (for sector detection)
-    # 2. Index History fetching
+def test_analyze_market_context_with_stocks(mock_yf_ticker, mock_snapshot):
+    # Setup mocks for:
+    # 1. Stock Info fetching (for sector detection) via yf.Ticker
+    # 2. Index History from the shared snapshot
     
     def side_effect(symbol):
         ticker = MagicMock()
-        
-        # Stock Logic
         if "TCS" in symbol:
             ticker.info = {'sector': 'Technology'}
         elif "TATAMOTORS" in symbol:
             ticker.info = {'sector': 'Automotive'}
-            
-        # Index Logic
-        elif "NSEI" in symbol: # Nifty
-             ticker.history.return_value = pd.DataFrame({'Close': [100]*10})
-        elif "NSEBANK" in symbol: # Bank Nifty
-             ticker.history.return_value = pd.DataFrame({'Close': [200]*10})
-        elif "CNXIT" in symbol: # IT Sector
-             ticker.history.return_value = pd.DataFrame({'Close': [300, 310, 320, 330, 340, 350]}) # Strong
-        elif "CNXAUTO" in symbol: # Auto Sector
-             ticker.history.return_value = pd.DataFrame({'Close': [400, 390, 380, 370, 360, 350]}) # Weak
         else:
-             ticker.history.return_value = pd.DataFrame()
-             ticker.info = {}
-             
+            ticker.info = {}
         return ticker
 
     mock_yf_ticker.side_effect = side_effect
+    mock_snapshot.closes.side_effect = _index_closes({
+        '^NSEI': [100] * 10,
+        '^NSEBANK': [200] * 10,
+        '^CNXIT': [300, 310, 320, 330, 340, 350],  # Strong
+        '^CNXAUTO': [400, 390, 380, 370, 360, 350],  # Weak
+    })
     
     # Run with TCS (IT) and TATAMOTORS (Auto)
     result = analyze_market_context.run("TCS, TATAMOTORS")
@@ -82,8 +68,9 @@ def test_analyze_market_context_with_stocks(mock_yf_ticker):
     
     assert "Analyzed sectors based on portfolio: Auto, IT" in result or "IT, Auto" in result
 
-def test_analyze_market_context_error_handling(mock_yf_ticker):
+def test_analyze_market_context_error_handling(mock_yf_ticker, mock_snapshot):
     mock_yf_ticker.side_effect = Exception("API Down")
+    mock_snapshot.closes.return_value = pd.Series(dtype=float)  # Snapshot has no data
     
     result = analyze_market_context.run()
     assert "Error analyzing market context" in result
@@ -0,0 +1,135 @@
+"""Tests for the shared index snapshot and the tools that read from it."""
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from rover_tools import global_market_tool
+from utils import market_snapshot as snapshot_module
+from utils.market_snapshot import HORIZON_SESSIONS, IST, MarketSnapshot, change_over
+
+SYMBOLS = ["^VIX", "^TNX", "DX-Y.NYB", "^GSPC", "^NSEI"]
+
+
+def _download(closes):
+    """yf.download-shaped frame: ('Close', symbol) MultiIndex columns."""
+    frame = pd.DataFrame(closes, index=pd.date_range("2026-10-12", periods=len(next(iter(closes.values())))))
+    return pd.concat({"Close": frame}, axis=1)
+
+
+@pytest.fixture
+def download():
+    with patch.object(snapshot_module.yf, "download") as mock:
+        mock.return_value = _download({
+            "^VIX": [14.0, 15.0], "^TNX": [4.1, 4.2], "DX-Y.NYB": [103.0, 104.0],
+            "^GSPC": [5000.0, 5100.0], "^NSEI": [float("nan"), 25000.0],  # Holiday gap on one calendar
+        })
+        yield mock
+
+
+def _snapshot(**kwargs):
+    return MarketSnapshot(SYMBOLS, **{"ttl": 60, "off_hours_ttl": 60, **kwargs})
+
+
+def test_one_download_serves_every_symbol_until_ttl(download):
+    snapshot = _snapshot()
+
+    assert snapshot.closes("^GSPC", now=0).tolist() == [5000.0, 5100.0]
+    assert snapshot.closes("^NSEI", now=1).tolist() == [25000.0]
+    assert snapshot.closes("CL=F", now=2).empty
+    download.assert_called_once_with(SYMBOLS, period="1mo", progress=False)
+
+    snapshot.closes("^VIX", now=61)
+    snapshot._worker.join(timeout=5)
+    assert download.call_count == 2
+
+
+def test_stale_read_returns_at_once_and_refreshes_in_background(download):
+    snapshot = _snapshot()
+    first = snapshot.frame(now=0)
+    callers = []
+    release = threading.Event()
+
+    def slow_download(*args, **kwargs):
+        callers.append(threading.current_thread())
+        release.wait(5)
+        return _download({"^VIX": [16.0, 17.0]})
+
+    download.side_effect = slow_download
+    started = time.monotonic()
+    assert snapshot.frame(now=61) is first  # Served without waiting on the download
+    assert snapshot.frame(now=62) is first  # Refresh already in flight: no second one
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    snapshot._worker.join(timeout=5)
+    assert callers and threading.current_thread() not in callers
+    assert download.call_count == 2
+    assert snapshot.closes("^VIX", now=63).tolist() == [16.0, 17.0]
+
+
+def test_refresh_interval_follows_market_hours():
+    snapshot = _snapshot(off_hours_ttl=900)
+    assert snapshot.interval(datetime(2026, 10, 19, 11, 0, tzinfo=IST)) == 60   # Monday session
+    assert snapshot.interval(datetime(2026, 10, 19, 20, 0, tzinfo=IST)) == 900  # After the close
+    assert snapshot.interval(datetime(2026, 10, 18, 11, 0, tzinfo=IST)) == 900  # Sunday
+
+
+def test_scheduled_refresher_keeps_snapshot_fresh(download):
+    snapshot = _snapshot(ttl=0.01, off_hours_ttl=0.01)
+    snapshot.start()
+    try:
+        deadline = time.monotonic() + 5
+        while download.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        snapshot.stop()
+    assert download.call_count >= 2
+    assert not snapshot.frame().empty
+
+
+def test_failed_refresh_serves_stale_snapshot_and_backs_off(download):
+    snapshot = _snapshot(retry=15)
+    snapshot.frame(now=0)
+
+    download.side_effect = ConnectionError("rate limited")
+    assert snapshot.closes("^VIX", now=60).iloc[-1] == 15.0
+    snapshot._worker.join(timeout=5)
+    assert snapshot.closes("^VIX", now=70).iloc[-1] == 15.0  # Within retry backoff: no new request
+    assert download.call_count == 2
+    assert snapshot.age(now=70) == 70
+
+    download.side_effect = None
+    download.return_value = pd.DataFrame()  # Empty download counts as a failure too
+    snapshot.frame(now=75)
+    snapshot._worker.join(timeout=5)
+    assert snapshot.closes("^VIX", now=76).iloc[-1] == 15.0
+
+
+def test_week_change_is_four_sessions_back():
+    closes = pd.Series([100.0, 101.0, 102.0, 103.0, 104.0, 110.0])
+    # 1W compares with iloc[-5] in both the sector table and market context
+    assert change_over(closes, HORIZON_SESSIONS["1W"]) == pytest.approx(110 / 101 * 100 - 100)
+    # Shorter series fall back to the first close
+    assert change_over(closes, HORIZON_SESSIONS["1M"]) == pytest.approx(10.0)
+
+
+def test_global_cues_read_from_snapshot(download):
+    with patch.object(global_market_tool, "market_snapshot", MarketSnapshot(SYMBOLS)):
+        cues = global_market_tool.get_global_cues.run()
+        data = global_market_tool.get_global_cues_data()
+
+    assert "- S&P 500: 5100.00 (🟢 +2.00%)" in cues
+    assert "- Gold ($): Data Unavailable" in cues
+    assert data == {"vix": 15.0, "yield_10y": 4.2, "dxy": 104.0, "sp500": 5100.0}
+    assert download.call_count == 1
+
+
+def test_global_cues_without_snapshot_assume_neutral(download):
+    download.return_value = pd.DataFrame()
+    with patch.object(global_market_tool, "market_snapshot", MarketSnapshot(SYMBOLS)):
+        assert global_market_tool.get_global_cues.run() == "Error fetching Global Market Cues. Assume Neutral."
+        assert global_market_tool.get_global_cues_data() == {"vix": 20, "yield_10y": 3.5, "dxy": 100}
@@ -1,27 +1,15 @@
 import pytest
-import os
-import json
 from unittest.mock import MagicMock, patch
-from rover_tools.memory_tool import save_prediction_tool, read_past_predictions_tool, MEMORY_FILE_PATH
+from rover_tools import memory_tool
+from rover_tools.memory_tool import save_prediction_tool, read_past_predictions_tool
+from utils.prediction_ledger import PredictionLedger
 from tasks import TaskFactory
 
 @pytest.fixture
-def clean_memory():
-    """Backup and restore memory file."""
-    if os.path.exists(MEMORY_FILE_PATH):
-        with open(MEMORY_FILE_PATH, 'r') as f:
-            backup = f.read()
-    else:
-        backup = None
-        
-    yield
-    
-    # Restore
-    if backup:
-        with open(MEMORY_FILE_PATH, 'w') as f:
-            f.write(backup)
-    elif os.path.exists(MEMORY_FILE_PATH):
-        os.remove(MEMORY_FILE_PATH)
+def clean_memory(tmp_path):
+    """Point the memory tools at a throwaway prediction ledger."""
+    with patch.object(memory_tool, 'prediction_ledger', PredictionLedger(tmp_path / "predictions.sqlite")) as ledger:
+        yield ledger
 
 def invoke_tool(tool_obj, **kwargs):
     """Helper to invoke tool whether it's a function or StructredTool."""
@@ -0,0 +1,41 @@
+"""Tests for the SimHash near-duplicate fingerprints."""
+from utils.news_dedup import MAX_DISTANCE, bands, hamming_distance, has_words, simhash, to_signed, to_unsigned
+
+STORY = (
+    "Nifty ended higher for the third straight session on Monday as banking and IT stocks gained, "
+    "while foreign investors turned net buyers after two weeks of selling in the cash market. "
+    "The Sensex rose 412 points to close at 82,310 and the Nifty added 118 points to settle at 25,140. "
+    "HDFC Bank, ICICI Bank and Infosys were the biggest contributors to the gains, while Maruti and "
+    "Titan ended lower. Broader markets outperformed, with the midcap index up 0.9 per cent and the "
+    "smallcap index up 1.2 per cent. Market breadth was positive, with advancing shares outnumbering "
+    "declines by two to one on the NSE. Analysts said easing crude prices and a stable rupee supported "
+    "sentiment ahead of quarterly earnings, although elevated valuations in select pockets could cap "
+    "further upside. India VIX, a measure of expected volatility, fell 3 per cent to 12.4. "
+    "Sectorally, the PSU bank index jumped 2 per cent and the realty index gained 1.5 per cent, while "
+    "FMCG and auto indices slipped marginally as investors booked profits after the recent run-up."
+)
+
+
+def test_near_duplicates_are_within_threshold():
+    a = simhash("Markets rally: " + STORY)
+    b = simhash("Markets rally: " + STORY + " Analysts expect the momentum to continue.")
+    assert hamming_distance(a, b) <= MAX_DISTANCE
+
+
+def test_unrelated_texts_are_far_apart():
+    other = simhash("Tata Motors unveils an electric SUV with a 500 km range and plans three more launches next year.")
+    assert hamming_distance(simhash(STORY), other) > 10
+
+
+def test_close_fingerprints_share_a_band():
+    fp = simhash(STORY)
+    flipped = fp ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+    assert any(x == y for x, y in zip(bands(fp), bands(flipped)))
+
+
+def test_signed_round_trip_and_empty_text():
+    fp = simhash(STORY)
+    assert to_unsigned(to_signed(fp)) == fp
+    assert -(1 << 63) <= to_signed(fp) < (1 << 63)
+    assert simhash("") == 0
+    assert not has_words("") and not has_words("आरबीआई — ₹") and has_words("RBI ₹")
@@ -85,3 +85,51 @@ def test_progress_tracking_and_callback():
     assert progress['total'] == 2
     assert progress['completed'] == 2
     assert progress['percentage'] == 100.0
+
+def test_provider_rate_limiter_allows_burst_then_paces():
+    from utils.parallel_processor import ProviderRateLimiter
+    limiter = ProviderRateLimiter(rate=2, burst=2)
+    waits = [limiter.reserve(now=100.0) for _ in range(4)]
+    assert waits == [0, 0, 0.5, 1.0]
+
+def test_run_pipeline_collects_steps_and_partial_failures():
+    def boom(stock):
+        raise RuntimeError("news down")
+
+    steps = {
+        'news': ('news', boom),
+        'technicals': ('yfinance', lambda s: f"tech {s['Symbol']}"),
+    }
+    stocks = [{'Symbol': 'A'}, {'Symbol': 'B'}]
+    processor = ParallelStockProcessor(max_workers=3, provider_limits={'news': 1000, 'yfinance': 1000})
+    outcome = processor.run_pipeline(stocks, steps)
+
+    assert outcome['summary'] == {'total': 2, 'successful': 2, 'failed': 0}
+    by_symbol = {r['stock']['Symbol']: r for r in outcome['results']}
+    assert by_symbol['A']['result'] == {'technicals': 'tech A'}
+    assert by_symbol['B']['errors'] == {'news': 'news down'}
+
+def test_slow_provider_does_not_block_other_providers():
+    # One news call per second; yfinance effectively unlimited
+    processor = ParallelStockProcessor(max_workers=2, provider_limits={'news': 1, 'yfinance': 1000})
+    started = {}
+    steps = {
+        'news': ('news', lambda s: started.setdefault(('news', s['Symbol']), time.monotonic())),
+        'technicals': ('yfinance', lambda s: started.setdefault(('yf', s['Symbol']), time.monotonic())),
+    }
+    stocks = [{'Symbol': s} for s in 'ABC']
+    t0 = time.monotonic()
+    processor.run_pipeline(stocks, steps)
+
+    # Every yfinance unit runs before the news limiter releases its later slots
+    assert max(started[('yf', s)] for s in 'ABC') - t0 < 0.5
+    assert sorted(started[('news', s)] for s in 'ABC')[-1] - t0 >= 1.0
+
+def test_worker_exit_is_raised_instead_of_hanging_the_collector():
+    def bail(stock):
+        raise SystemExit("worker shutting down")
+
+    steps = {'technicals': ('yfinance', bail)}
+    processor = ParallelStockProcessor(max_workers=1, provider_limits={'yfinance': 1000})
+    with pytest.raises(SystemExit):
+        processor.run_pipeline([{'Symbol': s} for s in 'ABC'], steps)
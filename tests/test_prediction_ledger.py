@@ -0,0 +1,103 @@
+"""Tests for the append-only prediction ledger behind the memory tools."""
+import json
+import threading
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from rover_tools import memory_tool
+from utils.prediction_ledger import PredictionLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return PredictionLedger(tmp_path / "predictions.sqlite")
+
+
+def test_latest_prefers_newest_date_then_newest_entry(ledger):
+    today = date.today()
+    ledger.append("infy.ns", "Buy", "High", on=today - timedelta(days=5))
+    ledger.append("INFY.NS", "Sell", "Low", on=today)
+    ledger.append("INFY.NS", "Wait", "Medium", on=today)
+    ledger.append("TCS.NS", "Buy", "High", on=today + timedelta(days=1))
+
+    latest = ledger.latest("Infy.NS")
+    assert (latest['signal'], latest['confidence'], latest['outcome']) == ("Wait", "Medium", "Pending")
+    assert ledger.latest("HDFCBANK.NS") is None
+    assert [e['signal'] for e in ledger.entries(ticker="INFY.NS", limit=2)] == ["Sell", "Wait"]
+
+
+def test_concurrent_appends_are_never_lost(tmp_path):
+    # Separate ledger instances = separate connections, as with separate agent processes
+    path = tmp_path / "predictions.sqlite"
+    writers = [PredictionLedger(path) for _ in range(4)]
+
+    def save(ledger, n):
+        for i in range(50):
+            ledger.append(f"T{n}.NS", "Buy", str(i))
+
+    threads = [threading.Thread(target=save, args=(w, n)) for n, w in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(PredictionLedger(path).entries()) == 200  # No 1000-entry cap or truncation either
+
+
+def test_pending_and_outcome_updates(ledger):
+    today = date.today()
+    old = ledger.append("SBIN.NS", "Buy", "High", on=today - timedelta(days=10))
+    ledger.append("SBIN.NS", "Buy", "High", on=today)
+
+    assert [e['id'] for e in ledger.pending(today - timedelta(days=3))] == [old]
+    assert ledger.set_outcome(old, "Success")
+    assert ledger.pending(today) and ledger.pending(today - timedelta(days=3)) == []
+    assert ledger.set_outcome(9999, "Failed") is False
+
+
+def test_legacy_memory_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "memory.json"
+    legacy.write_text(json.dumps([
+        {"date": "2026-09-01", "ticker": "tcs.ns", "signal": "Buy", "confidence": "High", "outcome": "Success"},
+        {"date": "2026-09-02", "ticker": "INFY.NS", "signal": "Sell", "confidence": "Low", "outcome": "Pending"},
+    ]))
+    path = tmp_path / "predictions.sqlite"
+
+    assert [e['ticker'] for e in PredictionLedger(path, legacy_json=legacy).entries()] == ["TCS.NS", "INFY.NS"]
+    assert len(PredictionLedger(path, legacy_json=legacy).entries()) == 2
+    assert legacy.exists()
+
+
+def test_evaluate_pending_predictions_updates_rows_in_place(ledger):
+    past = date.today() - timedelta(days=7)
+    buy = ledger.append("RELIANCE.NS", "Buy", "High", on=past)
+    sell = ledger.append("RELIANCE.NS", "Sell", "Low", on=past)
+    fresh = ledger.append("RELIANCE.NS", "Buy", "High")
+
+    with patch.object(memory_tool, 'prediction_ledger', ledger), \
+         patch.object(memory_tool.yf, 'Ticker') as ticker:
+        ticker.return_value.history.return_value = pd.DataFrame({'Close': [100.0, 104.0]})
+        memory_tool.evaluate_pending_predictions()
+
+    outcomes = {e['id']: e['outcome'] for e in ledger.entries()}
+    assert outcomes == {buy: "Success", sell: "Failed", fresh: "Pending"}
+
+
+def test_stats_aggregate_the_whole_ledger(ledger):
+    assert ledger.stats() == {"total": 0, "validated": 0, "wins": 0}
+    for outcome in ["Success", "Success", "Failed", "Pending"]:
+        ledger.append("TCS.NS", "Buy", "High", outcome=outcome)
+
+    assert ledger.stats() == {"total": 4, "validated": 3, "wins": 2}
+
+
+def test_read_memory_returns_only_the_newest_rows(ledger):
+    for i in range(5):
+        ledger.append("TCS.NS", "Buy", str(i))
+
+    with patch.object(memory_tool, 'prediction_ledger', ledger):
+        assert [e['confidence'] for e in memory_tool.read_memory(limit=3)] == ["2", "3", "4"]
+        assert memory_tool.memory_stats()['total'] == 5
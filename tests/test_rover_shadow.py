@@ -5,6 +5,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pytest
 import pandas as pd
 import numpy as np
+from contextlib import ExitStack
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from rover_tools.shadow_tools import (
@@ -22,6 +23,14 @@ def mock_yf_download():
     with patch("yfinance.download") as mock:
         yield mock
 
+@pytest.fixture(autouse=True)
+def fresh_market_snapshot():
+    # analyze_sector_flow reads the process-wide snapshot; never reuse another test's closes
+    from utils.market_snapshot import market_snapshot
+    market_snapshot.reset()
+    yield
+    market_snapshot.reset()
+
 @pytest.fixture
 def mock_yf_ticker():
     with patch("yfinance.Ticker") as mock:
@@ -264,7 +273,8 @@ def test_tool_wrappers():
     ]
     
     # We will use patches on the underlying logic functions
-    with patch("rover_tools.shadow_tools.analyze_sector_flow") as mock_flow, \
+    with ExitStack() as stack, \
+         patch("rover_tools.shadow_tools.analyze_sector_flow") as mock_flow, \
          patch("rover_tools.shadow_tools.fetch_block_deals") as mock_deals, \
          patch("rover_tools.shadow_tools.detect_silent_accumulation") as mock_acc, \
          patch("rover_tools.shadow_tools.get_trap_indicator") as mock_trap:
@@ -274,6 +284,12 @@ def test_tool_wrappers():
         mock_acc.return_value = {'score': 50, 'signals': ['Signal A']}
         mock_trap.return_value = {'status': 'Neutral', 'message': 'Balanced', 'fii_long_pct': 50}
 
+        # The sector tool reads the shared snapshot; start from an empty one
+        from rover_tools.sector_snapshot import sector_flow_snapshot
+        from utils.market_snapshot import market_snapshot
+        sector_flow_snapshot.reset()
+        stack.enter_context(patch.object(market_snapshot, "frame", return_value=pd.DataFrame({"^NSEI": [1.0]})))
+
         for t in tools:
             # If t is a CrewAI tool object, it might be callable directly or via .run()
             # If it's a function (fallback), it's callable.
@@ -300,3 +316,88 @@ def test_tool_wrappers():
 
             assert isinstance(res, str)
             assert len(res) > 0
+
+        sector_flow_snapshot.reset()
+
+
+# --- Sector Snapshot ---
+
+def test_analyze_sector_flow_relative_strength(mock_yf_download):
+    dates = pd.date_range(start="2024-01-01", periods=60)
+    data = {k: [100.0] * 60 for k in ["^NSEBANK", "^CNXIT", "^CNXAUTO", "^CNXMETAL", "^CNXPHARMA",
+                                       "^CNXFMCG", "^CNXENERGY", "^CNXINFRA", "^CNXREALTY", "^CNXPSUBANK"]}
+    data["^NSEBANK"] = np.linspace(100, 120, 60)
+    data["^NSEI"] = np.linspace(100, 110, 60)
+    mock_yf_download.return_value = {'Close': pd.DataFrame(data, index=dates)}
+
+    df = analyze_sector_flow()
+
+    assert mock_yf_download.call_count == 1
+    for col in ["1D %", "3M %", "RS 1W", "RS 1M", "RS 3M"]:
+        assert col in df.columns
+    bank = df[df['Sector'] == "Nifty Bank"].iloc[0]
+    assert bank['RS 3M'] == pytest.approx(10.0, abs=0.01)
+    assert bank['Rank'] == 1
+
+
+class _Source:
+    """Stands in for MarketSnapshot: hands out whatever frame it currently holds."""
+
+    def __init__(self, frame):
+        self.current = frame
+
+    def frame(self):
+        return self.current
+
+
+def test_sector_snapshot_recomputes_only_when_closes_refresh():
+    from rover_tools.sector_snapshot import SectorFlowSnapshot
+    source = _Source(pd.DataFrame({'^NSEI': [1.0, 2.0]}))
+    compute = MagicMock(return_value=pd.DataFrame({'Sector': ['Bank'], 'Momentum Score': [1.0]}))
+    snap = SectorFlowSnapshot(source=source, compute=compute)
+
+    first = snap.get()
+    second = snap.get()
+    assert compute.call_count == 1
+    assert first.equals(second)
+    # Callers get copies, not the shared frame
+    first.loc[0, 'Sector'] = 'Mutated'
+    assert snap.get().iloc[0]['Sector'] == 'Bank'
+
+    source.current = pd.DataFrame({'^NSEI': [2.0, 3.0]})
+    snap.get()
+    assert compute.call_count == 2
+    assert compute.call_args.args[0] is source.current
+
+
+def test_sector_snapshot_keeps_previous_on_failure():
+    from rover_tools.sector_snapshot import SectorFlowSnapshot
+    source = _Source(pd.DataFrame())
+    good = pd.DataFrame({'Sector': ['IT'], 'Momentum Score': [2.0]})
+    compute = MagicMock(side_effect=[good, ValueError("bad closes"), pd.DataFrame()])
+    snap = SectorFlowSnapshot(source=source, compute=compute)
+
+    assert snap.get() is None  # No closes yet
+    assert compute.call_count == 0
+    for closes in ([1.0], [2.0], [3.0]):
+        source.current = pd.DataFrame({'^NSEI': closes})
+        assert snap.get().iloc[0]['Sector'] == 'IT'
+    assert compute.call_count == 3
+
+
+def test_sector_table_shares_the_market_snapshot_download(mock_yf_download):
+    from rover_tools.sector_snapshot import SectorFlowSnapshot
+    from rover_tools.shadow_tools import SECTOR_BENCHMARK, SECTOR_INDICES
+    from utils.market_snapshot import DOMESTIC_INDICES, MarketSnapshot
+    assert set(SECTOR_INDICES.values()) | {SECTOR_BENCHMARK} <= set(DOMESTIC_INDICES.values())
+
+    symbols = list(SECTOR_INDICES.values()) + [SECTOR_BENCHMARK]
+    dates = pd.date_range(start="2024-01-01", periods=60)
+    mock_yf_download.return_value = {'Close': pd.DataFrame({k: np.linspace(100, 110, 60) for k in symbols},
+                                                           index=dates)}
+    shared = MarketSnapshot(symbols, period="3mo")
+    snap = SectorFlowSnapshot(source=shared)
+
+    assert len(snap.get()) == len(SECTOR_INDICES)
+    assert shared.closes(SECTOR_BENCHMARK).iloc[-1] == pytest.approx(110.0)
+    mock_yf_download.assert_called_once_with(symbols, period="3mo", progress=False)
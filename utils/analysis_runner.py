@@ -3,6 +3,7 @@ import pandas as pd
 import time
 import os
 import threading
+import queue
 from datetime import datetime
 from config import PORTFOLIO_FILE, REPORT_DIR
 from crew_engine import create_crew
@@ -59,9 +60,8 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
     try:
 
-        # Simulate progress updates (since CrewAI doesn't expose task-level hooks easily)
-
-        # We'll update progress based on estimation
+        # Real mode reports progress from the crew's per-stock and task callbacks;
+        # test mode simulates the same stages
 
         status_text.text("🚀 Starting analysis...")
 
@@ -134,9 +134,15 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
 
 
+            # Progress channel: the crew reports real per-stock and per-task completion
+            progress_events = queue.Queue()
+
+            def on_progress(pct, label, status):
+                progress_events.put((pct, label, status))
+
             # Create crew
 
-            crew = create_crew(max_parallel_stocks=max_parallel)
+            crew = create_crew(max_parallel_stocks=max_parallel, progress_callback=on_progress)
 
 
 
@@ -150,14 +156,6 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
 
 
-            # Run analysis (this will take time)
-
-            # Update progress incrementally during execution
-
-
-
-            analysis_complete = False
-
             result = None
 
             # Using a list to hold error to allow modification in closure if needed, though nonlocal works too
@@ -167,11 +165,11 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
             def run_crew():
 
-                nonlocal result, analysis_complete
+                nonlocal result
 
                 try:
 
-                    result = crew.run()
+                    result = crew.run(stocks=df.to_dict('records'))
 
                 except RuntimeError as re:
 
@@ -185,7 +183,7 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
                 finally:
 
-                    analysis_complete = True
+                    progress_events.put(None)  # Wakes the UI loop as soon as the crew stops
 
 
 
@@ -197,29 +195,29 @@ def run_analysis(df: pd.DataFrame, filename: str, max_parallel: int):
 
 
 
-            # Simulated progress steps mapping to our 7-Task Intelligence Workflow
-            progress_steps = [
-                (14, "📂 Portfolio Retrieval...", "Portfolio Manager"),
-                (28, "📰 Market Strategy Mapping...", "Market Impact Strategist"),
-                (42, "💭 Sentiment Analysis...", "Sentiment Analyzer"),
-                (56, "📈 Technical Concordance Check...", "Technical Analyst"),
-                (70, "🕵️ Shadow Analysis (Forensics)...", "Shadow Analyst"),
-                (84, "📅 Traditional Timing Audit...", "Traditional Timing Analyst"),
-                (98, "📝 Final Intelligence Synthesis...", "Report Generator"),
-            ]
-
-
-
-            step_idx = 0
-
-            while not analysis_complete and step_idx < len(progress_steps):
-                time.sleep(15)  # Wait 15 seconds between updates
-                if not analysis_complete:
-                    pct, msg, agent_name = progress_steps[step_idx]
-                    progress_bar.progress(pct)
-                    status_text.markdown(f"**Agent Active:** {agent_name}")
-                    detail_text.text(f"Action: {msg}")
-                    step_idx += 1
+            # Render progress events until the crew signals completion (no fixed schedule)
+            stocks_done = 0
+            stocks_analyzed = 0
+            while True:
+                event = progress_events.get()
+                if event is None:
+                    break
+                pct, label, status = event
+                overall = 10 + int(pct * 0.89)  # 10% is the setup above; 100% is set on completion
+                progress_bar.progress(min(overall, 99))
+                st.session_state.job_manager.update_progress(job_id, overall, label)
+                if status in ('completed', 'failed'):
+                    stocks_done += 1
+                    status_text.markdown(f"**Per-stock research:** {stocks_done}/{total_stocks} stocks")
+                    detail_text.text(f"{'✅' if status == 'completed' else '⚠️'} {label}")
+                elif status in ('analyzed', 'analysis_failed'):
+                    stocks_analyzed += 1
+                    status_text.markdown(f"**Per-stock analysis:** {stocks_analyzed}/{total_stocks} stocks")
+                    detail_text.text(f"{'🧠' if status == 'analyzed' else '⚠️'} {label}")
+                elif status == 'task_completed':
+                    status_text.markdown(f"**Completed:** {label}")
+                else:
+                    detail_text.text(f"Action: {label}")
 
 
 
@@ -0,0 +1,365 @@
+"""
+Local article store for the news scraper.
+
+Pages are keyed by canonical URL and hold the raw HTML (zlib-compressed),
+its ETag / Last-Modified validators and, for articles, the Newspaper3k
+extraction (title, text, publish time). Re-fetches send conditional requests
+built from the stored validators; a 304 or an unchanged body keeps the
+existing extraction, so each article is parsed once.
+
+Parsed articles are also grouped into stories: near-duplicate copies (SimHash,
+see utils.news_dedup) share the story_id of the first copy seen, and every
+ticker whose search pages surfaced the story is attached to it.
+
+An FTS5 index over article titles and bodies (kept in sync by triggers) backs
+`search()`: keyword, ticker and date-range queries over everything collected.
+
+The store is pruned at most once an hour from `save_page`: pages not fetched or
+revalidated within NEWS_STORE_MAX_AGE_DAYS are dropped, then the least recently
+checked pages beyond NEWS_STORE_MAX_ARTICLES, along with story rows and ticker
+links nothing refers to any more. Freed pages are reused, so the file stops
+growing instead of shrinking.
+"""
+import re
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import NEWS_STORE_MAX_AGE_DAYS, NEWS_STORE_MAX_ARTICLES, NEWS_STORE_PATH
+from utils.news_dedup import (
+    BANDS, MAX_DISTANCE, bands, hamming_distance, has_words, simhash, to_signed, to_unsigned,
+)
+
+# Query parameters that never change the page content
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "cmp"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    html BLOB,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    title TEXT,
+    body TEXT,
+    published_at TEXT,
+    parsed INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS story_tickers (
+    story_id TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (story_id, ticker)
+);
+CREATE TABLE IF NOT EXISTS stories (
+    url TEXT PRIMARY KEY,
+    story_id TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    %s
+);
+%s
+""" % (
+    ",\n    ".join(f"band{i} INTEGER NOT NULL" for i in range(BANDS)),
+    "\n".join(f"CREATE INDEX IF NOT EXISTS idx_stories_band{i} ON stories (band{i});" for i in range(BANDS)),
+)
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, body, content='articles', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, body ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+    INSERT INTO articles_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+END;
+"""
+
+# Band key stored for articles without a fingerprint; bands() never produces it
+_NO_BAND = -1
+
+# Tickers are matched without exchange suffix or case ("tcs", "TCS.NS" -> "TCS")
+_TICKER_KEY_SQL = "REPLACE(REPLACE(UPPER(t.ticker), '.NS', ''), '.BO', '')"
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+_COLUMNS = ("url", "html", "content_hash", "etag", "last_modified", "title", "body",
+            "published_at", "parsed", "fetched_at", "checked_at")
+
+
+def canonical_url(url: str) -> str:
+    """Lower-cased scheme/host, no fragment, no tracking params, sorted query, no trailing slash."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def ticker_key(ticker: str) -> str:
+    return ticker.strip().upper().replace(".NS", "").replace(".BO", "")
+
+
+def fts_query(text: str) -> str:
+    """Free text -> FTS5 query: every word quoted (implicit AND); a bare OR is kept as the operator."""
+    terms = []
+    for word in re.findall(r"\w+", text):
+        if word == "OR" and terms and terms[-1] != "OR":
+            terms.append("OR")
+        elif word != "OR":
+            terms.append(f'"{word}"')
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+
+def conditional_headers(record: Optional[Dict]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since for a stored page (empty when nothing is stored)."""
+    headers = {}
+    if record and record.get("html") is not None:
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+    return headers
+
+
+class ArticleStore:
+    """SQLite-backed page/article store shared by every news fetch in the process."""
+
+    def __init__(self, path: Path = NEWS_STORE_PATH, max_age_days: float = NEWS_STORE_MAX_AGE_DAYS,
+                 max_articles: int = NEWS_STORE_MAX_ARTICLES):
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.max_articles = max_articles
+        self._lock = threading.Lock()
+        self._conn = None
+        self._next_prune = 0.0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            has_fts = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+            ).fetchone()
+            self._conn.executescript(_FTS_SCHEMA)
+            if not has_fts:
+                # Store created before the index existed: backfill it once
+                self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+                self._conn.commit()
+        return self._conn
+
+    def _row(self, key: str) -> Optional[Dict]:
+        row = self._db().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM articles WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(_COLUMNS, row))
+        record["html"] = zlib.decompress(record["html"]).decode("utf-8") if record["html"] else None
+        record["published_at"] = datetime.fromisoformat(record["published_at"]) if record["published_at"] else None
+        record["parsed"] = bool(record["parsed"])
+        return record
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._row(canonical_url(url))
+
+    def save_page(self, url: str, html: str, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None, now: Optional[float] = None) -> Dict:
+        """Stores a 200 response. The extraction is kept only if the body is byte-identical."""
+        now = now if now is not None else time.time()
+        key = canonical_url(url)
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                """
+                INSERT INTO articles (url, html, content_hash, etag, last_modified, fetched_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    parsed = CASE WHEN articles.content_hash = excluded.content_hash THEN articles.parsed ELSE 0 END,
+                    html = excluded.html, content_hash = excluded.content_hash,
+                    etag = excluded.etag, last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at, checked_at = excluded.checked_at
+                """,
+                (key, zlib.compress(html.encode("utf-8")), digest, etag, last_modified, now, now),
+            )
+            db.commit()
+            if now >= self._next_prune:
+                self._prune(now)
+            return self._row(key)
+
+    def mark_checked(self, url: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Records a successful revalidation (304 Not Modified)."""
+        key = canonical_url(url)
+        with self._lock:
+            db = self._db()
+            db.execute("UPDATE articles SET checked_at = ? WHERE url = ?",
+                       (now if now is not None else time.time(), key))
+            db.commit()
+            return self._row(key)
+
+    def save_parsed(self, url: str, title: str, body: str, published_at: Optional[datetime]) -> Optional[Dict]:
+        key = canonical_url(url)
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE articles SET title = ?, body = ?, published_at = ?, parsed = 1 WHERE url = ?",
+                (title, body, published_at.isoformat() if published_at else None, key),
+            )
+            db.commit()
+            return self._row(key)
+
+    def assign_story(self, url: str, title: str, body: str) -> str:
+        """
+        Story id for a parsed article: that of the closest stored copy within
+        MAX_DISTANCE bits, else the article's own canonical URL. Idempotent per URL.
+        Text without any words (empty, or a script the tokenizer does not cover)
+        has no usable fingerprint and is always its own story.
+        """
+        key = canonical_url(url)
+        text = f"{title or ''}\n{body or ''}"
+        fingerprint = simhash(text) if has_words(text) else None
+        keys = bands(fingerprint) if fingerprint is not None else [_NO_BAND] * BANDS
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT story_id FROM stories WHERE url = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+
+            story_id = key
+            if fingerprint is not None:
+                where = " OR ".join(f"band{i} = ?" for i in range(BANDS))
+                candidates = db.execute(f"SELECT story_id, fingerprint FROM stories WHERE {where}", keys).fetchall()
+                distance, closest = min(
+                    ((hamming_distance(fingerprint, to_unsigned(fp)), sid) for sid, fp in candidates),
+                    default=(MAX_DISTANCE + 1, key),
+                )
+                if distance <= MAX_DISTANCE:
+                    story_id = closest
+
+            band_cols = ", ".join(f"band{i}" for i in range(BANDS))
+            db.execute(
+                f"INSERT INTO stories (url, story_id, fingerprint, {band_cols}) VALUES (?, ?, ?{', ?' * BANDS})",
+                (key, story_id, to_signed(fingerprint or 0), *keys),
+            )
+            db.commit()
+            return story_id
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Applies the age and size limits now; returns how many pages were removed."""
+        with self._lock:
+            return self._prune(now if now is not None else time.time())
+
+    def _prune(self, now: float) -> int:
+        db = self._db()
+        removed = db.execute(
+            "DELETE FROM articles WHERE checked_at < ?", (now - self.max_age_days * 86400,)
+        ).rowcount
+        removed += db.execute(
+            "DELETE FROM articles WHERE url IN "
+            "(SELECT url FROM articles ORDER BY checked_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_articles,),
+        ).rowcount
+        if removed:
+            db.execute("DELETE FROM stories WHERE url NOT IN (SELECT url FROM articles)")
+            db.execute("DELETE FROM story_tickers WHERE story_id NOT IN (SELECT story_id FROM stories)")
+        db.commit()
+        self._next_prune = now + PRUNE_INTERVAL_SECONDS
+        return removed
+
+    def attach_ticker(self, story_id: str, ticker: str, now: Optional[float] = None):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT INTO story_tickers (story_id, ticker, seen_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (story_id, ticker) DO UPDATE SET seen_at = excluded.seen_at",
+                (story_id, ticker, now if now is not None else time.time()),
+            )
+            db.commit()
+
+    def story_tickers(self, story_id: str) -> List[str]:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT ticker FROM story_tickers WHERE story_id = ? ORDER BY seen_at, ticker", (story_id,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def search(self, query: str = "", ticker: Optional[str] = None, since: Optional[date] = None,
+               until: Optional[date] = None, limit: int = 20) -> List[Dict]:
+        """
+        Parsed articles matching all given filters, one per story: best FTS5
+        rank first for keyword queries, otherwise newest first. Dates are
+        inclusive publish days (fetch day when the publish time is unknown).
+        """
+        day = "substr(COALESCE(a.published_at, datetime(a.fetched_at, 'unixepoch')), 1, 10)"
+        joins, clauses, params = [], ["a.parsed = 1"], []
+        order = f"{day} DESC, a.fetched_at DESC"
+        if query:
+            match = fts_query(query)
+            if not match:
+                return []
+            joins.append("JOIN articles_fts f ON f.rowid = a.rowid")
+            clauses.append("articles_fts MATCH ?")
+            params.append(match)
+            order = "f.rank"
+        if ticker:
+            clauses.append(
+                "s.story_id IN (SELECT t.story_id FROM story_tickers t "
+                f"WHERE {_TICKER_KEY_SQL} = ?)"
+            )
+            params.append(ticker_key(ticker))
+        if since:
+            clauses.append(f"{day} >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append(f"{day} <= ?")
+            params.append(until.isoformat())
+
+        sql = (
+            "SELECT a.url, COALESCE(s.story_id, a.url), a.title, a.body, a.published_at, "
+            "(SELECT GROUP_CONCAT(t.ticker, ',') FROM story_tickers t WHERE t.story_id = s.story_id) "
+            f"FROM articles a LEFT JOIN stories s ON s.url = a.url {' '.join(joins)} "
+            f"WHERE {' AND '.join(clauses)} ORDER BY {order} LIMIT ?"
+        )
+        with self._lock:
+            # Over-fetch so collapsing duplicate copies still fills `limit`
+            rows = self._db().execute(sql, (*params, limit * 4)).fetchall()
+
+        results, seen = [], set()
+        for url, story_id, title, body, published_at, tickers in rows:
+            if story_id in seen:
+                continue
+            seen.add(story_id)
+            results.append({
+                'url': url,
+                'story_id': story_id,
+                'title': title,
+                'summary': body[:300] if body else "No content",
+                'published_at': datetime.fromisoformat(published_at) if published_at else None,
+                'tickers': tickers.split(',') if tickers else [],
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+article_store = ArticleStore()
@@ -0,0 +1,102 @@
+"""
+Process-wide pooled async HTTP client.
+
+One aiohttp ClientSession lives on a dedicated event-loop thread for the life
+of the process, so connections are pooled and kept alive across calls instead
+of being reopened per request. Synchronous callers (CrewAI tools, worker
+threads) hand coroutines to that loop with `run()`.
+"""
+import atexit
+import asyncio
+import threading
+from typing import Any, Coroutine, Dict, Mapping, NamedTuple, Optional
+
+import aiohttp
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    text: str
+    headers: Mapping[str, str]  # Case-insensitive
+
+
+class PooledHttpClient:
+    """
+    Shared aiohttp session with a bounded connection pool (`limit` overall,
+    `limit_per_host` per host), keep-alive and per-request timeouts.
+    The loop thread and session are created on first use.
+    """
+
+    def __init__(self, limit: int = 20, limit_per_host: int = 4, timeout: float = 10.0,
+                 keepalive: float = 30.0, headers: Optional[Dict[str, str]] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.headers = dict(headers or {})
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="http-io", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            return self._loop
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Runs `coro` on the client's loop and blocks the calling thread for its result."""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("PooledHttpClient.run() called from its own event loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Only touched from the loop thread, so no locking is needed
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=min(5.0, self.timeout)),
+            )
+        return self._session
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """GET `url` on the pooled session. Must be awaited on the client's loop."""
+        async with self._get_session().get(url, headers=headers) as response:
+            text = await response.text(errors="replace")
+            return HttpResponse(response.status, text, response.headers)
+
+    def close(self):
+        """Closes the session and stops the loop thread (registered at exit)."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def _shutdown():
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(5)
+        except Exception as e:
+            logger.debug(f"HTTP client shutdown: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._session = None
@@ -1,38 +1,67 @@
 """
 Job tracking and management for Market-Rover 2.0
 Handles job status, progress tracking, and job lifecycle
+
+The registry is bounded: job metadata is kept in LRU order and finished jobs
+beyond `max_jobs` are evicted, jobs expire `ttl_hours` after they were created,
+and results whose pickled size exceeds `spill_bytes` (reports, DataFrames) are
+written to `spill_dir` and loaded back only when the job is fetched.
 """
 import uuid
 import time
-from typing import Dict, Optional
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
 from threading import Lock
 from datetime import datetime
 
+from config import JOB_REGISTRY_SIZE, JOB_TTL_HOURS, JOB_SPILL_BYTES, JOB_SPILL_DIR
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FINISHED_STATUSES = ('completed', 'failed')
+
 
 class JobManager:
     """
     Manages analysis jobs with status tracking and progress updates.
     Thread-safe for concurrent job management.
     """
-    
-    def __init__(self):
-        """Initialize the job manager."""
-        self.jobs = {}
+
+    def __init__(self, max_jobs: int = JOB_REGISTRY_SIZE, ttl_hours: float = JOB_TTL_HOURS,
+                 spill_dir: Path = JOB_SPILL_DIR, spill_bytes: int = JOB_SPILL_BYTES):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_jobs: Maximum finished jobs kept before the least recently used is evicted
+            ttl_hours: Age after which a job (and its spilled result) is dropped
+            spill_dir: Directory for results larger than `spill_bytes`
+            spill_bytes: Pickled size above which a result is kept on disk
+        """
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
         self.lock = Lock()
-    
+        self.max_jobs = max_jobs
+        self.ttl_hours = ttl_hours
+        self.spill_dir = Path(spill_dir)
+        self.spill_bytes = spill_bytes
+        self._purge_stale_spills()
+
     def create_job(self, portfolio_name: str, stock_count: int) -> str:
         """
         Create a new analysis job.
-        
+
         Args:
             portfolio_name: Name of the portfolio file
             stock_count: Number of stocks to analyze
-            
+
         Returns:
             Unique job ID
         """
         job_id = str(uuid.uuid4())
-        
+
         with self.lock:
             self.jobs[job_id] = {
                 'id': job_id,
@@ -45,15 +74,18 @@ class JobManager:
                 'completed_at': None,
                 'current_stock': None,
                 'result': None,
+                'result_path': None,
                 'error': None
             }
-        
+            evicted = self._expire_locked() + self._evict_locked()
+
+        self._remove_spills(evicted)
         return job_id
-    
+
     def start_job(self, job_id: str):
         """
         Mark a job as started.
-        
+
         Args:
             job_id: Job ID to start
         """
@@ -61,11 +93,11 @@ class JobManager:
             if job_id in self.jobs:
                 self.jobs[job_id]['status'] = 'running'
                 self.jobs[job_id]['started_at'] = datetime.now()
-    
+
     def update_progress(self, job_id: str, progress: float, current_stock: Optional[str] = None):
         """
         Update job progress.
-        
+
         Args:
             job_id: Job ID
             progress: Progress percentage (0-100)
@@ -76,26 +108,36 @@ class JobManager:
                 self.jobs[job_id]['progress'] = min(100, max(0, progress))
                 if current_stock:
                     self.jobs[job_id]['current_stock'] = current_stock
-    
-    def complete_job(self, job_id: str, result: any):
+
+    def complete_job(self, job_id: str, result: Any):
         """
         Mark a job as completed.
-        
+
         Args:
             job_id: Job ID
             result: Analysis result
         """
+        # Serialize outside the lock; large payloads go to disk instead of the registry
+        result_path = self._spill(job_id, result)
+
         with self.lock:
             if job_id in self.jobs:
                 self.jobs[job_id]['status'] = 'completed'
                 self.jobs[job_id]['progress'] = 100
                 self.jobs[job_id]['completed_at'] = datetime.now()
-                self.jobs[job_id]['result'] = result
-    
+                self.jobs[job_id]['result'] = None if result_path else result
+                self.jobs[job_id]['result_path'] = result_path
+                self.jobs.move_to_end(job_id)
+                result_path = None
+            evicted = self._evict_locked()
+
+        # Job vanished (expired/evicted) while its result was being written
+        self._remove_spills(evicted + ([result_path] if result_path else []))
+
     def fail_job(self, job_id: str, error: str):
         """
         Mark a job as failed.
-        
+
         Args:
             job_id: Job ID
             error: Error message
@@ -105,47 +147,123 @@ class JobManager:
                 self.jobs[job_id]['status'] = 'failed'
                 self.jobs[job_id]['completed_at'] = datetime.now()
                 self.jobs[job_id]['error'] = error
-    
+                self.jobs.move_to_end(job_id)
+            evicted = self._evict_locked()
+
+        self._remove_spills(evicted)
+
     def get_job(self, job_id: str) -> Optional[Dict]:
         """
-        Get job information.
-        
+        Get job information, loading a spilled result back from disk.
+
         Args:
             job_id: Job ID
-            
+
         Returns:
             Job dictionary or None if not found
         """
         with self.lock:
-            return self.jobs.get(job_id, None).copy() if job_id in self.jobs else None
-    
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if self._is_expired(job, datetime.now()):
+                del self.jobs[job_id]
+                expired = [job['result_path']] if job['result_path'] else []
+                job = None
+            else:
+                self.jobs.move_to_end(job_id)
+                job = job.copy()
+                expired = []
+
+        self._remove_spills(expired)
+        if job and job['result_path']:
+            job['result'] = self._load(job['result_path'])
+        return job
+
     def get_all_jobs(self) -> list:
         """
-        Get all jobs.
-        
+        Get all jobs (metadata only; spilled results stay on disk, see `get_job`).
+
         Returns:
             List of job dictionaries
         """
         with self.lock:
             return [job.copy() for job in self.jobs.values()]
-    
-    def cleanup_old_jobs(self, max_age_hours: int = 24):
+
+    def cleanup_old_jobs(self, max_age_hours: Optional[float] = None):
         """
         Remove jobs older than specified hours.
-        
+
         Args:
-            max_age_hours: Maximum age in hours before cleanup
+            max_age_hours: Maximum age in hours before cleanup (default: the registry TTL)
         """
-        current_time = datetime.now()
-        
         with self.lock:
-            jobs_to_remove = []
-            for job_id, job in self.jobs.items():
-                age_hours = (current_time - job['created_at']).total_seconds() / 3600
-                if age_hours > max_age_hours:
-                    jobs_to_remove.append(job_id)
-            
-            for job_id in jobs_to_remove:
-                del self.jobs[job_id]
-        
-        return len(jobs_to_remove)
+            removed = self._expire_locked(max_age_hours)
+
+        self._remove_spills(removed)
+        return len(removed)
+
+    def _is_expired(self, job: Dict, now: datetime, max_age_hours: Optional[float] = None) -> bool:
+        max_age = self.ttl_hours if max_age_hours is None else max_age_hours
+        return (now - job['created_at']).total_seconds() / 3600 > max_age
+
+    def _expire_locked(self, max_age_hours: Optional[float] = None) -> list:
+        """Drops expired jobs; returns their spill paths (None for in-memory results)."""
+        now = datetime.now()
+        expired = [job_id for job_id, job in self.jobs.items() if self._is_expired(job, now, max_age_hours)]
+        return [self.jobs.pop(job_id)['result_path'] for job_id in expired]
+
+    def _evict_locked(self) -> list:
+        """Evicts least recently used finished jobs beyond `max_jobs`; returns their spill paths."""
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return []
+        # Pending/running jobs and the most recently used one are never evicted; the UI is still reading them
+        candidates = list(self.jobs.items())[:-1]
+        victims = [job_id for job_id, job in candidates if job['status'] in FINISHED_STATUSES][:excess]
+        return [self.jobs.pop(job_id)['result_path'] for job_id in victims]
+
+    def _spill(self, job_id: str, result: Any) -> Optional[str]:
+        if result is None or isinstance(result, (int, float, bool)):
+            return None
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Job {job_id} result not picklable, keeping in memory: {e}")
+            return None
+        if len(payload) < self.spill_bytes:
+            return None
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self.spill_dir / f"{job_id}.pkl"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(payload)
+            tmp.replace(path)
+            return str(path)
+        except Exception as e:
+            logger.warning(f"Could not spill job {job_id} result to disk, keeping in memory: {e}")
+            return None
+
+    def _load(self, result_path: str) -> Any:
+        try:
+            return pickle.loads(Path(result_path).read_bytes())
+        except Exception as e:
+            logger.warning(f"Spilled job result unavailable ({result_path}): {e}")
+            return None
+
+    def _remove_spills(self, paths: list):
+        for path in paths:
+            if path:
+                Path(path).unlink(missing_ok=True)
+
+    def _purge_stale_spills(self):
+        """Removes results spilled by earlier processes that are past the TTL."""
+        if not self.spill_dir.is_dir():
+            return
+        cutoff = time.time() - self.ttl_hours * 3600
+        for path in self.spill_dir.glob("*.pkl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,151 @@
+"""
+Per-call token and latency accounting for CrewAI LLM invocations.
+
+A listener on the CrewAI event bus pairs each LLMCallStarted event with its
+Completed/Failed event (by call_id) and records prompt/completion tokens, time
+to first token (first stream chunk; equal to latency for non-streamed calls),
+total latency, and the agent, task and model, via utils.metrics.track_llm_call.
+Failed calls are recorded too. A call that follows failures of the same
+agent/task/model (the agent executor or retry_operation trying again) is
+recorded with its attempt number, which is what the retry counts are built on.
+
+Calls whose closing event never arrives are dropped after PENDING_CALL_TTL
+seconds, and at most MAX_PENDING_CALLS are tracked at once.
+"""
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+from utils.metrics import track_llm_call
+
+logger = get_logger(__name__)
+
+PENDING_CALL_TTL = 600.0
+MAX_PENDING_CALLS = 1000
+
+_listener = None
+_install_lock = Lock()
+
+
+def _tokens(usage: Optional[Dict[str, Any]]) -> tuple:
+    usage = usage or {}
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0
+    completion = usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+    return int(prompt), int(completion)
+
+
+def _seconds(start: datetime, end: Optional[datetime]) -> float:
+    return max(0.0, (end - start).total_seconds()) if end else 0.0
+
+
+class LLMCallTracker:
+    """
+    Joins the start/first-chunk/end events of one call. Sync handlers on the
+    event bus run on a thread pool, so events may arrive in any order.
+    """
+
+    def __init__(self, sink=track_llm_call, ttl: float = PENDING_CALL_TTL, max_pending: int = MAX_PENDING_CALLS):
+        self._sink = sink
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        # Consecutive failures per (agent, task, model), for attempt numbers
+        self._failures: Dict[tuple, int] = {}
+        self._lock = Lock()
+        self.dropped = 0
+
+    def started(self, event):
+        self._merge(event.call_id, started=event.timestamp, model=event.model,
+                    agent=event.agent_role, task=event.task_name)
+
+    def chunk(self, event):
+        with self._lock:
+            call = self._pending(event.call_id)
+            if "first_token" not in call or event.timestamp < call["first_token"]:
+                call["first_token"] = event.timestamp
+
+    def completed(self, event):
+        prompt, completion = _tokens(event.usage)
+        self._merge(event.call_id, ended=event.timestamp, status="success",
+                    prompt_tokens=prompt, completion_tokens=completion,
+                    model=event.model, agent=event.agent_role, task=event.task_name)
+
+    def failed(self, event):
+        self._merge(event.call_id, ended=event.timestamp, status="failed",
+                    model=event.model, agent=event.agent_role, task=event.task_name)
+
+    def _merge(self, call_id: str, **fields):
+        with self._lock:
+            call = self._pending(call_id)
+            call.update({k: v for k, v in fields.items() if v is not None or k not in call})
+            if "started" not in call or "ended" not in call:
+                return
+            call = self._calls.pop(call_id)
+            key = (call.get("agent"), call.get("task"), call.get("model"))
+            attempt = self._failures.pop(key, 0) + 1
+            if call["status"] == "failed":
+                self._failures[key] = attempt
+
+        latency = _seconds(call["started"], call["ended"])
+        first_token = call.get("first_token")
+        self._sink(
+            model=call.get("model") or "unknown",
+            agent=call.get("agent") or "unknown",
+            task=call.get("task") or "unknown",
+            prompt_tokens=call.get("prompt_tokens", 0),
+            completion_tokens=call.get("completion_tokens", 0),
+            ttft_sec=_seconds(call["started"], first_token) if first_token else latency,
+            latency_sec=latency,
+            status=call["status"],
+            attempt=attempt,
+        )
+
+    def _pending(self, call_id: str) -> Dict[str, Any]:
+        """The open record for `call_id`, evicting abandoned calls first (lock held)."""
+        call = self._calls.get(call_id)
+        if call is not None:
+            return call
+        now = time.monotonic()
+        # Dicts keep insertion order, so the oldest calls are at the front
+        for stale_id, stale in list(self._calls.items()):
+            if now - stale["_seen"] < self.ttl and len(self._calls) < self.max_pending:
+                break
+            del self._calls[stale_id]
+            self.dropped += 1
+        call = self._calls[call_id] = {"_seen": now}
+        return call
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def install_usage_listener():
+    """Registers the accounting listener on the CrewAI event bus once per process."""
+    global _listener
+    with _install_lock:
+        if _listener is not None:
+            return _listener
+        try:
+            from crewai.events import BaseEventListener
+            from crewai.events.types.llm_events import (
+                LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent, LLMStreamChunkEvent,
+            )
+        except Exception as e:
+            logger.warning(f"LLM usage accounting unavailable (crewai events not importable): {e}")
+            return None
+
+        tracker = LLMCallTracker()
+
+        class LLMUsageListener(BaseEventListener):
+            def setup_listeners(self, bus):
+                bus.on(LLMCallStartedEvent)(lambda source, event: tracker.started(event))
+                bus.on(LLMStreamChunkEvent)(lambda source, event: tracker.chunk(event))
+                bus.on(LLMCallCompletedEvent)(lambda source, event: tracker.completed(event))
+                bus.on(LLMCallFailedEvent)(lambda source, event: tracker.failed(event))
+
+        _listener = LLMUsageListener()
+        _listener.tracker = tracker
+        return _listener
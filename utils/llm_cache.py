@@ -0,0 +1,180 @@
+"""
+Content-addressed disk cache for LLM responses.
+
+Every CrewAI LLM built in agents.py is wrapped so that `call()` first looks up
+sha256(model, temperature, messages, tool schemas, response model). The messages
+carry the task prompt plus every tool observation the agent has seen, so a
+change in the underlying market data produces a new key. Entries expire at
+the next NSE open (09:15 IST), so a re-run of the same portfolio on the same
+market day, `scripts/train_brain.py` re-runs and `retry_operation` retries
+reuse completed calls instead of paying for them again.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timedelta, time as dtime
+from pathlib import Path
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH
+from utils.logger import get_logger
+from utils.metrics import track_llm_call
+
+logger = get_logger(__name__)
+
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_OPEN = dtime(9, 15)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache (expires_at);
+"""
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """The next weekday 09:15 IST strictly after `now`."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    open_at = datetime.combine(now.date(), MARKET_OPEN, tzinfo=IST)
+    if open_at <= now:
+        open_at += timedelta(days=1)
+    while open_at.weekday() >= 5:
+        open_at += timedelta(days=1)
+    return open_at
+
+
+def _tool_schemas(tools) -> list:
+    schemas = []
+    for t in tools or []:
+        if isinstance(t, dict):
+            fn = t.get("function", t)
+            schemas.append({"name": str(fn.get("name", "")), "parameters": fn.get("parameters")})
+        else:
+            args = getattr(t, "args_schema", None)
+            schema = args.model_json_schema() if hasattr(args, "model_json_schema") else None
+            schemas.append({"name": str(getattr(t, "name", type(t).__name__)), "parameters": schema})
+    return sorted(schemas, key=lambda s: s["name"])
+
+
+def cache_key(model: str, messages: Any, temperature: Optional[float] = None,
+              tools=None, response_model=None) -> str:
+    """Stable hash of everything that determines an LLM response."""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "messages": messages,
+        "tools": _tool_schemas(tools),
+        "response_model": getattr(response_model, "__name__", None),
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response store shared by every wrapped LLM in the process."""
+
+    def __init__(self, path: Path = LLM_CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[str]:
+        now = now if now is not None else time.time()
+        with self._lock:
+            row = self._db().execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str, expires_at: Optional[float] = None):
+        expires_at = expires_at if expires_at is not None else next_market_open().timestamp()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, time.time(), expires_at),
+            )
+            db.commit()
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = now if now is not None else time.time()
+        with self._lock:
+            db = self._db()
+            removed = db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            db.commit()
+            return removed
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "path": str(self.path)}
+
+
+llm_cache = LLMResponseCache()
+
+
+def install_llm_cache(llm, cache: Optional[LLMResponseCache] = None):
+    """
+    Wraps `llm.call` with the response cache (no-op when LLM_CACHE=false).
+    Calls that offer tools are cached like any other (the tool schemas are part
+    of the key), but only plain-text final answers are stored: a tool-call
+    response is returned uncached, and calls given `available_functions` go
+    straight to the model because the LLM executes those tools itself.
+    """
+    if not LLM_CACHE_ENABLED or getattr(llm, "_response_cache", None) is not None:
+        return llm
+    cache = cache or llm_cache
+    original_call = llm.call
+    model = str(getattr(llm, "model", ""))
+    temperature = getattr(llm, "temperature", None)
+
+    def cached_call(messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if available_functions:
+            return original_call(messages, tools=tools, callbacks=callbacks,
+                                 available_functions=available_functions, **kwargs)
+        key = cache_key(model, messages, temperature, tools, kwargs.get("response_model"))
+        try:
+            hit = cache.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            hit = None
+        if hit is not None:
+            agent, task = kwargs.get("from_agent"), kwargs.get("from_task")
+            track_llm_call(model, agent=getattr(agent, "role", None) or "unknown",
+                           task=getattr(task, "name", None) or "unknown", status="cached")
+            return hit
+
+        response = original_call(messages, tools=tools, callbacks=callbacks,
+                                 available_functions=available_functions, **kwargs)
+        if isinstance(response, str) and response.strip():
+            try:
+                cache.put(key, model, response)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        return response
+
+    # LLM instances are pydantic models; bypass field validation for the wrapper
+    object.__setattr__(llm, "call", cached_call)
+    object.__setattr__(llm, "_response_cache", cache)
+    return llm
@@ -0,0 +1,207 @@
+"""
+Process-wide snapshot of global and domestic index prices.
+
+The global cues, Nifty/sector context and sector rotation table are the same
+for every user at any moment, so every index is fetched together in one
+`yf.download` and the closes are held in memory. A scheduled refresher
+(`start()`, run by both servers) re-downloads them every MARKET_SNAPSHOT_TTL
+seconds during NSE hours and every MARKET_SNAPSHOT_OFF_HOURS_TTL seconds
+otherwise, so readers never download on the request path: a reader that finds
+the snapshot due gets the current closes immediately while a single background
+refresh replaces them. A failed refresh keeps serving the last good snapshot
+and is retried after MARKET_SNAPSHOT_RETRY seconds.
+
+The shared snapshot holds SNAPSHOT_PERIOD of history, enough for the 3-month
+sector horizon; the sector rotation table (rover_tools.sector_snapshot) is
+derived from it rather than downloaded separately.
+"""
+import threading
+import time
+from datetime import datetime, time as dtime
+from typing import Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import yfinance as yf
+
+from config import MARKET_SNAPSHOT_OFF_HOURS_TTL, MARKET_SNAPSHOT_RETRY, MARKET_SNAPSHOT_TTL
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GLOBAL_INDICES: Dict[str, str] = {
+    "Brent Crude ($)": "CL=F",
+    "Gold ($)": "GC=F",
+    "NASDAQ": "^NDX",
+    "S&P 500": "^GSPC",
+    "USD/INR": "INR=X",
+    "VIX": "^VIX",
+    "US 10Y Yield": "^TNX",
+    "Dollar Index": "DX-Y.NYB",
+}
+
+DOMESTIC_INDICES: Dict[str, str] = {
+    "Nifty 50": "^NSEI",
+    "Bank Nifty": "^NSEBANK",
+    "Nifty IT": "^CNXIT",
+    "Nifty Auto": "^CNXAUTO",
+    "Nifty Pharma": "^CNXPHARMA",
+    "Nifty FMCG": "^CNXFMCG",
+    "Nifty Metal": "^CNXMETAL",
+    "Nifty Energy": "^CNXENERGY",
+    "Nifty Infra": "^CNXINFRA",
+    "Nifty Realty": "^CNXREALTY",
+    "Nifty PSU Bank": "^CNXPSUBANK",
+}
+
+SNAPSHOT_PERIOD = "3mo"
+
+# Sessions back for each return horizon read off the snapshot; the sector table and
+# market context share them so a "week" means the same lookback everywhere
+HORIZON_SESSIONS: Dict[str, int] = {"1D": 1, "1W": 4, "1M": 21}
+
+
+def change_over(series: pd.Series, sessions: int) -> float:
+    """% change from `sessions` closes back to the last close (from the first close if the series is shorter)."""
+    current = series.iloc[-1]
+    base = series.iloc[-(sessions + 1)] if len(series) > sessions else series.iloc[0]
+    return ((current - base) / base) * 100
+
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_OPEN = dtime(9, 15)
+MARKET_CLOSE = dtime(15, 30)
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """True on weekdays between 09:15 and 15:30 IST (holidays not modelled)."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+
+class MarketSnapshot:
+    """
+    Daily closes for a fixed symbol set, refreshed together every `ttl` seconds
+    during NSE hours and every `off_hours_ttl` seconds otherwise.
+    """
+
+    def __init__(self, symbols: Iterable[str], period: str = "1mo",
+                 ttl: float = MARKET_SNAPSHOT_TTL, retry: float = MARKET_SNAPSHOT_RETRY,
+                 off_hours_ttl: float = MARKET_SNAPSHOT_OFF_HOURS_TTL):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.period = period
+        self.ttl = ttl
+        self.retry = retry
+        self.off_hours_ttl = off_hours_ttl
+        self._closes = pd.DataFrame()
+        self._fetched_at: Optional[float] = None
+        self._next_refresh = 0.0
+        # Held by whichever thread is downloading; at most one refresh runs at a time
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _download(self) -> pd.DataFrame:
+        data = yf.download(self.symbols, period=self.period, progress=False)
+        closes = data['Close'] if 'Close' in data else data
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(self.symbols[0])
+        return closes.dropna(how='all')
+
+    def interval(self, at: Optional[datetime] = None) -> float:
+        """Seconds a successful refresh stays fresh (shorter while NSE is open)."""
+        return self.ttl if is_market_hours(at) else self.off_hours_ttl
+
+    def refresh(self, now: Optional[float] = None) -> bool:
+        """Re-downloads every symbol; on failure keeps the previous closes. Returns success."""
+        now = time.monotonic() if now is None else now
+        try:
+            closes = self._download()
+            if closes.empty:
+                raise ValueError("empty download")
+        except Exception as e:
+            logger.warning(f"Market snapshot refresh failed ({e}); serving {'stale' if not self._closes.empty else 'no'} data")
+            self._next_refresh = now + self.retry
+            return False
+        self._closes = closes
+        self._fetched_at = now
+        self._next_refresh = now + self.interval()
+        return True
+
+    def _refresh_in_background(self, now: float):
+        """Starts one background refresh unless another is already running."""
+        if not self._lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh(now)
+            finally:
+                self._lock.release()
+
+        self._worker = threading.Thread(target=run, name="market-snapshot-refresh", daemon=True)
+        self._worker.start()
+
+    def frame(self, now: Optional[float] = None) -> pd.DataFrame:
+        """
+        All closes (one column per symbol). A due snapshot is served as-is while
+        one background refresh replaces it; only a cold start (nothing fetched
+        yet) waits for the download, since there is nothing else to serve.
+        """
+        now = time.monotonic() if now is None else now
+        if now < self._next_refresh:
+            return self._closes
+        if self._fetched_at is None:
+            with self._lock:
+                # Callers that queued behind the first download reuse its result
+                if self._fetched_at is None and now >= self._next_refresh:
+                    self.refresh(now)
+        else:
+            self._refresh_in_background(now)
+        return self._closes
+
+    def closes(self, symbol: str, now: Optional[float] = None) -> pd.Series:
+        """Close series for `symbol`, oldest first, without gaps (empty if unavailable)."""
+        frame = self.frame(now)
+        if symbol not in frame:
+            return pd.Series(dtype=float)
+        return frame[symbol].dropna()
+
+    def reset(self):
+        """Drops the held closes so the next read downloads again (used by tests)."""
+        with self._lock:
+            self._closes = pd.DataFrame()
+            self._fetched_at = None
+            self._next_refresh = 0.0
+
+    def _run(self):
+        while True:
+            if self._stop.wait(max(self._next_refresh - time.monotonic(), 1.0)):
+                return
+            with self._lock:
+                if time.monotonic() >= self._next_refresh:
+                    self.refresh()
+
+    def start(self):
+        """Starts the scheduled refresher so readers always find a fresh snapshot (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="market-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def age(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the last successful refresh (None before the first one)."""
+        if self._fetched_at is None:
+            return None
+        return (time.monotonic() if now is None else now) - self._fetched_at
+
+
+market_snapshot = MarketSnapshot(list(GLOBAL_INDICES.values()) + list(DOMESTIC_INDICES.values()),
+                                 period=SNAPSHOT_PERIOD)
@@ -3,6 +3,7 @@ import functools
 import logging
 import json
 import uuid
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from contextlib import contextmanager
@@ -170,6 +171,27 @@ def track_agent_kpi(agent_name: str, kpi_name: str, value: Any, metadata: Option
     }
     _append_to_jsonl(_get_metric_file("agent_kpis"), data)
 
+def track_llm_call(model: str, agent: str, task: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+                   ttft_sec: float = 0.0, latency_sec: float = 0.0, status: str = "success", attempt: int = 1):
+    """
+    Log one LLM invocation (status: success | failed | cached).
+    `attempt` is 2+ when the call retries a failed call of the same agent/task/model.
+    Aggregated per agent, task and model by get_api_usage.
+    """
+    data = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "agent": agent,
+        "task": task,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "ttft_sec": round(ttft_sec, 4),
+        "latency_sec": round(latency_sec, 4),
+        "status": status,
+        "attempt": attempt
+    }
+    _append_to_jsonl(_get_metric_file("llm_calls"), data)
+
 def track_engagement(username: str, event_type: str, description: str, metadata: Optional[Dict[str, Any]] = None):
     """
     Log user engagement events (high-value actions).
@@ -200,17 +222,73 @@ def track_engagement_failure(username: str, event_type: str, error_msg: str, met
 
 # --- Reporting Functions (Added to fix ImportError) ---
 
+def _read_jsonl(file_path: Path):
+    if not file_path.exists():
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def _usage_bucket() -> Dict[str, Any]:
+    return {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'retries': 0,
+            'failed': 0, 'cached': 0, 'latency_sec': 0.0, 'ttft_sec': 0.0}
+
+def _finish_bucket(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    calls = bucket['calls'] or 1
+    return {
+        'calls': bucket['calls'],
+        'prompt_tokens': bucket['prompt_tokens'],
+        'completion_tokens': bucket['completion_tokens'],
+        'total_tokens': bucket['prompt_tokens'] + bucket['completion_tokens'],
+        'retries': bucket['retries'],
+        'failed': bucket['failed'],
+        'cached': bucket['cached'],
+        'avg_latency_sec': round(bucket.pop('latency_sec') / calls, 3),
+        'avg_ttft_sec': round(bucket.pop('ttft_sec') / calls, 3),
+    }
+
 def get_api_usage() -> Dict[str, Any]:
     """
-    Retrieve current API usage stats.
-    Currently returns a safe default.
+    Retrieve today's LLM usage from the llm_calls metrics log.
+    'today' counts provider calls (cache hits excluded) against LLM_DAILY_LIMIT;
+    'by_agent', 'by_task' and 'by_model' break down tokens, latency, failed
+    calls and retries (calls made again after a failure) so the most expensive,
+    slowest or flakiest agent stands out.
     """
-    # TODO: Implement actual tracking via a persistent counter or checking Quota API
-    return {
-        'today': 0,
-        'limit': 1000,
-        'remaining': 1000
+    limit = int(os.getenv("LLM_DAILY_LIMIT", "1000"))
+    totals = _usage_bucket()
+    groups = {'by_agent': {}, 'by_task': {}, 'by_model': {}}
+
+    try:
+        for record in _read_jsonl(_get_metric_file("llm_calls")):
+            status = record.get('status', 'success')
+            keys = {'by_agent': record.get('agent'), 'by_task': record.get('task'), 'by_model': record.get('model')}
+            for bucket in [totals] + [groups[g].setdefault(k or 'unknown', _usage_bucket()) for g, k in keys.items()]:
+                if status == 'cached':
+                    bucket['cached'] += 1
+                    continue
+                bucket['calls'] += 1
+                bucket['retries'] += record.get('attempt', 1) > 1
+                bucket['failed'] += status == 'failed'
+                bucket['prompt_tokens'] += record.get('prompt_tokens', 0)
+                bucket['completion_tokens'] += record.get('completion_tokens', 0)
+                bucket['latency_sec'] += record.get('latency_sec', 0.0)
+                bucket['ttft_sec'] += record.get('ttft_sec', 0.0)
+    except Exception as e:
+        logger.error(f"Error reading LLM usage: {e}")
+
+    usage = {
+        'today': totals['calls'],
+        'limit': limit,
+        'remaining': max(0, limit - totals['calls']),
+        **_finish_bucket(totals),
     }
+    for group, buckets in groups.items():
+        usage[group] = {name: _finish_bucket(b) for name, b in buckets.items()}
+    return usage
 
 def get_performance_stats() -> Dict[str, Any]:
     """
@@ -0,0 +1,62 @@
+"""
+SimHash fingerprints for near-duplicate news detection.
+
+A 64-bit SimHash over word 3-gram shingles of title + body maps reworded or
+syndicated copies of the same story to fingerprints a few bits apart (unrelated
+texts sit ~32 bits apart). Splitting the fingerprint into eight 8-bit bands
+gives exact lookup keys: any two fingerprints within MAX_DISTANCE (< 8) bits
+share at least one band.
+"""
+import re
+import hashlib
+from collections import Counter
+from typing import List
+
+FINGERPRINT_BITS = 64
+BAND_BITS = 8
+BANDS = FINGERPRINT_BITS // BAND_BITS
+MAX_DISTANCE = BANDS - 1
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _shingles(text: str, size: int = 3) -> Counter:
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < size:
+        return Counter([" ".join(tokens)]) if tokens else Counter()
+    return Counter(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+def has_words(text: str) -> bool:
+    """False when `text` yields no shingles, so its SimHash (0) says nothing about it."""
+    return bool(_TOKEN.search(text.lower()))
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of `text` (0 for text without any words)."""
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in _shingles(text).items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if (h >> bit) & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def bands(fingerprint: int) -> List[int]:
+    """The fingerprint's BANDS lookup keys (low band first)."""
+    band_mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & band_mask for i in range(BANDS)]
+
+
+def to_signed(fingerprint: int) -> int:
+    """SQLite INTEGER is signed 64-bit."""
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >= 1 << (FINGERPRINT_BITS - 1) else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    return value & _MASK
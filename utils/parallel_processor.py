@@ -1,29 +1,66 @@
 """
 Parallel stock analysis processor for Market-Rover 2.0
-Handles concurrent processing of multiple stocks using ThreadPoolExecutor
+Schedules independent per-stock work across a bounded worker pool, pacing
+each data provider (yfinance, news sites, NSE) with its own rate limit.
 """
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Callable, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from typing import List, Dict, Callable, Optional, Tuple
 from threading import Lock
 
+from config import PROVIDER_RATE_LIMITS
+
+DEFAULT_PROVIDER = 'default'
+
+
+class ProviderRateLimiter:
+    """
+    Token-bucket pacing for one provider: `rate` calls per second on average,
+    with up to `burst` calls allowed back to back.
+    Not thread-safe on its own; the scheduler calls it under its lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.burst = max(1, int(burst))
+        self._tat = 0.0  # Theoretical arrival time of the next call
+
+    def next_slot(self, now: float) -> float:
+        """Earliest monotonic time at which the next call may start."""
+        return max(self._tat, now) - (self.burst - 1) * self.interval
+
+    def reserve(self, now: float) -> float:
+        """Claims the next slot and returns how long the caller must wait for it."""
+        start = max(self.next_slot(now), now)
+        self._tat = max(self._tat, now) + self.interval
+        return start - now
+
 
 class ParallelStockProcessor:
     """
     Orchestrates parallel analysis of stocks in a portfolio.
-    Uses ThreadPoolExecutor to process multiple stocks concurrently.
+
+    Work is split into (stock, step) units. Idle workers always take the unit
+    whose provider frees up soonest, so a slow news site does not hold up
+    yfinance calls and no worker sleeps while other providers have capacity.
     """
-    
-    def __init__(self, max_workers: int = 5, rate_limit_delay: float = 1.0):
+
+    def __init__(self, max_workers: int = 5, rate_limit_delay: float = 1.0,
+                 provider_limits: Optional[Dict[str, float]] = None):
         """
         Initialize the parallel processor.
-        
+
         Args:
             max_workers: Maximum number of concurrent stock analyses (default: 5)
-            rate_limit_delay: Delay in seconds between API calls per thread (default: 1.0)
+            rate_limit_delay: Delay in seconds between API calls per thread (default: 1.0).
+                Paces the 'default' provider at max_workers calls per delay.
+            provider_limits: Calls per second per provider (default: config.PROVIDER_RATE_LIMITS)
         """
         self.max_workers = max_workers
         self.rate_limit_delay = rate_limit_delay
+        self.provider_limits = dict(PROVIDER_RATE_LIMITS if provider_limits is None else provider_limits)
         self.progress_lock = Lock()
         self.progress_data = {
             'total': 0,
@@ -31,75 +68,149 @@ class ParallelStockProcessor:
             'failed': 0,
             'current_stocks': set()
         }
-    
+
+    def _make_limiter(self, provider: str) -> ProviderRateLimiter:
+        if provider in self.provider_limits:
+            return ProviderRateLimiter(self.provider_limits[provider], burst=self.max_workers)
+        # Same average throughput as the old sleep-per-stock pool, without the up-front sleep
+        rate = self.max_workers / self.rate_limit_delay if self.rate_limit_delay > 0 else 0
+        return ProviderRateLimiter(rate, burst=self.max_workers)
+
     def process_stocks(
-        self, 
-        stocks: List[Dict], 
+        self,
+        stocks: List[Dict],
         process_func: Callable,
         progress_callback: Optional[Callable] = None
     ) -> Dict:
         """
         Process multiple stocks in parallel.
-        
+
         Args:
             stocks: List of stock dictionaries with 'Symbol' and 'Company Name'
             process_func: Function to process each stock (takes stock dict, returns result)
             progress_callback: Optional callback for progress updates (percentage, stock_name)
-        
+
         Returns:
             Dictionary with results and errors
         """
+        outcome = self.run_pipeline(stocks, {'process': (DEFAULT_PROVIDER, process_func)}, progress_callback)
+        for entry in outcome['results']:
+            entry['result'] = entry['result']['process']
+        for entry in outcome['errors']:
+            entry['error'] = entry['error']['process']
+        return outcome
+
+    def run_pipeline(
+        self,
+        stocks: List[Dict],
+        steps: Dict[str, Tuple[str, Callable]],
+        progress_callback: Optional[Callable] = None
+    ) -> Dict:
+        """
+        Runs every step for every stock, each step rate-limited by its provider.
+
+        Args:
+            stocks: List of stock dictionaries with 'Symbol'
+            steps: Step name -> (provider name, function taking the stock dict)
+            progress_callback: Optional callback (percentage, stock_name, 'completed'|'failed'),
+                called from this thread once all of a stock's steps have finished
+
+        Returns:
+            Dictionary with results and errors. A stock is a result if any step
+            succeeded ('result' maps step -> output, 'errors' step -> message) and
+            an error if every step failed ('error' maps step -> message).
+        """
         self.progress_data['total'] = len(stocks)
         self.progress_data['completed'] = 0
         self.progress_data['failed'] = 0
         self.progress_data['current_stocks'] = set()
-        
+
+        queues: Dict[str, deque] = {}
+        for index, stock in enumerate(stocks):
+            for step, (provider, func) in steps.items():
+                queues.setdefault(provider, deque()).append((index, stock, step, func))
+        limiters = {provider: self._make_limiter(provider) for provider in queues}
+        sched_lock = Lock()
+        events: Queue = Queue()
+
+        def next_unit():
+            with sched_lock:
+                now = time.monotonic()
+                ready = [(limiters[p].next_slot(now), p) for p, q in queues.items() if q]
+                if not ready:
+                    return None
+                _, provider = min(ready)
+                unit = queues[provider].popleft()
+                wait = limiters[provider].reserve(now)
+            if wait > 0:
+                time.sleep(wait)
+            return unit
+
+        def worker():
+            while True:
+                unit = next_unit()
+                if unit is None:
+                    return
+                index, stock, step, func = unit
+                with self.progress_lock:
+                    self.progress_data['current_stocks'].add(stock.get('Symbol', 'Unknown'))
+                try:
+                    events.put((index, step, True, func(stock)))
+                except Exception as e:
+                    events.put((index, step, False, str(e)))
+                except BaseException as e:
+                    # SystemExit/KeyboardInterrupt: hand it to the collector so it never blocks
+                    events.put((index, step, None, e))
+                    raise
+
+        outputs = [{} for _ in stocks]
+        failures = [{} for _ in stocks]
+        remaining = [len(steps)] * len(stocks)
         results = []
         errors = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all stock processing jobs
-            future_to_stock = {
-                executor.submit(self._process_single_stock, stock, process_func): stock 
-                for stock in stocks
-            }
-            
+
+        units = len(stocks) * len(steps)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, units))) as executor:
+            for _ in range(min(self.max_workers, units)):
+                executor.submit(worker)
+
             # Collect results as they complete
-            for future in as_completed(future_to_stock):
-                stock = future_to_stock[future]
+            for _ in range(units):
+                index, step, ok, value = events.get()
+                if ok is None:
+                    with sched_lock:
+                        queues.clear()  # Idle the other workers so the pool can shut down
+                    raise value
+                (outputs if ok else failures)[index][step] = value
+                remaining[index] -= 1
+                if remaining[index]:
+                    continue
+
+                stock = stocks[index]
                 stock_symbol = stock.get('Symbol', 'Unknown')
-                
-                try:
-                    result = future.result()
+                success = bool(outputs[index])
+                if success:
                     results.append({
                         'stock': stock,
-                        'result': result,
+                        'result': outputs[index],
+                        'errors': failures[index],
                         'success': True
                     })
-                    
-                    with self.progress_lock:
-                        self.progress_data['completed'] += 1
-                        self.progress_data['current_stocks'].discard(stock_symbol)
-                        
-                    if progress_callback:
-                        progress_pct = (self.progress_data['completed'] / self.progress_data['total']) * 100
-                        progress_callback(progress_pct, stock_symbol, 'completed')
-                        
-                except Exception as e:
+                else:
                     errors.append({
                         'stock': stock,
-                        'error': str(e),
+                        'error': failures[index],
                         'success': False
                     })
-                    
-                    with self.progress_lock:
-                        self.progress_data['failed'] += 1
-                        self.progress_data['current_stocks'].discard(stock_symbol)
-                    
-                    if progress_callback:
-                        progress_pct = (self.progress_data['completed'] / self.progress_data['total']) * 100
-                        progress_callback(progress_pct, stock_symbol, 'failed')
-        
+
+                with self.progress_lock:
+                    self.progress_data['completed' if success else 'failed'] += 1
+                    self.progress_data['current_stocks'].discard(stock_symbol)
+
+                if progress_callback:
+                    progress_pct = (self.progress_data['completed'] / self.progress_data['total']) * 100
+                    progress_callback(progress_pct, stock_symbol, 'completed' if success else 'failed')
+
         return {
             'results': results,
             'errors': errors,
@@ -109,36 +220,11 @@ class ParallelStockProcessor:
                 'failed': len(errors)
             }
         }
-    
-    def _process_single_stock(self, stock: Dict, process_func: Callable):
-        """
-        Process a single stock with rate limiting.
-        
-        Args:
-            stock: Stock dictionary
-            process_func: Function to process the stock
-            
-        Returns:
-            Result from process_func
-        """
-        stock_symbol = stock.get('Symbol', 'Unknown')
-        
-        # Track current stock being processed
-        with self.progress_lock:
-            self.progress_data['current_stocks'].add(stock_symbol)
-        
-        # Rate limiting - sleep before making API calls
-        time.sleep(self.rate_limit_delay)
-        
-        # Execute the processing function
-        result = process_func(stock)
-        
-        return result
-    
+
     def get_progress(self) -> Dict:
         """
         Get current progress information.
-        
+
         Returns:
             Dictionary with progress data
         """
@@ -149,6 +235,6 @@ class ParallelStockProcessor:
                 'failed': self.progress_data['failed'],
                 'in_progress': len(self.progress_data['current_stocks']),
                 'current_stocks': list(self.progress_data['current_stocks']),
-                'percentage': (self.progress_data['completed'] / self.progress_data['total'] * 100) 
+                'percentage': (self.progress_data['completed'] / self.progress_data['total'] * 100)
                               if self.progress_data['total'] > 0 else 0
             }
@@ -0,0 +1,161 @@
+"""
+Append-only ledger of agent predictions.
+
+Every `save_prediction_tool` call is a single INSERT into a SQLite table (WAL
+mode), so concurrent agents and processes append without rewriting or
+truncating anything, and readers never block writers. Rows are indexed by
+ticker, date and outcome; outcome evaluation updates rows in place by id.
+
+On first open an existing `data/memory.json` (the previous JSON ledger) is
+imported once; the file itself is left untouched.
+"""
+import json
+import time
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import PREDICTION_LEDGER_PATH, PROJECT_ROOT
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "Pending"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    signal TEXT NOT NULL,
+    confidence TEXT,
+    outcome TEXT NOT NULL DEFAULT 'Pending',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_ticker_date ON predictions (ticker, date);
+CREATE INDEX IF NOT EXISTS idx_predictions_outcome_date ON predictions (outcome, date);
+CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions (date);
+"""
+
+_COLUMNS = "id, date, ticker, signal, confidence, outcome, created_at"
+
+# PRAGMA user_version once the legacy JSON ledger has been considered for import
+_IMPORTED_VERSION = 1
+
+
+class PredictionLedger:
+    """SQLite-backed prediction ledger shared by every agent in the process."""
+
+    def __init__(self, path: Path = PREDICTION_LEDGER_PATH, legacy_json: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit: each append/update is its own atomic statement;
+            # the timeout waits out other processes' write locks
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._import_legacy(conn)
+            self._conn = conn
+        return self._conn
+
+    def _import_legacy(self, conn: sqlite3.Connection):
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _IMPORTED_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have imported while we waited for the write lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _IMPORTED_VERSION:
+                entries = self._read_legacy()
+                conn.executemany(
+                    "INSERT INTO predictions (date, ticker, signal, confidence, outcome, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(str(e.get("date", "")), str(e.get("ticker", "")).upper(), str(e.get("signal", "")),
+                      e.get("confidence"), e.get("outcome") or PENDING, time.time())
+                     for e in entries if isinstance(e, dict) and e.get("ticker")],
+                )
+                conn.execute(f"PRAGMA user_version = {_IMPORTED_VERSION}")
+                if entries:
+                    logger.info(f"Imported {len(entries)} predictions from {self.legacy_json}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _read_legacy(self) -> list:
+        if not self.legacy_json or not self.legacy_json.exists():
+            return []
+        try:
+            with open(self.legacy_json, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception as e:
+            logger.error(f"Failed to read legacy memory file: {e}")
+            return []
+
+    def append(self, ticker: str, signal: str, confidence: Optional[str] = None,
+               on: Optional[date] = None, outcome: str = PENDING) -> int:
+        """Records a prediction and returns its id."""
+        on = on or date.today()
+        with self._lock:
+            cursor = self._db().execute(
+                "INSERT INTO predictions (date, ticker, signal, confidence, outcome, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (on.isoformat(), ticker.upper(), signal, confidence, outcome, time.time()),
+            )
+            return cursor.lastrowid
+
+    def latest(self, ticker: str) -> Optional[Dict]:
+        """The most recent prediction for `ticker` (newest date, then newest entry)."""
+        with self._lock:
+            row = self._db().execute(
+                f"SELECT {_COLUMNS} FROM predictions WHERE ticker = ? ORDER BY date DESC, id DESC LIMIT 1",
+                (ticker.upper(),),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def pending(self, made_on_or_before: date) -> List[Dict]:
+        """Unevaluated predictions made on or before the given date, oldest first."""
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {_COLUMNS} FROM predictions WHERE outcome = ? AND date <= ? ORDER BY date, id",
+                (PENDING, made_on_or_before.isoformat()),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def set_outcome(self, entry_id: int, outcome: str) -> bool:
+        with self._lock:
+            return self._db().execute(
+                "UPDATE predictions SET outcome = ? WHERE id = ?", (outcome, entry_id)
+            ).rowcount == 1
+
+    def entries(self, ticker: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Predictions in the order they were recorded (the last `limit` if given)."""
+        where, params = ("WHERE ticker = ?", [ticker.upper()]) if ticker else ("", [])
+        params.append(-1 if limit is None else limit)
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {_COLUMNS} FROM predictions {where} ORDER BY id DESC LIMIT ?", params
+            ).fetchall()
+        return [dict(r) for r in reversed(rows)]
+
+    def stats(self) -> Dict[str, int]:
+        """Total, validated (non-pending) and successful prediction counts in one aggregate query."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(outcome != ?), 0), COALESCE(SUM(outcome LIKE 'Success%'), 0) "
+                "FROM predictions",
+                (PENDING,),
+            ).fetchone()
+        return {"total": row[0], "validated": row[1], "wins": row[2]}
+
+
+prediction_ledger = PredictionLedger(legacy_json=PROJECT_ROOT / "data" / "memory.json")